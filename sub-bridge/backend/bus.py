@@ -15,6 +15,9 @@ class AsyncTopicBroker:
             if not q.full():
                 q.put_nowait(message)
 
+    def has_subscribers(self, topic: str) -> bool:
+        return bool(self._topics.get(topic))
+
     async def subscribe(self, topic: str, max_queue: int = 100) -> AsyncIterator[Any]:
         queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
         async with self._lock:
@@ -35,6 +35,8 @@ class Config:
     snapshot_s: float = _get_env_float("SNAPSHOT_S", 2.0)
     require_captain_consent: bool = _get_env_bool("REQUIRE_CAPTAIN_CONSENT", True)
     sqlite_path: str = os.getenv("SQLITE_PATH", "./sub-bridge.db")
+    # Action logs and fleet journals; unset means <repo>/logs
+    log_dir: Optional[str] = os.getenv("LOG_DIR")
     log_level: str = os.getenv("LOG_LEVEL", "INFO")
     use_enemy_ai: bool = _get_env_bool("USE_ENEMY_AI", False)
     enemy_static: bool = _get_env_bool("ENEMY_STATIC", True)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import Dict, Literal, Optional, List, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, PrivateAttr
 
 
 class Kinematics(BaseModel):
@@ -50,6 +50,18 @@ class Acoustics(BaseModel):
     # Derived detectability for debug/telemetry
     last_snr_db: float = 0.0
     last_detectability: float = 0.0
+    # (table, sorted keys) cache for source_level_by_speed lookups
+    _sl_keys_cache: Optional[tuple] = PrivateAttr(default=None)
+
+    def sorted_speed_keys(self) -> tuple:
+        """Sorted keys of `source_level_by_speed`, cached until the table is
+        replaced or gains/loses entries."""
+        table = self.source_level_by_speed
+        cache = self._sl_keys_cache
+        if cache is None or cache[0] is not table or len(cache[1]) != len(table):
+            cache = (table, tuple(sorted(table)))
+            self._sl_keys_cache = cache
+        return cache[1]
 
 
 class PowerAllocations(BaseModel):
@@ -125,6 +137,24 @@ class WeaponsSuite(BaseModel):
     # Countermeasure inventory
     noisemakers_stored: int = 6
     decoys_stored: int = 4
+    # (tubes list, {tube idx: list position}); see tube_by_idx
+    _tube_pos_cache: Optional[tuple] = PrivateAttr(default=None)
+
+    def tube_by_idx(self, idx: int) -> Optional[Tube]:
+        """Tube numbered `idx`, or None. Uses a cached idx -> position map that
+        is rebuilt whenever `tubes` is replaced or a lookup stops matching."""
+        tubes = self.tubes
+        cache = self._tube_pos_cache
+        if cache is not None and cache[0] is tubes:
+            pos = cache[1].get(idx)
+            if pos is not None and pos < len(tubes) and tubes[pos].idx == idx:
+                return tubes[pos]
+        positions: Dict[int, int] = {}
+        for pos, tube in enumerate(tubes):
+            positions.setdefault(tube.idx, pos)
+        self._tube_pos_cache = (tubes, positions)
+        pos = positions.get(idx)
+        return tubes[pos] if pos is not None else None
 
 
 class ShipCapabilities(BaseModel):
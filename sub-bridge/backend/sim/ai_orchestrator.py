@@ -259,13 +259,13 @@ class AgentsOrchestrator:
             self._blue_last_brief_sim_time_s = sim_time_s
             # Trace event
             try:
-                insert_event(self._storage_engine, self._run_id, "ai.run.blue_fleet", json.dumps({
+                insert_event(self._storage_engine, self._run_id, "ai.run.blue_fleet", {
                     "model": self._blue_fleet_model,
                     "engine": self._blue_fleet_engine_kind,
                     "intel_count": len(snapshots),
                     "messages": len(messages),
                     "duration_ms": int((time.perf_counter() - started) * 1000),
-                }))
+                })
             except Exception:
                 pass
         except Exception as e:
@@ -606,18 +606,20 @@ class AgentsOrchestrator:
         fleet_fused_contacts: List[Dict[str, Any]] = []
         try:
             world = self._world_getter()
+            own_side = ship.side
             others = [
                 s for s in world.all_ships()
-                if s.id != ship.id
-                and s.side != ship.side
-                and getattr(s, "side", None) != "NEUTRAL"
+                if s is not ship
+                and s.side != own_side
+                and s.side != "NEUTRAL"
                 and s.damage.hull < 1.0
             ]
+            others_by_id = {s.id: s for s in others}
             contacts = _passive_contacts(ship, others)
             by_id: Dict[str, Dict[str, Any]] = {}
             for c in contacts:
                 # Find the actual ship to get side information
-                target_ship = next((s for s in others if s.id == getattr(c, "id", "")), None)
+                target_ship = others_by_id.get(getattr(c, "id", ""))
                 by_id[getattr(c, "id", "")] = {
                     "id": getattr(c, "id", ""),
                     "side": target_ship.side if target_ship else "Unknown",  # Critical for friendly identification
@@ -630,12 +632,20 @@ class AgentsOrchestrator:
             try:
                 vis_map = getattr(self, "_visual_detection_map", {}) or {}
                 from_obs = vis_map.get(ship.id, {}) if isinstance(vis_map, dict) else {}
-                for oth in others:
-                    st = from_obs.get(oth.id, {}) if isinstance(from_obs, dict) else {}
+                if not isinstance(from_obs, dict):
+                    from_obs = {}
+                ox = ship.kin.x
+                oy = ship.kin.y
+                # The Simulation's visual pass already range/depth-gated its
+                # map, so walk only the observed targets, not the roster.
+                for oth_id, st in from_obs.items():
                     if not bool(st.get("detected", False)):
                         continue
-                    dx = oth.kin.x - ship.kin.x
-                    dy = oth.kin.y - ship.kin.y
+                    oth = others_by_id.get(oth_id)
+                    if oth is None:
+                        continue
+                    dx = oth.kin.x - ox
+                    dy = oth.kin.y - oy
                     rng = math.hypot(dx, dy)
                     if rng > 15000.0:
                         continue
@@ -1007,7 +1017,7 @@ class AgentsOrchestrator:
             except Exception:
                 pass
             # Emit trace event with full debug info
-            insert_event(self._storage_engine, self._run_id, "ai.run.fleet", json.dumps(api_call_debug))
+            insert_event(self._storage_engine, self._run_id, "ai.run.fleet", api_call_debug)
             # Record recent run for Fleet UI
             if not hasattr(self, "_recent_runs"):
                 self._recent_runs = []  # type: ignore[attr-defined]
@@ -1401,12 +1411,12 @@ class AgentsOrchestrator:
                     api_call_debug["provider_meta"] = engine_meta
             except Exception:
                 pass
-            insert_event(self._storage_engine, self._run_id, "ai.run.ship", json.dumps({
+            insert_event(self._storage_engine, self._run_id, "ai.run.ship", {
                 "ship_id": ship_id,
                 "summary_size": len(str(summary)),
                 "model": self._ship_model,
                 "api_call_debug": api_call_debug,
-            }))
+            })
             if not hasattr(self, "_recent_runs"):
                 self._recent_runs = []  # type: ignore[attr-defined]
             run_entry = {
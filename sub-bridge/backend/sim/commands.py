@@ -4,7 +4,6 @@ Each handler method accesses simulation state through self._sim.
 """
 from __future__ import annotations
 
-import json
 import math
 import random
 import time
@@ -82,10 +81,11 @@ class CommandDispatcher:
     async def _sonar_ping(self, data: Dict) -> Optional[str]:
         sim = self._sim
         own = sim.world.get_ship("ownship")
-        from .sonar import active_ping
-        from ..models import TelemetryContact
+        from .sonar import active_ping, normalize_angle_deg
         if sim.active_ping_state.start():
-            res = active_ping(own, [s for s in sim.world.all_ships() if s.id != own.id])
+            # The ping still goes out (and can be counter-detected below) with
+            # a failed sonar; there is just no receiver to hear the echoes.
+            res = active_ping(own, [s for s in sim.world.all_ships() if s.id != own.id]) if own.systems.sonar_ok else []
             now_iso = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
             sim._last_ping_at = now_iso
             # Active ping returns a "skin paint": precise range + bearing,
@@ -105,7 +105,6 @@ class CommandDispatcher:
                     dy = own.kin.y - ship.kin.y
                     dist_m = math.hypot(dx, dy)
                     if dist_m <= 15000.0:
-                        from .sonar import normalize_angle_deg
                         brg = normalize_angle_deg(math.degrees(math.atan2(dx, dy)))
                         brg_noise = normalize_angle_deg(brg + random.gauss(0, 2.0))
                         strength = max(0.0, min(1.0, 1.0 / (1.0 + (dist_m / 10000.0))))
@@ -194,7 +193,7 @@ class CommandDispatcher:
         if torp is None:
             return "Cannot fire"
         sim.world.torpedoes.append(torp)
-        insert_event(sim.engine, sim.run_id, "weapons.fire", json.dumps(data))
+        insert_event(sim.engine, sim.run_id, "weapons.fire", data)
         tube = int(data.get("tube", 1))
         bearing = float(data.get("bearing", own.kin.heading))
         sim._log_action("WEAPONS", f"Fired torpedo from Tube {tube} at bearing {bearing:.0f}°", data)
@@ -212,21 +211,22 @@ class CommandDispatcher:
         sim = self._sim
         own = sim.world.get_ship("ownship")
         from ..storage import insert_event
+        from .weapons import _TORPEDO_TEMPLATE, next_entity_serial
         torp = {
-            "id": f"torpedo_test_{int(time.time() * 1000)}",
+            **_TORPEDO_TEMPLATE,
+            "id": f"torpedo_test_{next_entity_serial()}",
             "x": own.kin.x, "y": own.kin.y, "depth": own.kin.depth,
             "heading": float(data.get("bearing", own.kin.heading)) % 360.0,
-            "speed": 45.0, "armed": False,
+            "speed": 45.0,
             "enable_range_m": float(data.get("enable_range", 800.0)),
-            "seeker_range_m": 4000.0, "run_time": 0.0, "max_run_time": 600.0,
-            "target_id": None, "name": "Mk48-TEST", "seeker_cone": 35.0,
-            "side": own.side, "spoofed_timer": 0.0,
+            "seeker_range_m": 4000.0, "max_run_time": 600.0,
+            "name": "Mk48-TEST", "seeker_cone": 35.0,
+            "side": own.side,
             "run_depth": float(data.get("run_depth", own.kin.depth)),
             "doctrine": str(data.get("doctrine", "passive_then_active")),
-            "pn_nav_const": 3.0, "los_prev": None,
         }
         sim.world.torpedoes.append(torp)
-        insert_event(sim.engine, sim.run_id, "weapons.test_fire", json.dumps(data))
+        insert_event(sim.engine, sim.run_id, "weapons.test_fire", data)
         bearing = float(data.get("bearing", own.kin.heading))
         sim._log_action("WEAPONS", f"Test fired torpedo at bearing {bearing:.0f}°", data)
         # Surface the same all-station launch audio event as a real fire so the
@@ -247,7 +247,7 @@ class CommandDispatcher:
         from ..storage import insert_event
         cm_type = str(data.get("type", "noisemaker"))
         def _on_cm_event(name: str, payload: dict) -> None:
-            insert_event(sim.engine, sim.run_id, name, json.dumps(payload))
+            insert_event(sim.engine, sim.run_id, name, payload)
         result = try_deploy_countermeasure(own, cm_type, on_event=_on_cm_event)
         if result.get("ok"):
             sim.world.countermeasures.append(result["data"])
@@ -271,7 +271,7 @@ class CommandDispatcher:
         max_d = float(data.get("maxDepth", 50.0))
         n = int(data.get("spreadSize", 3))
         res = try_drop_depth_charges(tgt, spread_m, min_d, max_d, n,
-                                      on_event=lambda nm, p: insert_event(sim.engine, sim.run_id, nm, json.dumps(p)))
+                                      on_event=lambda nm, p: insert_event(sim.engine, sim.run_id, nm, p))
         if not res.get("ok"):
             return res.get("error", "Drop failed")
         for dc in res.get("data", []) or []:
@@ -719,7 +719,7 @@ class CommandDispatcher:
             if cm_type not in caps.countermeasures:
                 return f"Countermeasure type '{cm_type}' not available"
             def _on_cm_event(name: str, payload: dict) -> None:
-                insert_event(sim.engine, sim.run_id, name, json.dumps(payload))
+                insert_event(sim.engine, sim.run_id, name, payload)
             result = try_deploy_countermeasure(tgt, cm_type, on_event=_on_cm_event)
             if result.get("ok"):
                 sim.world.countermeasures.append(result["data"])
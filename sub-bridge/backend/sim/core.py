@@ -30,6 +30,9 @@ from .damage import step_damage, step_engineering
 from .ecs import World
 from .physics import integrate_kinematics
 from .weapons import (
+    build_seeker_frame,
+    build_ship_grid,
+    seeker_env_mult,
     step_countermeasure,
     step_depth_charge,
     step_torpedo,
@@ -59,6 +62,10 @@ class SimulationCore:
 
     def __init__(self, world: World) -> None:
         self._world = world
+        # Per-step state read by the projectile event callbacks. Bound methods
+        # are passed as `on_event` instead of closures built per projectile.
+        self._result: Optional[CoreStepResult] = None
+        self._own = None
 
     def step_physics(
         self,
@@ -81,6 +88,9 @@ class SimulationCore:
         if own is None:
             return result
 
+        self._result = result
+        self._own = own
+
         pump_assignments = pump_assignments or {}
         ballast_boost = len(pump_assignments) > 0
 
@@ -94,49 +104,39 @@ class SimulationCore:
             ballast_boost=ballast_boost,
         )
         result.cavitation = bool(cav)
-
-        # Weapon-tube timers (all ships)
-        for s in world.all_ships():
-            step_tubes(s, dt)
-
-        # Enemy kinematics
-        if not enemy_static:
-            for ship in world.all_ships():
-                if ship.id == "ownship":
-                    continue
-                integrate_kinematics(
-                    ship, ship.kin.heading, ship.kin.speed, ship.kin.depth, dt
-                )
+        ships = world.all_ships()
+
+        # Weapon-tube timers (all ships) and enemy kinematics, fused into a
+        # single pass over the roster.
+        for ship in ships:
+            step_tubes(ship, dt)
+            if enemy_static or ship.id == "ownship":
+                continue
+            integrate_kinematics(
+                ship, ship.kin.heading, ship.kin.speed, ship.kin.depth, dt
+            )
 
         # Torpedoes
         if world.torpedoes:
+            on_torp_event = self._on_torpedo_event
+            # The seeker environment and ship snapshot are the same for every
+            # fish this tick
+            env_mult = seeker_env_mult(world)
+            seeker_frame = build_seeker_frame(ships)
+            ship_grid = build_ship_grid(seeker_frame)
             for t in list(world.torpedoes):
-                def _on_torp_event(name: str, payload: Dict[str, Any], _t=t) -> None:
-                    result.events.append(CoreEvent(kind=name, payload=payload))
-                    if name == "torpedo.detonated":
-                        brg = self._bearing_from_ownship(own, payload)
-                        if brg is not None:
-                            result.sonar_explosions.append(
-                                {"bearing": brg, "source": "torpedo"}
-                            )
-
                 step_torpedo(
-                    t, world, dt, on_event=_on_torp_event, countermeasures=world.countermeasures
+                    t, world, dt, on_event=on_torp_event, countermeasures=world.countermeasures,
+                    env_mult=env_mult, ships=ships, seeker_frame=seeker_frame, ship_grid=ship_grid,
                 )
                 if t.get("run_time", 0.0) > t.get("max_run_time", 0.0):
                     world.torpedoes.remove(t)
 
         # Depth charges
         if getattr(world, "depth_charges", None):
+            on_dc_event = self._on_depth_charge_event
             for dc in list(world.depth_charges):
-                def _on_dc_event(name: str, payload: Dict[str, Any], _dc=dc) -> None:
-                    result.events.append(CoreEvent(kind=name, payload=payload))
-                    if name == "depth_charge.detonated":
-                        brg = self._bearing_from_ownship(own, payload)
-                        if brg is not None:
-                            result.sonar_explosions.append({"bearing": brg})
-
-                step_depth_charge(dc, world, dt, on_event=_on_dc_event)
+                step_depth_charge(dc, world, dt, on_event=on_dc_event, ships=ships)
                 if dc.get("exploded", False) or dc.get("depth", 0.0) > 1000.0:
                     world.depth_charges.remove(dc)
 
@@ -148,7 +148,7 @@ class SimulationCore:
 
         # Ship destruction (hull damage >= 1.0). Caller is responsible for
         # deduping repeat detections via its own destroyed-set.
-        for ship in world.all_ships():
+        for ship in ships:
             if ship.damage.hull >= 1.0:
                 result.destroyed_ship_ids.append(ship.id)
                 result.events.append(
@@ -170,6 +170,22 @@ class SimulationCore:
 
     # ------------------------------------------------------------------ #
 
+    def _on_torpedo_event(self, name: str, payload: Dict[str, Any]) -> None:
+        result = self._result
+        result.events.append(CoreEvent(kind=name, payload=payload))
+        if name == "torpedo.detonated":
+            brg = self._bearing_from_ownship(self._own, payload)
+            if brg is not None:
+                result.sonar_explosions.append({"bearing": brg, "source": "torpedo"})
+
+    def _on_depth_charge_event(self, name: str, payload: Dict[str, Any]) -> None:
+        result = self._result
+        result.events.append(CoreEvent(kind=name, payload=payload))
+        if name == "depth_charge.detonated":
+            brg = self._bearing_from_ownship(self._own, payload)
+            if brg is not None:
+                result.sonar_explosions.append({"bearing": brg})
+
     @staticmethod
     def _bearing_from_ownship(own, payload: Dict[str, Any]) -> Optional[float]:
         try:
@@ -1,6 +1,5 @@
 from __future__ import annotations
 import asyncio
-import json
 import time
 import math
 from typing import Dict, Optional
@@ -11,17 +10,17 @@ from ..bus import BUS
 from ..config import CONFIG, reload_from_env
 from ..models import Ship, Kinematics, Hull, Acoustics, WeaponsSuite, Reactor, DamageState, MaintenanceTask, SHIP_CATALOG, TelemetryContact
 from ..assets import load_ship_catalog, load_mission_by_id, apply_mission_to_world
-from ..storage import init_engine, create_run, insert_snapshot, insert_event
+from ..storage import init_engine, create_run, insert_snapshot, insert_event, flush as flush_storage
 from .ecs import World
 from .physics import integrate_kinematics
-from .sonar import passive_contacts, ActivePingState, active_ping, passive_projectiles, explosion_contacts, countermeasure_contacts, normalize_angle_deg, clear_contact_memory, TORPEDO_TONAL_LINES, TORPEDO_TONAL_CARDS
+from .sonar import passive_contacts, PassiveFrame, ActivePingState, active_ping, passive_projectiles, explosion_contacts, countermeasure_contacts, normalize_angle_deg, clear_contact_memory, TORPEDO_TONAL_LINES, TORPEDO_TONAL_CARDS
 from .contact_registry import ContactRegistry
 from .weapons import step_torpedo, step_tubes, try_drop_depth_charges, step_depth_charge, try_launch_torpedo_quick, step_countermeasure
 from .ai_tools import LocalAIStub
 from .ai_orchestrator import AgentsOrchestrator
 from .damage import step_damage, step_engineering
 from .power import route_mw, speed_cap_fraction, sonar_snr_bonus_db, reload_multiplier, maintenance_rate, reactor_noise_points, REACTOR_QUIET_MW
-from .noise import NoiseEngine
+from .noise import NoiseEngine, NoiseInputs
 from .waypoints import WaypointTracker
 from .conditions import ConditionEvaluator
 from .triggers import TriggerManager
@@ -40,6 +39,33 @@ from .core import SimulationCore
 from ..models import MissionOutcome
 
 
+# Crew stations that carry maintenance tasks, in a fixed order. Per-tick task
+# loops walk this tuple rather than the task dict's key/item views.
+STATIONS = ("helm", "sonar", "weapons", "engineering")
+
+# Maintenance task stages as integer codes (worst is highest) so per-tick
+# penalty lookups index tuples instead of building string-keyed dicts.
+STAGE_TASK = 0
+STAGE_FAILING = 1
+STAGE_FAILED = 2
+STAGE_CODES = {"task": STAGE_TASK, "failing": STAGE_FAILING, "failed": STAGE_FAILED}
+
+# Per-stage penalty tables, indexed by stage code
+_HELM_TURN_FACTOR = (1.0, 0.7, 0.0)
+_SONAR_BEARING_NOISE_EXTRA = (0.0, 3.0, 12.0)
+_SONAR_PASSIVE_SNR_PENALTY_DB = (0.0, 3.0, 10.0)
+_SONAR_ACTIVE_RANGE_NOISE_ADD_M = (0.0, 50.0, 250.0)
+_SONAR_ACTIVE_BEARING_NOISE_EXTRA = (0.0, 0.5, 3.0)
+_WEAPONS_TIME_MULT = (1.0, 1.4, 2.5)
+
+_DEFAULT_LOG_DIR = Path(__file__).parent.parent.parent.parent / "logs"
+
+
+def _log_dir() -> Path:
+    """Directory for action logs and fleet journals (LOG_DIR, else <repo>/logs)."""
+    return Path(CONFIG.log_dir) if CONFIG.log_dir else _DEFAULT_LOG_DIR
+
+
 def _unwrap_scalar(v):
     """LLM tool calls occasionally wrap scalars in single-element lists.
 
@@ -128,10 +154,11 @@ class Simulation:
             pass
         self._init_default_world()
         # Station task state
-        self._active_tasks: Dict[str, list[MaintenanceTask]] = {s: [] for s in ["helm", "sonar", "weapons", "engineering"]}
-        self._task_spawn_timers: Dict[str, float] = {s: CONFIG.first_task_delay_s for s in ["helm", "sonar", "weapons", "engineering"]}
+        self._active_tasks: Dict[str, list[MaintenanceTask]] = {s: [] for s in STATIONS}
+        self._task_spawn_timers: Dict[str, float] = {s: CONFIG.first_task_delay_s for s in STATIONS}
         # Noise aggregation engine
         self._noise = NoiseEngine()
+        self._noise_inputs = NoiseInputs()
         # Mission briefing and ROE (only set defaults if not set by mission assets)
         if not hasattr(self, "mission_brief"):
             self.mission_brief = {
@@ -201,6 +228,9 @@ class Simulation:
         )
         # Intercept system (handles intercepted enemy communications)
         self._intercept_system = InterceptSystem(lambda: self.world, lambda: self)
+        # Captain comms log and last captain telemetry (read every tick)
+        self._captain_comms: list = []
+        self._last_captain_tel: dict = {}
         # Captain intercepts list (accumulated for UI)
         self._captain_intercepts = []
         # Mission outcome
@@ -269,10 +299,10 @@ class Simulation:
 
         # Maintenance tasks and timers
         if hasattr(self, "_active_tasks"):
-            self._active_tasks = {s: [] for s in ["helm", "sonar", "weapons", "engineering"]}
+            self._active_tasks = {s: [] for s in STATIONS}
         if hasattr(self, "_task_spawn_timers"):
             from ..config import CONFIG as _cfg
-            self._task_spawn_timers = {s: _cfg.first_task_delay_s for s in ["helm", "sonar", "weapons", "engineering"]}
+            self._task_spawn_timers = {s: _cfg.first_task_delay_s for s in STATIONS}
 
         # Storm / EMCON timers
         if hasattr(self, "_emcon_high_timer"):
@@ -392,13 +422,11 @@ class Simulation:
 
         if event_type == "send_comms":
             # Send message to captain comms
-            if not hasattr(self, "_captain_comms"):
-                self._captain_comms = []
             self._captain_comms.append({
                 "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
                 "text": event.get("text", "")
             })
-            insert_event(self.engine, self.run_id, "comms.sent", json.dumps(event))
+            insert_event(self.engine, self.run_id, "comms.sent", event)
 
         elif event_type == "broadcast_intercept":
             # Queue an interceptable message
@@ -430,7 +458,7 @@ class Simulation:
             pass
 
         # Log the trigger event
-        insert_event(self.engine, self.run_id, f"trigger.{event_type}", json.dumps(event))
+        insert_event(self.engine, self.run_id, f"trigger.{event_type}", event)
 
     def _log_action(self, station: str, message: str, raw_data: dict = None) -> None:
         """Log an action to both the event system and the action log file.
@@ -454,13 +482,13 @@ class Simulation:
         })
 
         # Write to database
-        insert_event(self.engine, self.run_id, "action.log", json.dumps({
+        insert_event(self.engine, self.run_id, "action.log", {
             "station": station, "message": message, "raw": raw_data
-        }))
+        })
 
         # Append to action log file
         try:
-            log_dir = Path(__file__).parent.parent.parent.parent / "logs"
+            log_dir = _log_dir()
             log_dir.mkdir(parents=True, exist_ok=True)
             log_path = log_dir / f"action_log_{self.run_id}.md"
 
@@ -541,7 +569,7 @@ class Simulation:
                 self.ordered = {"heading": 0.0, "speed": 5.0, "depth": 100.0}
 
             # Log mission load
-            insert_event(self.engine, self.run_id, "mission.loaded", json.dumps({"mission_id": mission_id}))
+            insert_event(self.engine, self.run_id, "mission.loaded", {"mission_id": mission_id})
 
             # Activate simulation
             self._mission_id = mission_id
@@ -582,7 +610,7 @@ class Simulation:
             except Exception:
                 pass
             try:
-                insert_event(self.engine, self.run_id, "mission.stopped", json.dumps({}))
+                insert_event(self.engine, self.run_id, "mission.stopped", {})
             except Exception:
                 pass
         finally:
@@ -659,34 +687,32 @@ class Simulation:
         p = ship.power
         return max(0.0, min(1.0, getattr(p, station if station != "engineering" else "engineering")))
 
-    def _apply_stage_penalties(self, ship: Ship, station: str, stage: str) -> None:
-        # Apply degradation effects per station and stage
+    def _apply_stage_penalties(self, ship: Ship, station: str, stage: str | int) -> None:
+        # Apply degradation effects per station and stage (name or STAGE_* code)
+        code = stage if isinstance(stage, int) else STAGE_CODES.get(stage, STAGE_TASK)
         if station == "helm":
             # Map new stages: task (no penalty), failing (moderate), failed (worst)
-            factor = {"task": 1.0, "failing": 0.7, "failed": 0.0}.get(stage, 1.0)
-            ship.hull.turn_rate_max = 7.0 * factor
-            if stage == "failed":
+            ship.hull.turn_rate_max = 7.0 * _HELM_TURN_FACTOR[code]
+            if code == STAGE_FAILED:
                 ship.systems.rudder_ok = False
             # Additional helm-related effects keyed to degraded states
-            if stage in ("failing", "failed"):
+            if code != STAGE_TASK:
                 ship.acoustics.thermocline_on = True
         elif station == "sonar":
-            extra = {"task": 0.0, "failing": 3.0, "failed": 12.0}.get(stage, 0.0)
-            ship.acoustics.bearing_noise_extra = extra
-            if stage == "failed":
+            ship.acoustics.bearing_noise_extra = _SONAR_BEARING_NOISE_EXTRA[code]
+            if code == STAGE_FAILED:
                 ship.systems.sonar_ok = False
-            if stage in ("failing", "failed"):
-                ship.acoustics.passive_snr_penalty_db = 3.0 if stage == "failing" else 10.0
-                ship.acoustics.active_range_noise_add_m = 50.0 if stage == "failing" else 250.0
-                ship.acoustics.active_bearing_noise_extra = 0.5 if stage == "failing" else 3.0
+            if code != STAGE_TASK:
+                ship.acoustics.passive_snr_penalty_db = _SONAR_PASSIVE_SNR_PENALTY_DB[code]
+                ship.acoustics.active_range_noise_add_m = _SONAR_ACTIVE_RANGE_NOISE_ADD_M[code]
+                ship.acoustics.active_bearing_noise_extra = _SONAR_ACTIVE_BEARING_NOISE_EXTRA[code]
         elif station == "weapons":
-            mult = {"task": 1.0, "failing": 1.4, "failed": 2.5}.get(stage, 1.0)
-            ship.weapons.time_penalty_multiplier = mult
-            if stage == "failed":
+            ship.weapons.time_penalty_multiplier = _WEAPONS_TIME_MULT[code]
+            if code == STAGE_FAILED:
                 ship.systems.tubes_ok = False
         elif station == "engineering":
             # Engineering failed: ballast system effectively unavailable
-            if stage == "failed":
+            if code == STAGE_FAILED:
                 ship.systems.ballast_ok = False
 
     def _recompute_penalties_from_tasks(self, ship: Ship) -> None:
@@ -695,21 +721,12 @@ class Simulation:
         This prevents a completed task from resetting penalties while other degraded/failed
         tasks remain for the same station.
         """
-        # Determine worst stage order for new model
-        stage_rank = {"task": 0, "failing": 1, "failed": 2}
-        # Default to normal for all stations
-        worst_by_station = {s: "task" for s in ["helm", "sonar", "weapons", "engineering"]}
-        for station, tasks in self._active_tasks.items():
-            if not tasks:
-                continue
-            worst = "task"
-            for t in tasks:
-                if stage_rank[t.stage] > stage_rank[worst]:
-                    worst = t.stage
-            worst_by_station[station] = worst
-        # Apply aggregated penalties
-        for station, stage in worst_by_station.items():
-            self._apply_stage_penalties(ship, station, stage)
+        active = self._active_tasks
+        for station in STATIONS:
+            tasks = active[station]
+            # Stations without tasks are normal
+            code = max(STAGE_CODES[t.stage] for t in tasks) if tasks else STAGE_TASK
+            self._apply_stage_penalties(ship, station, code)
 
     def _get_recent_enemy_pings(self, own: Ship) -> list:
         """Get recent enemy pings with distance for audio playback."""
@@ -744,16 +761,19 @@ class Simulation:
     def _step_station_tasks(self, ship: Ship, dt: float) -> None:
         now_s = time.perf_counter()
         # Spawn logic per station (allow multiple concurrent tasks)
-        for station in self._active_tasks.keys():
-            self._task_spawn_timers[station] -= dt
-            if self._task_spawn_timers[station] <= 0.0:
+        spawn_timers = self._task_spawn_timers
+        for station in STATIONS:
+            spawn_timers[station] -= dt
+            if spawn_timers[station] <= 0.0:
                 if not self._suppress_maintenance_spawns:
                     self._spawn_task_for(station, now_s)
                 base = random.uniform(60.0, 120.0)
-                self._task_spawn_timers[station] = base / max(0.2, CONFIG.maint_spawn_scale)
+                spawn_timers[station] = base / max(0.2, CONFIG.maint_spawn_scale)
 
         # Progress all active tasks based on power allocation for that station
-        for station, tasks in self._active_tasks.items():
+        active = self._active_tasks
+        for station in STATIONS:
+            tasks = active[station]
             if not tasks:
                 continue
             power_frac = self._station_power_fraction(ship, station)
@@ -786,14 +806,20 @@ class Simulation:
     async def run(self) -> None:
         if self._stop is None:
             self._stop = asyncio.Event()
-        last = time.perf_counter()
+        # Fixed-cadence scheduler: track the next deadline rather than the
+        # last tick so jitter in sleep/tick time doesn't accumulate as drift.
+        next_tick = time.perf_counter() + self.dt
         while not self._stop.is_set():
             now = time.perf_counter()
-            elapsed = now - last
-            if elapsed < self.dt:
-                await asyncio.sleep(self.dt - elapsed)
-                continue
-            last = now
+            if next_tick > now:
+                await asyncio.sleep(next_tick - now)
+                if self._stop.is_set():
+                    break
+            elif now - next_tick > self.dt:
+                # Fell more than a tick behind (idle throttle, error back-off);
+                # resync instead of bursting ticks to catch up.
+                next_tick = now
+            next_tick += self.dt
             try:
                 await self.tick(self.dt)
             except Exception as e:
@@ -802,6 +828,8 @@ class Simulation:
                 traceback.print_exc()
                 # Continue running despite errors
                 await asyncio.sleep(1.0)
+        # Persist any snapshots/events still buffered in the storage writer
+        flush_storage(self.engine)
 
     def get_current_status(self) -> dict:
         """Get the current simulation status for initial WebSocket sync.
@@ -897,6 +925,10 @@ class Simulation:
         if self._debug_tick_count % 100 == 1:  # Log every 100 ticks (every 5 seconds at 20Hz)
             print(f"DEBUG: Running tick #{self._debug_tick_count}, mission_active={self._mission_active}, ownship={own.id}")
 
+        # Ship roster is fixed for the duration of a tick; bind it once
+        ships = self.world.all_ships()
+        other_ships = [s for s in ships if s.id != own.id]
+
         if CONFIG.use_ai_orchestrator:
             # Advance orchestrator timers
             self._ai_fleet_timer += dt
@@ -912,16 +944,16 @@ class Simulation:
                     self._fleet_conf_tripped = False  # type: ignore[attr-defined]
                 if not hasattr(self, "_fleet_last_trigger_at"):
                     self._fleet_last_trigger_at = 0.0  # type: ignore[attr-defined]
-                now_s = float(getattr(self, "_sim_time_s", 0.0))
+                now_s = float(self._sim_time_s)
                 trigger_now = False
                 if isinstance(fleet_trigger_conf, (int, float)) and fleet_trigger_conf > 0.0:
                     thr = float(fleet_trigger_conf)
-                    for s in self.world.all_ships():
+                    for s in ships:
                         if s.side != "RED":
                             continue
                         # Hostile contacts only — neutrals are scrubbed from RED
                         # awareness elsewhere, so they must not trip the alert.
-                        others = [x for x in self.world.all_ships()
+                        others = [x for x in ships
                                   if x.side not in (s.side, "NEUTRAL") and x.id != s.id]
                         contacts = passive_contacts(s, others)
                         ship_max_conf = max(
@@ -971,7 +1003,7 @@ class Simulation:
                     res = await self._ai_orch.run_fleet()
                     # Persist tool calls for trace
                     for tc in res.get("tool_calls_validated", []):
-                        insert_event(self.engine, self.run_id, "ai.tool.fleet", json.dumps(tc))
+                        insert_event(self.engine, self.run_id, "ai.tool.fleet", tc)
                         # Update world-level FleetIntent for UI and ship guidance
                         if tc.get("tool") == "set_fleet_intent":
                             self._fleet_intent = tc.get("arguments", {})
@@ -1024,7 +1056,7 @@ class Simulation:
                                 if text:
                                     # Write to logs/fleet_journal_YYYY-MM-DD.md
                                     today = time.strftime("%Y-%m-%d", time.gmtime())
-                                    journal_dir = Path(__file__).parent.parent.parent.parent / "logs"
+                                    journal_dir = _log_dir()
                                     journal_dir.mkdir(parents=True, exist_ok=True)
                                     journal_path = journal_dir / f"fleet_journal_{today}.md"
                                     timestamp = time.strftime("%H:%M:%S", time.gmtime())
@@ -1036,7 +1068,7 @@ class Simulation:
                                     entry = f"## {timestamp}\n{text}\n\n"
                                     with journal_path.open("a", encoding="utf-8") as f:
                                         f.write(entry)
-                                    insert_event(self.engine, self.run_id, "ai.tool.journal", json.dumps({"timestamp": timestamp, "length": len(text)}))
+                                    insert_event(self.engine, self.run_id, "ai.tool.journal", {"timestamp": timestamp, "length": len(text)})
                             except Exception as je:
                                 print(f"Warning: Failed to write journal: {je}")
                     # Mirror recent runs into sim for Fleet UI. (Alert-cadence
@@ -1051,7 +1083,7 @@ class Simulation:
             # waste AI cycles. Without this, captains kept firing on
             # already-dead targets after a wreck remained in the world.
             red_ships = [
-                s for s in self.world.all_ships()
+                s for s in ships
                 if s.side == "RED" and s.damage.hull < 1.0
             ]
             if not hasattr(self, "_debug_ship_ai_logged"):
@@ -1095,7 +1127,7 @@ class Simulation:
                             if result.ok:
                                 insert_event(
                                     self.engine, self.run_id, "ai.tool.apply",
-                                    json.dumps({"ship_id": _sid, "tool": action.name}),
+                                    {"ship_id": _sid, "tool": action.name},
                                 )
                                 # Clear any stale failure record now that this
                                 # ship has executed a tool successfully. The
@@ -1123,7 +1155,7 @@ class Simulation:
                                 err = getattr(result, "error", "unknown") or "unknown"
                                 insert_event(
                                     self.engine, self.run_id, "ai.tool.fail",
-                                    json.dumps({"ship_id": _sid, "tool": action.name, "error": err}),
+                                    {"ship_id": _sid, "tool": action.name, "error": err},
                                 )
                                 try:
                                     if not hasattr(self._ai_orch, "_last_action_failed_by_ship"):
@@ -1148,10 +1180,10 @@ class Simulation:
             self._last_ai += dt
             if self._last_ai >= CONFIG.ai_poll_s:
                 self._last_ai = 0.0
-                for ship in self.world.all_ships():
+                for ship in ships:
                     if ship.side == "RED":
                         tool = self.ai.propose_orders(ship)
-                        insert_event(self.engine, self.run_id, "ai_tool", json.dumps(tool))
+                        insert_event(self.engine, self.run_id, "ai_tool", tool)
                         args = tool.get("arguments", {})
                         ship.kin.heading = args.get("heading", ship.kin.heading)
                         ship.kin.speed = args.get("speed", ship.kin.speed)
@@ -1189,7 +1221,7 @@ class Simulation:
             wp_events = self._waypoint_tracker.step(dt)
             for ev in wp_events:
                 self._transient_events.append(ev)
-                insert_event(self.engine, self.run_id, "waypoint.reached", json.dumps(ev))
+                insert_event(self.engine, self.run_id, "waypoint.reached", ev)
 
         # Step trigger manager (evaluates conditions, executes actions)
         if hasattr(self, "_trigger_manager"):
@@ -1201,8 +1233,8 @@ class Simulation:
         if hasattr(self, "_intercept_system"):
             intercepts = self._intercept_system.step(dt, self._sim_time_s)
             for ic in intercepts:
-                self._captain_intercepts.append(ic.dict())
-                insert_event(self.engine, self.run_id, "intercept.received", json.dumps(ic.dict()))
+                self._captain_intercepts.append(ic.model_dump())
+                insert_event(self.engine, self.run_id, "intercept.received", ic.model_dump())
 
         # Step victory evaluator (checks success criteria)
         if hasattr(self, "_victory_evaluator"):
@@ -1214,12 +1246,12 @@ class Simulation:
                     "outcome": outcome.status,
                     "reason": outcome.reason
                 })
-                insert_event(self.engine, self.run_id, "mission.end", json.dumps(outcome.dict()))
+                insert_event(self.engine, self.run_id, "mission.end", outcome.model_dump())
 
         self.active_ping_state.tick(dt)
         
         # Tick AI ship active sonar cooldowns
-        for ship in self.world.all_ships():
+        for ship in ships:
             if ship.side != "ownship" and ship.active_sonar_cooldown > 0.0:
                 ship.active_sonar_cooldown = max(0.0, ship.active_sonar_cooldown - dt)
         
@@ -1238,7 +1270,11 @@ class Simulation:
         noise_budget = max(0.0, min(100.0, noise_from_speed + noise_cav + noise_pumps + noise_masts + noise_reactor))
         
         # Compute per-station noise dB for UI and dynamic source level
-        noise_levels = self._noise.tick(own, self.world, dt, self)
+        noise_inputs = self._noise_inputs
+        noise_inputs.periscope_raised = self._periscope_raised
+        noise_inputs.radio_raised = self._radio_raised
+        noise_inputs.active_tasks = self._active_tasks
+        noise_levels = self._noise.tick(own, self.world, dt, noise_inputs)
         
         # Update submarine's dynamic source level based on comprehensive noise budget
         # Convert noise budget (0-100) to dB source level (110-140 dB range)
@@ -1271,12 +1307,18 @@ class Simulation:
             self._emcon_high_timer = max(0.0, self._emcon_high_timer - dt)
         emcon_alert = self._emcon_high_timer >= 10.0
         detectability = noise_budget / 100.0
-        contacts = passive_contacts(own, [s for s in self.world.all_ships() if s.id != own.id], self._contact_registry)
+        # A failed sonar hears nothing: skip the passive pipelines outright
+        # rather than calling into each one just to get an empty list back.
+        sonar_enabled = own.systems.sonar_ok
+        # One observer frame serves every passive builder this tick (ships
+        # here; torpedoes and countermeasures when the sonar payload is built).
+        passive_frame = PassiveFrame(own) if sonar_enabled else None
+        contacts = passive_contacts(own, other_ships, self._contact_registry, frame=passive_frame) if sonar_enabled else []
         # Build simple alert map for RED ships for orchestrator visibility
         try:
             if hasattr(self, "_ai_orch") and getattr(self, "_ai_orch", None) is not None:
                 alert_map = {}
-                for ship in self.world.all_ships():
+                for ship in ships:
                     if ship.side != "RED":
                         continue
                     dx = ship.kin.x - own.kin.x
@@ -1304,7 +1346,7 @@ class Simulation:
                     self._enemy_search_timers = {}
                 
                 # For each enemy ship, check if they can visually detect other ships
-                for observer in self.world.all_ships():
+                for observer in ships:
                     if observer.side != "RED":  # Only enemy ships can visually detect
                         continue
                     
@@ -1323,7 +1365,7 @@ class Simulation:
                         observer_detections = {}
                         
                         # Check detection of all other ships
-                        for target in self.world.all_ships():
+                        for target in ships:
                             if target.id == observer.id:
                                 continue
                             
@@ -1524,7 +1566,7 @@ class Simulation:
             "enemyPings": self._get_recent_enemy_pings(own),
             "explosions": list(getattr(self, "_sonar_explosions", [])),
             # System status for alarms
-            "systems": own.systems.dict() if hasattr(own.systems, 'dict') else {},
+            "systems": own.systems.model_dump(),
             "maintenance": {"levels": own.maintenance.levels},
             # Mission state for startup sequence tracking
             "missionActive": self._mission_active,
@@ -1538,11 +1580,11 @@ class Simulation:
                 "id": s.id,
                 "side": s.side,
                 "class": getattr(s, "ship_class", None),
-                "capabilities": (getattr(s, "capabilities", None).dict() if getattr(s, "capabilities", None) else None),
+                "capabilities": (getattr(s, "capabilities", None).model_dump() if getattr(s, "capabilities", None) else None),
                 "x": s.kin.x, "y": s.kin.y, "depth": s.kin.depth,
                 "heading": s.kin.heading, "speed": s.kin.speed,
             }
-            for s in self.world.all_ships()
+            for s in ships
         ]}
         # Station status aggregation for captain dashboard
         def station_status(station: str, ok_flag: bool) -> str:
@@ -1588,7 +1630,7 @@ class Simulation:
             vis_mods = periscope_modifiers(self.environment)
 
             # Always check for contacts (both new detections and existing ones)
-            for s in self.world.all_ships():
+            for s in ships:
                 if s.id == own.id:
                     continue
                 if s.kin.depth <= 5.0:  # Target must be at or near surface
@@ -1735,7 +1777,7 @@ class Simulation:
         # Build mission status
         mission_status = {"status": "ongoing"}
         if hasattr(self, "_mission_outcome"):
-            mission_status = self._mission_outcome.dict()
+            mission_status = self._mission_outcome.model_dump()
         tel_captain = {
             **base,
             "periscopeRaised": self._periscope_raised,
@@ -1745,7 +1787,7 @@ class Simulation:
                 "objective": self.mission_brief["objective"],
                 "roe": self.mission_brief["roe"]
             },
-            "comms": getattr(self, "_captain_comms", []),
+            "comms": self._captain_comms,
             "stationStatus": station_statuses,
             "environment": self.environment.to_dict(),
             "periscopeContacts": self._periscope_contacts,
@@ -1753,22 +1795,29 @@ class Simulation:
             "intercepts": getattr(self, "_captain_intercepts", []),
             "missionStatus": mission_status,
             "waypointProgress": waypoint_progress,
-            "simTime": getattr(self, "_sim_time_s", 0.0),
+            "simTime": self._sim_time_s,
         }
-        tel_helm = {**base, "cavitationSpeedWarn": speed > 25.0, "thermocline": own.acoustics.thermocline_on, "tasks": [t.__dict__ for t in self._active_tasks['helm']]}
+        # Station payloads are only built for topics someone is listening on;
+        # a closed panel (notably the debug view) costs nothing per tick.
+        tel_helm = None
+        if BUS.has_subscribers("tick:helm"):
+            tel_helm = {**base, "cavitationSpeedWarn": speed > 25.0, "thermocline": own.acoustics.thermocline_on, "tasks": [t.__dict__ for t in self._active_tasks['helm']]}
         # Prepare recent active ping responses list (bearing, range_est, strength, time)
         # For now, only generate on demand when 'sonar.ping' happens; UI will render as DEMON dots
         if not hasattr(self, "_last_ping_responses"):
             self._last_ping_responses = []
         # Include passive projectiles (torpedoes only - depth charges are silent while sinking)
-        proj_contacts = passive_projectiles(own, self.world.torpedoes, getattr(self.world, "depth_charges", []))
         # Initialize explosion overlays list if absent
         if not hasattr(self, "_sonar_explosions"):
             self._sonar_explosions = []
-        # Create explosion contacts from recent explosions
-        explosion_contacts_list = explosion_contacts(own, getattr(self, "_sonar_explosions", []))
-        # Create countermeasure contacts (noisemakers and decoys)
-        cm_contacts = countermeasure_contacts(own, self.world.countermeasures)
+        if sonar_enabled:
+            proj_contacts = passive_projectiles(own, self.world.torpedoes, getattr(self.world, "depth_charges", []), frame=passive_frame)
+            # Create explosion contacts from recent explosions
+            explosion_contacts_list = explosion_contacts(own, self._sonar_explosions)
+            # Create countermeasure contacts (noisemakers and decoys)
+            cm_contacts = countermeasure_contacts(own, self.world.countermeasures, frame=passive_frame)
+        else:
+            proj_contacts = explosion_contacts_list = cm_contacts = []
         # Collect all AI ping responses
         # Include enemy ping contacts in the contacts list
         enemy_ping_contacts = []
@@ -1777,169 +1826,177 @@ class Simulation:
 
         # Note: all_ai_ping_responses removed from pingResponses - enemy pings should appear as contacts, not ping responses
         all_contacts = contacts + proj_contacts + explosion_contacts_list + cm_contacts + enemy_ping_contacts
-        # Reference tonal "ID cards" for the operator's narrowband filter browser.
-        # Sourced from the catalog (+ torpedo) so the library can't drift from what
-        # contacts actually emit. These are reference signatures (what a class looks
-        # like), not contact-specific truth — safe to expose.
-        tonal_cards = {
-            cls: list(cat.default_acoustics.tonal_lines)
-            for cls, cat in SHIP_CATALOG.items()
-            if getattr(cat.default_acoustics, "tonal_lines", None)
-        }
-        # One reference card per torpedo model so the operator can match an
-        # inbound fish to its type (Mk48 / 53-65 / SET-65 / Tigerfish).
-        for _tname, _tlines in TORPEDO_TONAL_CARDS.items():
-            tonal_cards[f"{_tname} torpedo"] = list(_tlines)
-        tel_sonar = {**base, "contacts": [c.dict() for c in all_contacts], "pingCooldown": max(0.0, self.active_ping_state.timer), "pingResponses": list(self._last_ping_responses), "lastPingAt": getattr(self, "_last_ping_at", None), "explosions": list(self._sonar_explosions), "tasks": [t.__dict__ for t in self._active_tasks['sonar']], "thermocline": own.acoustics.thermocline_on, "thermoclineDepth": getattr(own.acoustics, 'thermocline_depth_m', 50.0), "tonalCards": tonal_cards}
-        tel_weapons = {
-            **base,
-            "tubes": [t.dict() for t in own.weapons.tubes],
-            "consentRequired": CONFIG.require_captain_consent,
-            "captainConsent": self._captain_consent,
-            "tasks": [t.__dict__ for t in self._active_tasks['weapons']],
-            "countermeasures": {
-                "noisemakers": getattr(own.weapons, "noisemakers_stored", 0),
-                "decoys": getattr(own.weapons, "decoys_stored", 0),
-                "deployed": [
-                    {"id": cm["id"], "type": cm["type"], "age_s": cm.get("age_s", 0.0)}
-                    for cm in self.world.countermeasures if cm.get("active", False)
-                ]
+        tel_sonar = None
+        if BUS.has_subscribers("tick:sonar"):
+            # Reference tonal "ID cards" for the operator's narrowband filter browser.
+            # Sourced from the catalog (+ torpedo) so the library can't drift from what
+            # contacts actually emit. These are reference signatures (what a class looks
+            # like), not contact-specific truth — safe to expose.
+            tonal_cards = {
+                cls: list(cat.default_acoustics.tonal_lines)
+                for cls, cat in SHIP_CATALOG.items()
+                if getattr(cat.default_acoustics, "tonal_lines", None)
             }
-        }
-        # Build pump status with compartment assignments
-        pump_status = {
-            "assignments": self._pump_assignments,  # {pump_num: compartment_idx}
-            "pump1": self._pump_assignments.get(1),  # None or compartment index
-            "pump2": self._pump_assignments.get(2),  # None or compartment index
-        }
-        # Build compartment data for telemetry
-        compartment_data = [
-            {
-                "index": i,
-                "name": ["FORE", "FORWARD", "CONTROL", "REACTOR", "ENGINE", "STERN"][i],
-                "flooding_level": c.flooding_level,
-                "hull_integrity": c.hull_integrity,
-                "breach_rate": c.breach_rate,
-                "pump_active": c.pump_active,
+            # One reference card per torpedo model so the operator can match an
+            # inbound fish to its type (Mk48 / 53-65 / SET-65 / Tigerfish).
+            for _tname, _tlines in TORPEDO_TONAL_CARDS.items():
+                tonal_cards[f"{_tname} torpedo"] = list(_tlines)
+            tel_sonar = {**base, "contacts": [c.model_dump() for c in all_contacts], "pingCooldown": max(0.0, self.active_ping_state.timer), "pingResponses": list(self._last_ping_responses), "lastPingAt": getattr(self, "_last_ping_at", None), "explosions": list(self._sonar_explosions), "tasks": [t.__dict__ for t in self._active_tasks['sonar']], "thermocline": own.acoustics.thermocline_on, "thermoclineDepth": getattr(own.acoustics, 'thermocline_depth_m', 50.0), "tonalCards": tonal_cards}
+        tel_weapons = None
+        if BUS.has_subscribers("tick:weapons"):
+            tel_weapons = {
+                **base,
+                "tubes": [t.model_dump() for t in own.weapons.tubes],
+                "consentRequired": CONFIG.require_captain_consent,
+                "captainConsent": self._captain_consent,
+                "tasks": [t.__dict__ for t in self._active_tasks['weapons']],
+                "countermeasures": {
+                    "noisemakers": getattr(own.weapons, "noisemakers_stored", 0),
+                    "decoys": getattr(own.weapons, "decoys_stored", 0),
+                    "deployed": [
+                        {"id": cm["id"], "type": cm["type"], "age_s": cm.get("age_s", 0.0)}
+                        for cm in self.world.countermeasures if cm.get("active", False)
+                    ]
+                }
+            }
+        tel_engineering = None
+        if BUS.has_subscribers("tick:engineering"):
+            # Build pump status with compartment assignments
+            pump_status = {
+                "assignments": self._pump_assignments,  # {pump_num: compartment_idx}
+                "pump1": self._pump_assignments.get(1),  # None or compartment index
+                "pump2": self._pump_assignments.get(2),  # None or compartment index
+            }
+            # Build compartment data for telemetry
+            compartment_data = [
+                {
+                    "index": i,
+                    "name": ["FORE", "FORWARD", "CONTROL", "REACTOR", "ENGINE", "STERN"][i],
+                    "flooding_level": c.flooding_level,
+                    "hull_integrity": c.hull_integrity,
+                    "breach_rate": c.breach_rate,
+                    "pump_active": c.pump_active,
+                }
+                for i, c in enumerate(own.damage.compartments)
+            ]
+            # Per-route MW and the concrete effect each route is buying right now, so
+            # the Engineering station can route to optimize instead of guessing.
+            _rm = route_mw(own)
+            _speed_cap_kn = own.hull.max_speed * speed_cap_fraction(own)
+            power_routes = {
+                "reactorMw": own.reactor.output_mw,
+                "maxMw": own.reactor.max_mw,
+                "totalRoutedMw": sum(_rm.values()),
+                "reactorQuietMw": REACTOR_QUIET_MW,
+                "reactorNoise": noise_reactor,
+                "helm": {
+                    "mw": _rm["helm"],
+                    "speedCapKn": _speed_cap_kn,
+                    "maxSpeedKn": own.hull.max_speed,
+                    "limited": _speed_cap_kn < own.hull.max_speed - 0.5,
+                },
+                "sonar": {
+                    "mw": _rm["sonar"],
+                    "snrDb": sonar_snr_bonus_db(own),
+                },
+                "weapons": {
+                    "mw": _rm["weapons"],
+                    "reloadMult": reload_multiplier(own),
+                    "reloadS": own.weapons.reload_time_s,
+                },
+                "engineering": {
+                    "mw": _rm["engineering"],
+                    "repairRate": maintenance_rate(own),
+                },
+            }
+            tel_engineering = {
+                **base,
+                "reactor": own.reactor.model_dump(),
+                "pumps": pump_status,
+                "compartments": compartment_data,
+                "damage": own.damage.model_dump(),
+                "power": own.power.model_dump(),
+                "powerRoutes": power_routes,
+                "systems": own.systems.model_dump(),
+                "maintenance": own.maintenance.levels,
+                "tasks": [t.__dict__ for t in self._active_tasks['engineering']]
             }
-            for i, c in enumerate(own.damage.compartments)
-        ]
-        # Per-route MW and the concrete effect each route is buying right now, so
-        # the Engineering station can route to optimize instead of guessing.
-        _rm = route_mw(own)
-        _speed_cap_kn = own.hull.max_speed * speed_cap_fraction(own)
-        power_routes = {
-            "reactorMw": own.reactor.output_mw,
-            "maxMw": own.reactor.max_mw,
-            "totalRoutedMw": sum(_rm.values()),
-            "reactorQuietMw": REACTOR_QUIET_MW,
-            "reactorNoise": noise_reactor,
-            "helm": {
-                "mw": _rm["helm"],
-                "speedCapKn": _speed_cap_kn,
-                "maxSpeedKn": own.hull.max_speed,
-                "limited": _speed_cap_kn < own.hull.max_speed - 0.5,
-            },
-            "sonar": {
-                "mw": _rm["sonar"],
-                "snrDb": sonar_snr_bonus_db(own),
-            },
-            "weapons": {
-                "mw": _rm["weapons"],
-                "reloadMult": reload_multiplier(own),
-                "reloadS": own.weapons.reload_time_s,
-            },
-            "engineering": {
-                "mw": _rm["engineering"],
-                "repairRate": maintenance_rate(own),
-            },
-        }
-        tel_engineering = {
-            **base,
-            "reactor": own.reactor.dict(),
-            "pumps": pump_status,
-            "compartments": compartment_data,
-            "damage": own.damage.dict(),
-            "power": own.power.dict(),
-            "powerRoutes": power_routes,
-            "systems": own.systems.dict(),
-            "maintenance": own.maintenance.levels,
-            "tasks": [t.__dict__ for t in self._active_tasks['engineering']]
-        }
 
-        def bearings_to(sx: float, sy: float) -> Dict[str, float]:
-            # Compass bearing: 0=N, 90=E, 180=S, 270=W
-            dx = sx - own.kin.x
-            dy = sy - own.kin.y
-            # atan2 returns angle from +X; to get compass bearing from +Y (north), swap args as atan2(dx, dy)
-            brg_true = (math.degrees(math.atan2(dx, dy)) % 360.0)
-            # Validate south-of-ownship case to reduce confusion: if target.y < own.y and dx≈0, brg_true≈180
-            brg_rel = (brg_true - own.kin.heading + 360.0) % 360.0
-            return {"bearing_true": brg_true, "bearing_rel": brg_rel, "heading_to_face": brg_true}
-
-        debug_payload = {
-            "ownship": {
-                "x": own.kin.x, "y": own.kin.y, "depth": own.kin.depth,
-                "heading": own.kin.heading, "speed": own.kin.speed,
-            },
-            "missionId": getattr(CONFIG, "mission_id", "patrol") or "patrol",
-            "maintenance": {"spawnsEnabled": (not self._suppress_maintenance_spawns)},
-            "debugToggles": {
-                "playerVisual100": self._debug_player_visual_100,
-                "enemyVisual100": self._debug_enemy_visual_100
-            },
-            # AI orchestrator quick status for debug view
-            "ai": {
-                "enabled": bool(getattr(CONFIG, "use_ai_orchestrator", False)),
-                "engines": {
-                    "fleet": {"engine": getattr(CONFIG, "ai_fleet_engine", "stub"), "model": getattr(CONFIG, "ai_fleet_model", "stub")},
-                    "ship": {"engine": getattr(CONFIG, "ai_ship_engine", "stub"), "model": getattr(CONFIG, "ai_ship_model", "stub")},
+        debug_payload = None
+        if BUS.has_subscribers("tick:debug"):
+            def bearings_to(sx: float, sy: float) -> Dict[str, float]:
+                # Compass bearing: 0=N, 90=E, 180=S, 270=W
+                dx = sx - own.kin.x
+                dy = sy - own.kin.y
+                # atan2 returns angle from +X; to get compass bearing from +Y (north), swap args as atan2(dx, dy)
+                brg_true = (math.degrees(math.atan2(dx, dy)) % 360.0)
+                # Validate south-of-ownship case to reduce confusion: if target.y < own.y and dx≈0, brg_true≈180
+                brg_rel = (brg_true - own.kin.heading + 360.0) % 360.0
+                return {"bearing_true": brg_true, "bearing_rel": brg_rel, "heading_to_face": brg_true}
+
+            debug_payload = {
+                "ownship": {
+                    "x": own.kin.x, "y": own.kin.y, "depth": own.kin.depth,
+                    "heading": own.kin.heading, "speed": own.kin.speed,
                 },
-                # Last provider call metadata (if any)
-                "providerMeta": {
-                    "fleet": (getattr(getattr(self, "_ai_orch", None), "_fleet_engine", None)._last_call_meta if getattr(getattr(self, "_ai_orch", None), "_fleet_engine", None) is not None and hasattr(getattr(self, "_ai_orch", None)._fleet_engine, "_last_call_meta") else None),
-                    "ship": (getattr(getattr(self, "_ai_orch", None), "_ship_engine", None)._last_call_meta if getattr(getattr(self, "_ai_orch", None), "_ship_engine", None) is not None and hasattr(getattr(self, "_ai_orch", None)._ship_engine, "_last_call_meta") else None),
+                "missionId": getattr(CONFIG, "mission_id", "patrol") or "patrol",
+                "maintenance": {"spawnsEnabled": (not self._suppress_maintenance_spawns)},
+                "debugToggles": {
+                    "playerVisual100": self._debug_player_visual_100,
+                    "enemyVisual100": self._debug_enemy_visual_100
                 },
-            },
-            "ships": [
-                {
-                    "id": s.id, "side": s.side,
-                    "class": getattr(s, "ship_class", None),
-                    "capabilities": (getattr(s, "capabilities", None).dict() if getattr(s, "capabilities", None) else None),
-                    "weapons": (getattr(s, "weapons", None).dict() if getattr(s, "weapons", None) else None),
-                    "x": s.kin.x, "y": s.kin.y, "depth": s.kin.depth,
-                    "heading": s.kin.heading, "speed": s.kin.speed,
-                    # Damage information
-                    "damage": {
-                        "hull": s.damage.hull,
-                        "sensors": s.damage.sensors,
-                        "propulsion": s.damage.propulsion,
-                        "flooding_rate": s.damage.flooding_rate
+                # AI orchestrator quick status for debug view
+                "ai": {
+                    "enabled": bool(getattr(CONFIG, "use_ai_orchestrator", False)),
+                    "engines": {
+                        "fleet": {"engine": getattr(CONFIG, "ai_fleet_engine", "stub"), "model": getattr(CONFIG, "ai_fleet_model", "stub")},
+                        "ship": {"engine": getattr(CONFIG, "ai_ship_engine", "stub"), "model": getattr(CONFIG, "ai_ship_model", "stub")},
                     },
-                    # Passive detectability breakdown for debug
-                    "slDb": getattr(s.acoustics, "last_snr_db", 0.0) + (20.0 * 0),
-                    "snrDb": getattr(s.acoustics, "last_snr_db", 0.0),
-                    "passiveDetect": getattr(s.acoustics, "last_detectability", 0.0),
-                    **bearings_to(s.kin.x, s.kin.y),
-                    "range_from_own": (( ( (s.kin.x - own.kin.x)**2 + (s.kin.y - own.kin.y)**2 ) ** 0.5 )),
-                    # Include contacts this ship has detected (e.g., from player's active ping)
-                    "contacts": [c.dict() for c in getattr(self, "_enemy_ship_contacts", {}).get(s.id, [])]
-                }
-                for s in self.world.all_ships() if s.id != own.id
-            ],
-            "torpedoes": list(self.world.torpedoes),
-            "depth_charges": list(getattr(self.world, "depth_charges", [])),
-            "countermeasures": [
-                cm for cm in getattr(self.world, "countermeasures", []) or []
-                if cm.get("active", False)
-            ],
-        }
-        # Include Fleet Commander contact history if orchestrator is present
-        try:
-            if hasattr(self, "_ai_orch") and getattr(self, "_ai_orch", None) is not None:
-                debug_payload["contactHistory"] = list(getattr(self._ai_orch, "_fleet_contact_history", []))[-100:]
-        except Exception:
-            pass
+                    # Last provider call metadata (if any)
+                    "providerMeta": {
+                        "fleet": (getattr(getattr(self, "_ai_orch", None), "_fleet_engine", None)._last_call_meta if getattr(getattr(self, "_ai_orch", None), "_fleet_engine", None) is not None and hasattr(getattr(self, "_ai_orch", None)._fleet_engine, "_last_call_meta") else None),
+                        "ship": (getattr(getattr(self, "_ai_orch", None), "_ship_engine", None)._last_call_meta if getattr(getattr(self, "_ai_orch", None), "_ship_engine", None) is not None and hasattr(getattr(self, "_ai_orch", None)._ship_engine, "_last_call_meta") else None),
+                    },
+                },
+                "ships": [
+                    {
+                        "id": s.id, "side": s.side,
+                        "class": getattr(s, "ship_class", None),
+                        "capabilities": (getattr(s, "capabilities", None).model_dump() if getattr(s, "capabilities", None) else None),
+                        "weapons": (getattr(s, "weapons", None).model_dump() if getattr(s, "weapons", None) else None),
+                        "x": s.kin.x, "y": s.kin.y, "depth": s.kin.depth,
+                        "heading": s.kin.heading, "speed": s.kin.speed,
+                        # Damage information
+                        "damage": {
+                            "hull": s.damage.hull,
+                            "sensors": s.damage.sensors,
+                            "propulsion": s.damage.propulsion,
+                            "flooding_rate": s.damage.flooding_rate
+                        },
+                        # Passive detectability breakdown for debug
+                        "slDb": getattr(s.acoustics, "last_snr_db", 0.0) + (20.0 * 0),
+                        "snrDb": getattr(s.acoustics, "last_snr_db", 0.0),
+                        "passiveDetect": getattr(s.acoustics, "last_detectability", 0.0),
+                        **bearings_to(s.kin.x, s.kin.y),
+                        "range_from_own": (( ( (s.kin.x - own.kin.x)**2 + (s.kin.y - own.kin.y)**2 ) ** 0.5 )),
+                        # Include contacts this ship has detected (e.g., from player's active ping)
+                        "contacts": [c.model_dump() for c in getattr(self, "_enemy_ship_contacts", {}).get(s.id, [])]
+                    }
+                    for s in other_ships
+                ],
+                "torpedoes": list(self.world.torpedoes),
+                "depth_charges": list(getattr(self.world, "depth_charges", [])),
+                "countermeasures": [
+                    cm for cm in getattr(self.world, "countermeasures", []) or []
+                    if cm.get("active", False)
+                ],
+            }
+            # Include Fleet Commander contact history if orchestrator is present
+            try:
+                if hasattr(self, "_ai_orch") and getattr(self, "_ai_orch", None) is not None:
+                    debug_payload["contactHistory"] = list(getattr(self._ai_orch, "_fleet_contact_history", []))[-100:]
+            except Exception:
+                pass
         
         # Clean up old enemy ship contacts (older than 30 seconds)
         if hasattr(self, "_enemy_ship_contacts") and hasattr(self, "_enemy_ship_contacts_timestamps"):
@@ -1970,11 +2027,16 @@ class Simulation:
         await BUS.publish("tick:captain", {"topic": "telemetry", "data": tel_captain})
         # Store for tests/inspection
         self._last_captain_tel = tel_captain
-        await BUS.publish("tick:helm", {"topic": "telemetry", "data": tel_helm})
-        await BUS.publish("tick:sonar", {"topic": "telemetry", "data": tel_sonar})
-        await BUS.publish("tick:weapons", {"topic": "telemetry", "data": tel_weapons})
-        await BUS.publish("tick:engineering", {"topic": "telemetry", "data": tel_engineering})
-        await BUS.publish("tick:debug", {"topic": "telemetry", "data": debug_payload})
+        if tel_helm is not None:
+            await BUS.publish("tick:helm", {"topic": "telemetry", "data": tel_helm})
+        if tel_sonar is not None:
+            await BUS.publish("tick:sonar", {"topic": "telemetry", "data": tel_sonar})
+        if tel_weapons is not None:
+            await BUS.publish("tick:weapons", {"topic": "telemetry", "data": tel_weapons})
+        if tel_engineering is not None:
+            await BUS.publish("tick:engineering", {"topic": "telemetry", "data": tel_engineering})
+        if debug_payload is not None:
+            await BUS.publish("tick:debug", {"topic": "telemetry", "data": debug_payload})
         # Shared tactical plot — its own channel; payload is small and
         # delta-friendly, but we also include ownship pos and the mission
         # brief summary so the /plot page is fully self-contained.
@@ -2010,7 +2072,7 @@ class Simulation:
                     "x": s.kin.x, "y": s.kin.y, "depth": s.kin.depth,
                     "heading": s.kin.heading, "speed": s.kin.speed,
                 }
-                for s in self.world.all_ships()
+                for s in ships
             ],
         }
         await BUS.publish("tick:fleet", {"topic": "telemetry", "data": fleet_payload})
@@ -2053,7 +2115,7 @@ class Simulation:
         """
         for ev in core_result.events:
             if ev.kind in ("torpedo.detonated", "depth_charge.detonated"):
-                insert_event(self.engine, self.run_id, ev.kind, json.dumps(ev.payload))
+                insert_event(self.engine, self.run_id, ev.kind, ev.payload)
                 self._transient_events.append({
                     "type": ev.kind,
                     "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
@@ -2078,7 +2140,7 @@ class Simulation:
                         "y": ev.payload.get("y", 0.0),
                         "at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
                     })
-                    insert_event(self.engine, self.run_id, "ship.destroyed", json.dumps({"ship_id": ship_id}))
+                    insert_event(self.engine, self.run_id, "ship.destroyed", {"ship_id": ship_id})
 
         if core_result.sonar_explosions:
             if not hasattr(self, "_sonar_explosions"):
@@ -2199,8 +2261,6 @@ class Simulation:
 
     def _handle_captain_comms(self, dt: float) -> None:
         own = self.world.get_ship("ownship")
-        if not hasattr(self, "_sim_time_s"):
-            self._sim_time_s = 0.0
         self._sim_time_s += dt
         # Require shallow enough depth and radio raised
         at_radio_depth = own.kin.depth <= 20.0 and self._radio_raised
@@ -2212,8 +2272,6 @@ class Simulation:
         if 0 <= next_idx < len(sched):
             if self._sim_time_s >= sched[next_idx]["at_s"]:
                 # Append to captain comms list
-                if not hasattr(self, "_captain_comms"):
-                    self._captain_comms = []
                 ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
                 self._captain_comms.append({"at": ts, "text": sched[next_idx]["msg"]})
                 self._delivered_comms_idx = next_idx
@@ -2291,8 +2349,6 @@ class Simulation:
                 msgs = result.get("messages") or []
                 if not msgs:
                     return
-                if not hasattr(self, "_captain_comms"):
-                    self._captain_comms = []
                 ts = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
                 for m in msgs:
                     if not isinstance(m, dict):
@@ -2319,9 +2375,9 @@ class Simulation:
 
     async def handle_command(self, topic: str, data: Dict) -> Optional[str]:
         # Guard: allow only debug commands when no mission is active or world not ready
-        if not self._mission_active and not topic.startswith("debug."):
-            return "No active mission"
-        own = self.world.get_ship("ownship")
-        if own is None and not topic.startswith("debug."):
-            return "Simulation not ready"
+        if not topic.startswith("debug."):
+            if not self._mission_active:
+                return "No active mission"
+            if self.world.get_ship("ownship") is None:
+                return "Simulation not ready"
         return await self._cmd_dispatcher.dispatch(topic, data)
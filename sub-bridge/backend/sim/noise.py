@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import math
+from dataclasses import dataclass, field
 from typing import Dict, List, Tuple, Any
 import random
 
@@ -22,10 +23,29 @@ STATION_CALIB: Dict[str, Tuple[float, float]] = {
 # Bottom-up so index 0 == quietest.
 _BANDS = ("minimal", "low", "medium", "high", "extreme")
 
+# Half-width (dB) of the flutter added to each station's displayed level.
+DISPLAY_JITTER_DB = 0.7
+
+# Tube transition -> (label, sustained dB) while the tube timer runs.
+_TUBE_NOISE: Dict[str, Tuple[str, float]] = {
+    "Loaded": ("loading", 62.0),
+    "Flooded": ("flooding", 68.0),
+    "DoorsOpen": ("doors", 72.0),
+}
+
+# Maintenance noise baseline per station, before the stage multiplier.
+_TASK_BASE_DB: Dict[str, float] = {"helm": 60.0, "sonar": 58.0, "weapons": 64.0, "engineering": 66.0}
+
 
 def _sum_db(levels: List[float]) -> float:
     if not levels:
         return 0.0
+    if len(levels) == 1:
+        # A single source is its own level; skip the linear round trip.
+        try:
+            return max(-120.0, float(levels[0]))
+        except Exception:
+            return -120.0
     lin = 0.0
     for l in levels:
         try:
@@ -50,6 +70,35 @@ def _band_for(db: float, lo: float, hi: float) -> str:
     return _BANDS[idx]
 
 
+@dataclass(slots=True)
+class NoiseInputs:
+    """Loop-side flags the noise model reads each tick.
+
+    The simulation keeps one instance and refreshes it before calling
+    `NoiseEngine.tick`, so the engine reads plain attributes instead of
+    probing the loop object with getattr.
+    """
+
+    periscope_raised: bool = False
+    radio_raised: bool = False
+    pump_fwd: bool = False
+    pump_aft: bool = False
+    # station -> list of MaintenanceTask
+    active_tasks: Dict[str, list] = field(default_factory=dict)
+
+    @classmethod
+    def from_state(cls, loop_state: Any) -> "NoiseInputs":
+        """Build inputs from any object exposing the legacy loop attributes."""
+        tasks = getattr(loop_state, "_active_tasks", {}) or {}
+        return cls(
+            periscope_raised=bool(getattr(loop_state, "_periscope_raised", False)),
+            radio_raised=bool(getattr(loop_state, "_radio_raised", False)),
+            pump_fwd=bool(getattr(loop_state, "_pump_fwd", False)),
+            pump_aft=bool(getattr(loop_state, "_pump_aft", False)),
+            active_tasks=tasks if isinstance(tasks, dict) else {},
+        )
+
+
 class NoiseEngine:
     """Aggregates station noise contributions (dB) from sustained sources and impulses.
 
@@ -67,8 +116,9 @@ class NoiseEngine:
     """
 
     def __init__(self) -> None:
-        # impulses[station] = list of (level_db, ttl_s, label)
-        self._impulses: Dict[str, List[Tuple[float, float, str]]] = {
+        # impulses[station] = list of [level_db, ttl_s, label]; entries are
+        # decayed in place and the list is only rebuilt when one expires.
+        self._impulses: Dict[str, List[List[Any]]] = {
             s: [] for s in ("helm", "sonar", "weapons", "engineering")
         }
         # track counts for world-based impulses (e.g., depth charges)
@@ -77,120 +127,102 @@ class NoiseEngine:
     def add_impulse(self, station: str, level_db: float, duration_s: float, label: str = "Transient") -> None:
         if station not in self._impulses:
             self._impulses[station] = []
-        self._impulses[station].append((float(level_db), max(0.05, float(duration_s)), str(label)))
+        self._impulses[station].append([float(level_db), max(0.05, float(duration_s)), str(label)])
 
     def _tick_impulses(self, dt: float) -> Dict[str, List[Tuple[str, float]]]:
         """Decay impulses; return per-station list of (label, level) still active."""
-        out: Dict[str, List[Tuple[str, float]]] = {s: [] for s in self._impulses.keys()}
+        out: Dict[str, List[Tuple[str, float]]] = {}
         for st, lst in self._impulses.items():
-            next_list: List[Tuple[float, float, str]] = []
-            active: List[Tuple[str, float]] = []
-            for (lvl, ttl, label) in lst:
-                ttl2 = ttl - dt
-                if ttl2 > 0:
-                    next_list.append((lvl, ttl2, label))
-                    active.append((label, lvl))
-            self._impulses[st] = next_list
-            out[st] = active
+            if not lst:
+                out[st] = []
+                continue
+            expired = False
+            for imp in lst:
+                imp[1] -= dt
+                if imp[1] <= 0:
+                    expired = True
+            if expired:
+                lst[:] = [imp for imp in lst if imp[1] > 0]
+            out[st] = [(label, lvl) for (lvl, _ttl, label) in lst]
         return out
 
     def tick(self, own, world, dt: float, loop_state: Any) -> Dict[str, Any]:
+        """`loop_state` is a `NoiseInputs`, or any object with the legacy
+        loop attributes (converted once per call)."""
+        inputs = loop_state if isinstance(loop_state, NoiseInputs) else NoiseInputs.from_state(loop_state)
         # Labeled sustained contributions per station: (label, level_db)
         contrib: Dict[str, List[Tuple[str, float]]] = {
             "helm": [], "sonar": [], "weapons": [], "engineering": []
         }
 
         # Helm: propulsion baseline from speed (map 0..max_speed to ~50..75 dB)
-        try:
-            max_spd = max(1.0, float(own.hull.max_speed))
-            frac = max(0.0, min(1.0, float(own.kin.speed) / max_spd))
-            contrib["helm"].append(("Propulsion", 50.0 + 25.0 * (frac ** 1.2)))
-        except Exception:
-            pass
+        max_spd = max(1.0, own.hull.max_speed)
+        frac = max(0.0, min(1.0, own.kin.speed / max_spd))
+        contrib["helm"].append(("Propulsion", 50.0 + 25.0 * (frac ** 1.2)))
 
         # Engineering: reactor baseline from MW (map 0..max_mw to ~55..78 dB)
-        try:
-            mw = float(getattr(own.reactor, "output_mw", 0.0))
-            max_mw = float(getattr(own.reactor, "max_mw", 100.0)) or 100.0
-            frac = max(0.0, min(1.0, mw / max_mw))
-            contrib["engineering"].append(("Reactor", 55.0 + 23.0 * (frac ** 1.1)))
-        except Exception:
-            pass
+        reactor = own.reactor
+        max_mw = reactor.max_mw or 100.0
+        frac = max(0.0, min(1.0, reactor.output_mw / max_mw))
+        contrib["engineering"].append(("Reactor", 55.0 + 23.0 * (frac ** 1.1)))
 
         # Sonar: mast mechanics when raised
-        try:
-            if bool(getattr(loop_state, "_periscope_raised", False)):
-                contrib["sonar"].append(("Periscope mast", 60.0))
-            if bool(getattr(loop_state, "_radio_raised", False)):
-                contrib["sonar"].append(("Radio mast", 60.0))
-        except Exception:
-            pass
+        if inputs.periscope_raised:
+            contrib["sonar"].append(("Periscope mast", 60.0))
+        if inputs.radio_raised:
+            contrib["sonar"].append(("Radio mast", 60.0))
 
         # Engineering: ballast/flood pumps from loop flags
-        try:
-            if bool(getattr(loop_state, "_pump_fwd", False)):
-                contrib["engineering"].append(("Ballast pump (fwd)", 72.0))
-            if bool(getattr(loop_state, "_pump_aft", False)):
-                contrib["engineering"].append(("Ballast pump (aft)", 72.0))
-        except Exception:
-            pass
+        if inputs.pump_fwd:
+            contrib["engineering"].append(("Ballast pump (fwd)", 72.0))
+        if inputs.pump_aft:
+            contrib["engineering"].append(("Ballast pump (aft)", 72.0))
 
         # Weapons: tube operations noise during timed state transitions
-        try:
-            for t in own.weapons.tubes:
-                ts = float(getattr(t, "timer_s", 0.0) or 0.0)
-                if ts <= 0.0:
-                    continue
-                nx = getattr(t, "next_state", None)
-                idx = getattr(t, "idx", "?")
-                if nx == "Loaded":
-                    contrib["weapons"].append((f"Tube {idx}: loading", 62.0))
-                elif nx == "Flooded":
-                    contrib["weapons"].append((f"Tube {idx}: flooding", 68.0))
-                elif nx == "DoorsOpen":
-                    contrib["weapons"].append((f"Tube {idx}: doors", 72.0))
-        except Exception:
-            pass
+        weapons_contrib = contrib["weapons"]
+        for t in own.weapons.tubes:
+            if t.timer_s <= 0.0:
+                continue
+            label = _TUBE_NOISE.get(t.next_state)
+            if label is not None:
+                weapons_contrib.append((f"Tube {t.idx}: {label[0]}", label[1]))
 
         # Maintenance tasks: base by station × stage multiplier
-        try:
-            tasks = getattr(loop_state, "_active_tasks", {}) or {}
-            base_by_station = {"helm": 60.0, "sonar": 58.0, "weapons": 64.0, "engineering": 66.0}
-            for station, task_list in (tasks.items() if isinstance(tasks, dict) else []):
-                if station not in contrib:
-                    continue
-                for task in task_list:
-                    stage = getattr(task, "stage", "task")
-                    base = base_by_station.get(station, 60.0)
-                    mult = 1.0 if stage == "task" else (1.25 if stage == "failing" else 1.5)
-                    title = getattr(task, "title", None) or "Maintenance"
-                    suffix = "" if stage == "task" else f" ({stage})"
-                    contrib[station].append((f"{title}{suffix}", base * mult))
-        except Exception:
-            pass
+        for station, task_list in inputs.active_tasks.items():
+            if station not in contrib:
+                continue
+            base = _TASK_BASE_DB.get(station, 60.0)
+            for task in task_list:
+                stage = task.stage
+                mult = 1.0 if stage == "task" else (1.25 if stage == "failing" else 1.5)
+                title = task.title or "Maintenance"
+                suffix = "" if stage == "task" else f" ({stage})"
+                contrib[station].append((f"{title}{suffix}", base * mult))
 
         # New depth charges cause a labeled weapons impulse
-        try:
-            count_dc = len(getattr(world, "depth_charges", []) or [])
-            if count_dc > self._last_depth_charge_count:
-                for _ in range(count_dc - self._last_depth_charge_count):
-                    self.add_impulse("weapons", 80.0, 0.5, "Depth charge")
-            self._last_depth_charge_count = count_dc
-        except Exception:
-            pass
+        count_dc = len(world.depth_charges)
+        if count_dc > self._last_depth_charge_count:
+            for _ in range(count_dc - self._last_depth_charge_count):
+                self.add_impulse("weapons", 80.0, 0.5, "Depth charge")
+        self._last_depth_charge_count = count_dc
 
         impulse_contrib = self._tick_impulses(dt)
 
         out: Dict[str, Any] = {}
         clean_levels: Dict[str, float] = {}
+        # random.uniform is a Python-level wrapper around random(); draw the
+        # jitter straight from random() with the same [-J, J) spread.
+        rand = random.random
+        jitter_span = 2.0 * DISPLAY_JITTER_DB
         for st in ("helm", "sonar", "weapons", "engineering"):
-            items: List[Tuple[str, float]] = list(contrib.get(st, []))
-            items.extend(impulse_contrib.get(st, []))
+            # contrib lists are built fresh each tick, so extend in place
+            items: List[Tuple[str, float]] = contrib[st]
+            items.extend(impulse_contrib.get(st, ()))
             # Clean (un-jittered) level drives the band so the label doesn't flicker.
             clean = _sum_db([lvl for (_, lvl) in items])
             clean_levels[st] = clean
             # Jitter the *displayed* value so the bar flutters; band stays steady.
-            display = (clean + random.uniform(-0.7, 0.7)) if clean > 0.0 else 0.0
+            display = (clean - DISPLAY_JITTER_DB + jitter_span * rand()) if clean > 0.0 else 0.0
             lo, hi = STATION_CALIB[st]
             ranked = sorted(items, key=lambda kv: kv[1], reverse=True)
             out[st] = {
@@ -10,8 +10,13 @@ DEG_TO_RAD = math.pi / 180.0
 RAD_TO_DEG = 180.0 / math.pi
 
 
+# Cavitation inception speed rises linearly with depth between these bounds.
+CAVITATION_MIN_SPEED = 5.0
+CAVITATION_MAX_SPEED = 30.0
+
+
 def cavitation_speed_for_depth(depth_m: float) -> float:
-    return max(5.0, min(30.0, 0.08 * depth_m + 5.0))
+    return max(CAVITATION_MIN_SPEED, min(CAVITATION_MAX_SPEED, 0.08 * depth_m + 5.0))
 
 
 # --- Depth-control model -------------------------------------------------
@@ -52,6 +57,8 @@ def integrate_kinematics(
 ) -> Tuple[bool, float, float, float]:
     hull = ship.hull
     kin = ship.kin
+    # Ship.systems always has a default SystemsStatus, so read it directly
+    systems = ship.systems
 
     # Apply hull damage effects to performance
     hull_damage_factor = max(0.1, 1.0 - ship.damage.hull)  # 0.1 = 10% performance at 100% damage
@@ -63,7 +70,8 @@ def integrate_kinematics(
     # At the default 25% helm allocation this equals output_mw/max_mw (legacy).
     reactor_cap_speed = hull.max_speed * speed_cap_fraction(ship) * hull_damage_factor
     # Allow an ordered astern bell down to a fraction of the forward cap.
-    target_speed = clamp(ordered_speed, -reactor_cap_speed * REVERSE_SPEED_FRACTION, reactor_cap_speed)
+    # (clamps are written inline throughout: this runs per ship per tick)
+    target_speed = max(-reactor_cap_speed * REVERSE_SPEED_FRACTION, min(reactor_cap_speed, ordered_speed))
 
     if target_speed > kin.speed:
         kin.speed = min(target_speed, kin.speed + hull.accel_max * damage_accel_factor * dt)
@@ -71,15 +79,14 @@ def integrate_kinematics(
         kin.speed = max(target_speed, kin.speed - hull.decel_max * damage_accel_factor * dt)
 
     # Rudder failure disables turning
-    rudder_ok = getattr(ship, "systems", None) is None or ship.systems.rudder_ok
-    dh = ((ordered_heading - kin.heading + 540) % 360) - 180
+    rudder_ok = systems.rudder_ok
+    dh = ((ordered_heading - kin.heading + 180.0) % 360.0) - 180.0
     max_turn = hull.turn_rate_max * damage_turn_factor * dt
-    turn = 0.0 if not rudder_ok else clamp(dh, -max_turn, max_turn)
-    kin.heading = (kin.heading + turn) % 360
+    turn = 0.0 if not rudder_ok else max(-max_turn, min(max_turn, dh))
+    kin.heading = (kin.heading + turn) % 360.0
 
     # Depth rate = speed-independent ballast floor + speed^2 diving-planes term.
-    ballast_ok = getattr(ship, "systems", None) is None or ship.systems.ballast_ok
-    if not ballast_ok:
+    if not systems.ballast_ok:
         ballast_rate = BALLAST_FAILED_RATE
     elif ballast_boost:
         ballast_rate = BALLAST_BOOST_RATE
@@ -87,22 +94,26 @@ def integrate_kinematics(
         ballast_rate = BALLAST_FLOOR_RATE
     # Diving planes can be lost independently of ballast; when they fail the
     # boat falls back to ballast-only depth control regardless of speed.
-    planes_ok = getattr(ship, "systems", None) is None or ship.systems.planes_ok
     # Planes use actual speed (you only get the lift you currently have way for).
-    planes_rate = planes_depth_rate(kin.speed) if planes_ok else 0.0
+    planes_rate = planes_depth_rate(kin.speed) if systems.planes_ok else 0.0
     max_depth_rate = (ballast_rate + planes_rate) * damage_turn_factor
     # Enforce platform depth limits for surface vessels and subs alike
-    limited_ordered_depth = clamp(ordered_depth, 0.0, hull.max_depth)
+    max_depth = hull.max_depth
+    limited_ordered_depth = max(0.0, min(max_depth, ordered_depth))
     dz = limited_ordered_depth - kin.depth
-    step = clamp(dz, -max_depth_rate * dt, max_depth_rate * dt)
-    kin.depth = clamp(kin.depth + step, 0.0, hull.max_depth)
+    max_step = max_depth_rate * dt
+    step = max(-max_step, min(max_step, dz))
+    kin.depth = max(0.0, min(max_depth, kin.depth + step))
     kin.depth_rate = step / dt if dt > 0 else 0.0  # signed achieved rate (m/s)
 
     # Move using compass convention (0°=North, 90°=East):
     # x increases to the East → sin(heading), y increases to the North → cos(heading)
-    sog_mps = kin.speed * KNOTS_TO_MPS
-    kin.x += math.sin(kin.heading * DEG_TO_RAD) * sog_mps * dt
-    kin.y += math.cos(kin.heading * DEG_TO_RAD) * sog_mps * dt
-
-    cav = kin.speed > cavitation_speed_for_depth(kin.depth)
+    dist_m = kin.speed * KNOTS_TO_MPS * dt
+    rad = kin.heading * DEG_TO_RAD
+    kin.x += math.sin(rad) * dist_m
+    kin.y += math.cos(rad) * dist_m
+
+    # Nothing cavitates at or below the shallowest threshold; skip the depth
+    # curve for the common slow case.
+    cav = kin.speed > CAVITATION_MIN_SPEED and kin.speed > cavitation_speed_for_depth(kin.depth)
     return cav, kin.heading, kin.speed, kin.depth
@@ -2,6 +2,7 @@ from __future__ import annotations
 import math
 import random
 import time
+from bisect import bisect_left
 from typing import List, Tuple, Dict, Any, Optional, TYPE_CHECKING
 from ..models import Ship, TelemetryContact
 
@@ -10,6 +11,10 @@ if TYPE_CHECKING:
 
 
 BAFFLES_DEG = 60.0
+# Baffle cull threshold: a source is in the baffles when its component along
+# ownship's bow is below -BAFFLE_COS of its range (i.e. within BAFFLES_DEG/2
+# of dead astern). Fixed at import so no per-frame trig is needed.
+BAFFLE_COS = math.cos(math.radians(BAFFLES_DEG / 2))
 # Torpedo tonal "ID card" (kHz) for the sonar tonal filter. Torpedoes aren't
 # catalog ships, so their card is seeded here. Shares 5.0/12.0 kHz with the
 # Destroyer card by design (telling an inbound fish from its escort is hard);
@@ -50,8 +55,58 @@ def normalize_angle_deg(angle: float) -> float:
     return angle % 360.0
 
 
-def angle_diff(a: float, b: float) -> float:
-    return ((a - b + 540) % 360) - 180
+class PassiveFrame:
+    """Observer-side terms shared by the passive contact builders.
+
+    Everything here depends only on the listening ship, so the tick builds one
+    frame and hands it to `passive_contacts`, `passive_projectiles` and
+    `countermeasure_contacts` instead of each deriving it again.
+    """
+
+    __slots__ = (
+        "sx", "sy", "fwd_x", "fwd_y", "baffle_cos",
+        "thermocline_on", "thermo_depth", "self_below",
+        "penalty", "power_gain",
+    )
+
+    def __init__(self, self_ship: Ship) -> None:
+        kin = self_ship.kin
+        acoustics = self_ship.acoustics
+        self.sx = kin.x
+        self.sy = kin.y
+        # Unit bow vector for the dot-product baffle cull (see BAFFLE_COS).
+        heading_rad = math.radians(kin.heading)
+        self.fwd_x = math.sin(heading_rad)
+        self.fwd_y = math.cos(heading_rad)
+        self.baffle_cos = BAFFLE_COS
+        self.thermocline_on = acoustics.thermocline_on
+        self.thermo_depth = getattr(acoustics, 'thermocline_depth_m', 50.0)
+        self.self_below = kin.depth > self.thermo_depth
+        # Passive SNR penalty from degraded systems; routed sonar power
+        # adds/subtracts processing gain (0 at nominal alloc).
+        self.penalty = getattr(acoustics, "passive_snr_penalty_db", 0.0)
+        self.power_gain = getattr(acoustics, "passive_snr_power_db", 0.0)
+
+
+def source_level_for_speed(acoustics, speed: float, default: float = 110.0) -> float:
+    """Source level from the table entry nearest `speed` (ties go low)."""
+    table = acoustics.source_level_by_speed
+    if not table:
+        return default
+    if len(table) == 1:
+        # Ownship's table is rebuilt each tick with one dynamic level; skip
+        # the key search and the sorted-key cache rebuild it would trigger.
+        return next(iter(table.values()))
+    keys = acoustics.sorted_speed_keys()
+    spd = abs(speed)
+    idx = bisect_left(keys, spd)
+    if idx == len(keys):
+        key = keys[-1]
+    elif idx > 0 and spd - keys[idx - 1] <= keys[idx] - spd:
+        key = keys[idx - 1]
+    else:
+        key = keys[idx]
+    return table.get(key, default)
 
 
 def passive_contacts(
@@ -59,6 +114,7 @@ def passive_contacts(
     others: List[Ship],
     contact_registry: Optional['ContactRegistry'] = None,
     current_time_override: Optional[float] = None,
+    frame: Optional[PassiveFrame] = None,
 ) -> List[TelemetryContact]:
     """Generate passive sonar contacts with hysteresis to prevent flickering.
 
@@ -69,6 +125,7 @@ def passive_contacts(
             If provided, contacts will use "Contact-N" IDs and sonar-based classification.
             If None, contacts use actual ship IDs (for backwards compatibility/testing).
         current_time_override: Optional time to use instead of time.time()
+        frame: Optional precomputed `PassiveFrame` for `self_ship`
 
     Returns:
         List of detected contacts
@@ -79,73 +136,97 @@ def passive_contacts(
 
     # Initialize contact memory for this observer
     observer_id = self_ship.id
-    if observer_id not in _contact_memory:
-        _contact_memory[observer_id] = {}
+    memory_by_target = _contact_memory.setdefault(observer_id, {})
+    # Empty scene with nothing remembered (e.g. a lone ownship before the
+    # mission spawns contacts): no targets and no stale entries to expire.
+    if not others and not memory_by_target:
+        return []
 
     current_time = current_time_override if current_time_override is not None else time.time()
     contacts: List[TelemetryContact] = []
     detected_ids: set = set()  # Track which targets were detected this tick
 
+    # Observer-side terms are the same for every target; compute them once
+    # rather than per pair.
+    if frame is None:
+        frame = PassiveFrame(self_ship)
+    sx = frame.sx
+    sy = frame.sy
+    fwd_x = frame.fwd_x
+    fwd_y = frame.fwd_y
+    baffle_cos = frame.baffle_cos
+    thermocline_on = frame.thermocline_on
+    thermo_depth = frame.thermo_depth
+    self_below = frame.self_below
+    ambient = 60.0
+    # Sonar equation: SNR = SL - TL - NL + AG (array gain from beamforming)
+    snr_offset = -ambient + ARRAY_GAIN_DB - frame.penalty + frame.power_gain
+    bearing_noise_extra = self_ship.acoustics.bearing_noise_extra
+    # Per-pair math is plain float arithmetic: bind the math/random callables
+    # locally and inline the angle helpers to keep the loop body tight.
+    hypot = math.hypot
+    atan2 = math.atan2
+    degrees = math.degrees
+    log10 = math.log10
+    gauss = random.gauss
+
     for other in others:
-        if other.id == self_ship.id:
+        other_id = other.id
+        if other_id == observer_id:
             continue
-        dx = other.kin.x - self_ship.kin.x
-        dy = other.kin.y - self_ship.kin.y
-        rng = math.hypot(dx, dy)
-        # Compass bearing: 0=N, 90=E, 180=S, 270=W
-        brg = normalize_angle_deg(math.degrees(math.atan2(dx, dy)))
-        rel = angle_diff(brg, self_ship.kin.heading)
-        if abs(rel) > 180 - BAFFLES_DEG / 2:
+        # Read the target's kinematics/acoustics once; each is used several
+        # times below and every hop is a pydantic attribute lookup.
+        kin = other.kin
+        other_acoustics = other.acoustics
+        other_depth = kin.depth
+        dx = kin.x - sx
+        dy = kin.y - sy
+        rng = hypot(dx, dy)
+        if dx * fwd_x + dy * fwd_y < -rng * baffle_cos:
             continue
         # Source level from target class/speed (fallback to default curve), with surface/periscope penalties
-        speed_key = min(sorted(other.acoustics.source_level_by_speed.keys()), key=lambda k: abs(k - abs(other.kin.speed)))
-        src_lvl = other.acoustics.source_level_by_speed.get(speed_key, 110.0)
+        src_lvl = source_level_for_speed(other_acoustics, kin.speed)
         # If target is at/near surface, increase detectability due to wave slap/exhaust
-        if other.kin.depth <= 1.0:
+        if other_depth <= 1.0:
             src_lvl += 6.0
-        # If periscope or radio mast up on other side (if flags exist on that ship), add small penalty
-        mast_bonus = 0.0
-        if hasattr(other, "_periscope_raised") and getattr(other, "_periscope_raised"):
-            mast_bonus += 2.0
-        if hasattr(other, "_radio_raised") and getattr(other, "_radio_raised"):
-            mast_bonus += 2.0
-        src_lvl += mast_bonus
-        # Transmission loss with depth-dependent thermocline effects
-        tl_geo = 20.0 * math.log10(max(1.0, rng))
+        # Transmission loss with depth-dependent thermocline effects. The
+        # clamps in this block are conditional expressions rather than
+        # max()/min() calls: same result, no builtin call per pair.
+        tl = 20.0 * log10(rng if rng > 1.0 else 1.0)
         # Thermocline creates shadow zone when source and receiver are on opposite sides
-        layer_atten = 0.0
-        if self_ship.acoustics.thermocline_on:
-            thermo_depth = getattr(self_ship.acoustics, 'thermocline_depth_m', 50.0)
-            self_below = self_ship.kin.depth > thermo_depth
-            other_below = other.kin.depth > thermo_depth
-            if self_below != other_below:  # On opposite sides of thermocline
-                layer_atten = 8.0  # Strong attenuation across layer
-        tl = tl_geo + layer_atten
-        ambient = 60.0
-        # Apply passive SNR penalty from degraded systems
-        penalty = getattr(self_ship.acoustics, "passive_snr_penalty_db", 0.0)
-        # Routed sonar power adds/subtracts processing gain (0 at nominal alloc).
-        power_gain = getattr(self_ship.acoustics, "passive_snr_power_db", 0.0)
-        # Sonar equation: SNR = SL - TL - NL + AG (array gain from beamforming)
-        snr_db = max(0.0, src_lvl - tl - ambient + ARRAY_GAIN_DB - penalty + power_gain)
-        # Detectability soft-knee mapping to 0..1
-        detect = max(0.0, min(1.0, snr_db / 30.0))
+        if thermocline_on and self_below != (other_depth > thermo_depth):
+            tl += 8.0  # Strong attenuation across layer
+        snr_db = src_lvl - tl + snr_offset
+        if snr_db < 0.0:
+            snr_db = 0.0
+        # Detectability soft-knee mapping to 0..1 (snr_db is already >= 0)
+        detect = snr_db / 30.0
+        if detect > 1.0:
+            detect = 1.0
+
+        # Hysteresis: use memory to prevent flickering. Targets below threshold
+        # with no memory produce nothing, so skip the bearing/noise work. A
+        # miss yields None rather than a fresh empty dict per pair.
+        memory = memory_by_target.get(other_id)
+        if detect < 0.15 and not memory:
+            continue
 
+        # Compass bearing: 0=N, 90=E, 180=S, 270=W
+        brg = degrees(atan2(dx, dy)) % 360.0
         # Bearing error: faster targets produce more Doppler shift = BETTER localization
         # At 0 kn: sigma ~8° (hard to localize stationary target)
         # At 20 kn: sigma ~2° (easy to localize fast, loud target)
-        base_sigma = max(1.5, 8.0 - other.kin.speed * 0.3)
-        sigma = base_sigma + self_ship.acoustics.bearing_noise_extra
-        noisy_bearing = normalize_angle_deg(brg + random.gauss(0, sigma))
-
-        # Hysteresis: use memory to prevent flickering
-        memory = _contact_memory[observer_id].get(other.id, {})
+        base_sigma = 8.0 - kin.speed * 0.3
+        if base_sigma < 1.5:
+            base_sigma = 1.5
+        sigma = base_sigma + bearing_noise_extra
+        noisy_bearing = (brg + gauss(0, sigma)) % 360.0
 
         if detect >= 0.15:
             # Contact above threshold - update memory and emit contact
-            detected_ids.add(other.id)
+            detected_ids.add(other_id)
             confidence = min(1.0, detect * 1.2)
-            _contact_memory[observer_id][other.id] = {
+            memory_by_target[other_id] = {
                 "last_seen": current_time,
                 "last_confidence": confidence,
                 "last_bearing": noisy_bearing,
@@ -155,13 +236,13 @@ def passive_contacts(
             }
 
             # Store last computed detectability on target for debug use (optional)
-            other.acoustics.last_snr_db = snr_db
-            other.acoustics.last_detectability = detect
+            other_acoustics.last_snr_db = snr_db
+            other_acoustics.last_detectability = detect
 
             # Determine contact ID and classification based on registry
             if contact_registry is not None:
                 # Use anonymous designation
-                contact_id = contact_registry.get_or_create_designation(other.id, current_time)
+                contact_id = contact_registry.get_or_create_designation(other_id, current_time)
                 # Check if this contact has been identified by captain
                 if contact_registry.is_identified(contact_id):
                     # Identified: show actual ship type
@@ -171,7 +252,7 @@ def passive_contacts(
                     classified_as = _classify_sonar_signature(other, detect, snr_db)
             else:
                 # No registry (backwards compatibility): use actual IDs
-                contact_id = other.id
+                contact_id = other_id
                 classified_as = _classify_ship_passive(other, detect, snr_db, rng)
 
             contacts.append(
@@ -186,12 +267,12 @@ def passive_contacts(
                     detectability=detect,
                     snrDb=snr_db,
                     bearingSigmaDeg=sigma,
-                    tonalLines=list(other.acoustics.tonal_lines),
+                    tonalLines=list(other_acoustics.tonal_lines),
                 )
             )
         elif memory and current_time - memory.get("last_seen", 0) < CONTACT_PERSISTENCE_SECONDS:
             # Contact below threshold but within persistence window - emit fading contact
-            detected_ids.add(other.id)
+            detected_ids.add(other_id)
             time_since_seen = current_time - memory["last_seen"]
             decay_factor = max(0.0, 1.0 - time_since_seen * CONTACT_DECAY_RATE)
             fading_confidence = memory["last_confidence"] * decay_factor
@@ -200,13 +281,13 @@ def passive_contacts(
             if fading_confidence > 0.1:  # Only emit if still somewhat confident
                 # Determine contact ID and classification based on registry
                 if contact_registry is not None:
-                    contact_id = contact_registry.get_or_create_designation(other.id, current_time)
+                    contact_id = contact_registry.get_or_create_designation(other_id, current_time)
                     if contact_registry.is_identified(contact_id):
                         classified_as = contact_registry.get_identified_class(contact_id) or "Unknown"
                     else:
                         classified_as = _classify_sonar_signature(other, fading_detect, memory.get("last_snr", 0))
                 else:
-                    contact_id = other.id
+                    contact_id = other_id
                     classified_as = _classify_ship_passive(other, fading_detect, memory.get("last_snr", 0), rng)
 
                 contacts.append(
@@ -221,21 +302,26 @@ def passive_contacts(
                         detectability=fading_detect,
                         snrDb=memory.get("last_snr", 0) * decay_factor,
                         bearingSigmaDeg=memory.get("last_sigma", 5.0),
-                        tonalLines=list(other.acoustics.tonal_lines),
+                        tonalLines=list(other_acoustics.tonal_lines),
                     )
                 )
 
     # Clean up stale memory entries (older than 2x persistence window)
     stale_threshold = current_time - (CONTACT_PERSISTENCE_SECONDS * 2)
-    stale_ids = [tid for tid, mem in _contact_memory[observer_id].items()
+    stale_ids = [tid for tid, mem in memory_by_target.items()
                  if mem.get("last_seen", 0) < stale_threshold]
     for tid in stale_ids:
-        del _contact_memory[observer_id][tid]
+        del memory_by_target[tid]
 
     return contacts
 
 
-def passive_projectiles(self_ship: Ship, torpedoes: List[dict] | None, depth_charges: List[dict] | None) -> List[TelemetryContact]:
+def passive_projectiles(
+    self_ship: Ship,
+    torpedoes: List[dict] | None,
+    depth_charges: List[dict] | None,
+    frame: Optional[PassiveFrame] = None,
+) -> List[TelemetryContact]:
     """Render torpedoes as passive contacts for sonar UI.
 
     - Uses a simplified source level model for moving torpedoes
@@ -251,43 +337,57 @@ def passive_projectiles(self_ship: Ship, torpedoes: List[dict] | None, depth_cha
     # Depth charges are silent while sinking and only create explosion contacts when they detonate
     # Common environment terms
     ambient = 60.0
-    thermo_depth = getattr(self_ship.acoustics, 'thermocline_depth_m', 50.0)
+    # Observer-side terms are the same for every torpedo; read them once.
+    if frame is None:
+        frame = PassiveFrame(self_ship)
+    sx = frame.sx
+    sy = frame.sy
+    fwd_x = frame.fwd_x
+    fwd_y = frame.fwd_y
+    baffle_cos = frame.baffle_cos
+    thermocline_on = frame.thermocline_on
+    thermo_depth = frame.thermo_depth
+    self_below = frame.self_below
+    s_side = self_ship.side
+    # Sonar equation: SNR = SL - TL - NL + AG
+    snr_offset = -ambient + ARRAY_GAIN_DB - frame.penalty
+    # One bearing-noise draw per surviving contact; bind the generator once.
+    hypot = math.hypot
+    atan2 = math.atan2
+    degrees = math.degrees
+    log10 = math.log10
+    gauss = random.gauss
     for t in torps:
         try:
             tx = float(t.get("x", 0.0)); ty = float(t.get("y", 0.0))
             torp_depth = float(t.get("depth", 0.0))
-            dx = tx - self_ship.kin.x; dy = ty - self_ship.kin.y
-            rng = math.hypot(dx, dy)
-            brg = normalize_angle_deg(math.degrees(math.atan2(dx, dy)))
-            rel = angle_diff(brg, self_ship.kin.heading)
-            if abs(rel) > 180 - BAFFLES_DEG / 2:
+            dx = tx - sx; dy = ty - sy
+            rng = hypot(dx, dy)
+            if dx * fwd_x + dy * fwd_y < -rng * baffle_cos:
                 continue
             speed = float(t.get("speed", 35.0))
             # Torpedoes are very loud - much louder than ships at similar speeds
             # Mk48 torpedo has ~150-160 dB source level at 35 knots
             src_lvl = 150.0 + 0.3 * speed  # Very loud propulsors
-            tl_geo = 20.0 * math.log10(max(1.0, rng))
+            tl_geo = 20.0 * log10(max(1.0, rng))
             # Depth-dependent thermocline effect
             layer_atten = 0.0
-            if self_ship.acoustics.thermocline_on:
-                self_below = self_ship.kin.depth > thermo_depth
-                torp_below = torp_depth > thermo_depth
-                if self_below != torp_below:
-                    layer_atten = 8.0
+            if thermocline_on and self_below != (torp_depth > thermo_depth):
+                layer_atten = 8.0
             tl = tl_geo + layer_atten
-            penalty = getattr(self_ship.acoustics, "passive_snr_penalty_db", 0.0)
-            # Sonar equation: SNR = SL - TL - NL + AG
-            snr_db = max(0.0, src_lvl - tl - ambient + ARRAY_GAIN_DB - penalty)
+            snr_db = max(0.0, src_lvl - tl + snr_offset)
             detect = max(0.0, min(1.0, snr_db / 25.0))  # Lower threshold for torpedoes
             if detect < 0.08:  # Lower detection threshold for torpedoes
                 continue
             sigma = max(0.8, 6.0 - 0.05 * speed)
-            noisy_bearing = normalize_angle_deg(brg + random.gauss(0, sigma))
+            # Compass bearing only for torpedoes that are actually heard
+            brg = degrees(atan2(dx, dy))
+            noisy_bearing = normalize_angle_deg(brg + gauss(0, sigma))
             confidence = min(1.0, detect * 1.3)
             tid = t.get("id", f"torpedo_{int(tx)}_{int(ty)}")
             # Classify torpedoes based on side and signal strength
             side = t.get("side", "unknown")
-            if side == self_ship.side:
+            if side == s_side:
                 classified_as = "Own Torpedo" if detect > 0.6 else "Own Torpedo?"
                 # Own fish: emit no tonal card (None => all-pass) so the operator's
                 # narrowband filter can't dim their own weapon off their own scope.
@@ -337,6 +437,24 @@ def explosion_contacts(self_ship: Ship, explosions: List[dict] | None) -> List[T
     # Note: Explosions are so loud (180 dB) that thermocline has minimal effect
     # Without explosion depth info, we skip layer attenuation for explosions
     layer_atten = 0.0
+    # Explosions are very loud - detectable from long range
+    # Assume explosion is at a reasonable range for detection calculation
+    estimated_range = 2000.0  # 2km - explosions are loud enough to be detected from this range
+    src_lvl = 180.0  # Very loud explosion (depth charge ~180 dB)
+    # Nothing below depends on the individual explosion, so the sonar
+    # equation is solved once per call rather than once per explosion.
+    tl_geo = 20.0 * math.log10(max(1.0, estimated_range))
+    tl = tl_geo + layer_atten
+    penalty = getattr(self_ship.acoustics, "passive_snr_penalty_db", 0.0)
+    snr_db = max(0.0, src_lvl - tl - ambient - penalty)
+    detect = max(0.0, min(1.0, snr_db / 20.0))  # Very high detectability
+    if detect < 0.3:  # Even weak explosions should be detectable
+        return contacts
+    # Explosions have very low bearing noise (they're loud and clear)
+    sigma = 1.0
+    confidence = 0.95  # High confidence for explosions
+    current_time = time.time()
+    gauss = random.gauss
 
     for exp in explosions_list:
         try:
@@ -345,32 +463,14 @@ def explosion_contacts(self_ship: Ship, explosions: List[dict] | None) -> List[T
             explosion_time = exp.get("at", "")
             
             # Check if explosion is recent (within last 8 seconds)
-            import time
             try:
                 exp_timestamp = time.mktime(time.strptime(explosion_time, "%Y-%m-%dT%H:%M:%SZ"))
-                current_time = time.time()
                 if current_time - exp_timestamp > 8.0:  # Explosion older than 8 seconds
                     continue
             except:
                 continue  # Skip if timestamp parsing fails
-            
-            # Explosions are very loud - detectable from long range
-            # Assume explosion is at a reasonable range for detection calculation
-            estimated_range = 2000.0  # 2km - explosions are loud enough to be detected from this range
-            src_lvl = 180.0  # Very loud explosion (depth charge ~180 dB)
-            tl_geo = 20.0 * math.log10(max(1.0, estimated_range))
-            tl = tl_geo + layer_atten
-            penalty = getattr(self_ship.acoustics, "passive_snr_penalty_db", 0.0)
-            snr_db = max(0.0, src_lvl - tl - ambient - penalty)
-            detect = max(0.0, min(1.0, snr_db / 20.0))  # Very high detectability
-            
-            if detect < 0.3:  # Even weak explosions should be detectable
-                continue
-                
-            # Explosions have very low bearing noise (they're loud and clear)
-            sigma = 1.0
-            noisy_bearing = normalize_angle_deg(bearing + random.gauss(0, sigma))
-            confidence = 0.95  # High confidence for explosions
+
+            noisy_bearing = normalize_angle_deg(bearing + gauss(0, sigma))
             
             exp_id = f"explosion_{int(exp_timestamp)}"
             contacts.append(TelemetryContact(
@@ -391,7 +491,11 @@ def explosion_contacts(self_ship: Ship, explosions: List[dict] | None) -> List[T
     return contacts
 
 
-def countermeasure_contacts(self_ship: Ship, countermeasures: List[dict] | None) -> List[TelemetryContact]:
+def countermeasure_contacts(
+    self_ship: Ship,
+    countermeasures: List[dict] | None,
+    frame: Optional[PassiveFrame] = None,
+) -> List[TelemetryContact]:
     """Create sonar contacts for deployed countermeasures (noisemakers and decoys).
 
     - Countermeasures are very loud (160-165 dB) to attract torpedo seekers
@@ -406,7 +510,24 @@ def countermeasure_contacts(self_ship: Ship, countermeasures: List[dict] | None)
     contacts: List[TelemetryContact] = []
     cms = countermeasures or []
     ambient = 60.0
-    thermo_depth = getattr(self_ship.acoustics, 'thermocline_depth_m', 50.0)
+    # Observer-side terms are the same for every countermeasure; read them once.
+    if frame is None:
+        frame = PassiveFrame(self_ship)
+    sx = frame.sx
+    sy = frame.sy
+    fwd_x = frame.fwd_x
+    fwd_y = frame.fwd_y
+    baffle_cos = frame.baffle_cos
+    thermocline_on = frame.thermocline_on
+    thermo_depth = frame.thermo_depth
+    self_below = frame.self_below
+    snr_offset = -ambient + ARRAY_GAIN_DB - frame.penalty
+    # Bind the math callables locally for the per-emitter loop
+    hypot = math.hypot
+    atan2 = math.atan2
+    degrees = math.degrees
+    log10 = math.log10
+    gauss = random.gauss
 
     for cm in cms:
         if not cm.get("active", False):
@@ -415,32 +536,27 @@ def countermeasure_contacts(self_ship: Ship, countermeasures: List[dict] | None)
             cx = float(cm.get("x", 0.0))
             cy = float(cm.get("y", 0.0))
             cm_depth = float(cm.get("depth", 0.0))
-            dx = cx - self_ship.kin.x
-            dy = cy - self_ship.kin.y
-            rng = math.hypot(dx, dy)
-            brg = normalize_angle_deg(math.degrees(math.atan2(dx, dy)))
-            rel = angle_diff(brg, self_ship.kin.heading)
+            dx = cx - sx
+            dy = cy - sy
+            rng = hypot(dx, dy)
             # Check baffles
-            if abs(rel) > 180 - BAFFLES_DEG / 2:
+            if dx * fwd_x + dy * fwd_y < -rng * baffle_cos:
                 continue
             # Source level from countermeasure
             src_lvl = float(cm.get("source_level_db", 160.0))
-            tl_geo = 20.0 * math.log10(max(1.0, rng))
+            tl_geo = 20.0 * log10(max(1.0, rng))
             # Thermocline effect
             layer_atten = 0.0
-            if self_ship.acoustics.thermocline_on:
-                self_below = self_ship.kin.depth > thermo_depth
-                cm_below = cm_depth > thermo_depth
-                if self_below != cm_below:
-                    layer_atten = 8.0
+            if thermocline_on and self_below != (cm_depth > thermo_depth):
+                layer_atten = 8.0
             tl = tl_geo + layer_atten
-            penalty = getattr(self_ship.acoustics, "passive_snr_penalty_db", 0.0)
-            snr_db = max(0.0, src_lvl - tl - ambient + ARRAY_GAIN_DB - penalty)
+            snr_db = max(0.0, src_lvl - tl + snr_offset)
             detect = max(0.0, min(1.0, snr_db / 25.0))
             if detect < 0.1:
                 continue
             sigma = 2.0  # Noisemakers are loud but diffuse
-            noisy_bearing = normalize_angle_deg(brg + random.gauss(0, sigma))
+            brg = degrees(atan2(dx, dy))
+            noisy_bearing = normalize_angle_deg(brg + gauss(0, sigma))
             confidence = min(1.0, detect * 1.2)
             cm_id = cm.get("id", f"cm_{int(cx)}_{int(cy)}")
             cm_type = cm.get("type", "noisemaker")
@@ -518,25 +634,41 @@ def active_ping(self_ship: Ship, others: List[Ship]) -> List[Tuple[str, float, f
     if getattr(self_ship, "systems", None) is not None and not self_ship.systems.sonar_ok:
         return []
     out: List[Tuple[str, float, float, float]] = []
+    # Noise parameters depend only on the pinging ship; read them once.
+    sx = self_ship.kin.x
+    sy = self_ship.kin.y
+    range_noise_add = getattr(self_ship.acoustics, "active_range_noise_add_m", 0.0)
+    bearing_sigma = 1.5 + max(0.0, getattr(self_ship.acoustics, "active_bearing_noise_extra", 0.0))
+    self_id = self_ship.id
+    gauss = random.gauss
+    hypot = math.hypot
+    atan2 = math.atan2
+    degrees = math.degrees
     for other in others:
-        if other.id == self_ship.id:
+        other_id = other.id
+        if other_id == self_id:
             continue
-        dx = other.kin.x - self_ship.kin.x
-        dy = other.kin.y - self_ship.kin.y
-        rng = math.hypot(dx, dy)
+        kin = other.kin
+        dx = kin.x - sx
+        dy = kin.y - sy
+        rng = hypot(dx, dy)
         # Compass bearing: 0=N, 90=E, 180=S, 270=W
-        brg = normalize_angle_deg(math.degrees(math.atan2(dx, dy)))
-        base_rng_noise = max(1.0, rng + random.gauss(0, rng * 0.02 + 5.0))
-        rng_noise = base_rng_noise + getattr(self_ship.acoustics, "active_range_noise_add_m", 0.0)
-        brg_noise = normalize_angle_deg(
-            brg + random.gauss(0, 1.5 + max(0.0, getattr(self_ship.acoustics, "active_bearing_noise_extra", 0.0)))
-        )
-        # Simple active strength model: stronger when closer; clamp 0..1
-        strength = max(0.0, min(1.0, 1.0 / (1.0 + (rng_noise / 2000.0))))
-        out.append((other.id, rng_noise, brg_noise, strength))
+        brg = degrees(atan2(dx, dy)) % 360.0
+        base_rng_noise = max(1.0, rng + gauss(0, rng * 0.02 + 5.0))
+        rng_noise = base_rng_noise + range_noise_add
+        brg_noise = (brg + gauss(0, bearing_sigma)) % 360.0
+        # Simple active strength model: stronger when closer. rng_noise is at
+        # least 1 m (range noise is floored, the degradation add is >= 0), so
+        # 1 / (1 + r/2000) already lies in (0, 1) and needs no clamp.
+        strength = 2000.0 / (2000.0 + rng_noise)
+        out.append((other_id, rng_noise, brg_noise, strength))
     return out
 
 
+# Doppler speed descriptors, fastest first: (speed above, kn; label).
+_SIGNATURE_SPEED_BANDS = ((15.0, "Fast"), (8.0, "Medium"), (2.0, "Slow"))
+
+
 def _classify_sonar_signature(ship: Ship, detectability: float, snr_db: float) -> str:
     """
     Classify contact based on acoustic signature ONLY - does not reveal actual ship type.
@@ -554,35 +686,37 @@ def _classify_sonar_signature(ship: Ship, detectability: float, snr_db: float) -
         Generic classification string like "Surface Contact", "Submerged Contact"
     """
     # Determine if contact is on surface or submerged (sonar can tell this)
-    is_surface = ship.kin.depth <= 5.0
-
-    # Speed-based hints (from doppler analysis)
-    speed = abs(ship.kin.speed)
-    if speed > 15:
-        speed_desc = "Fast"
-    elif speed > 8:
-        speed_desc = "Medium"
-    elif speed > 2:
-        speed_desc = "Slow"
-    else:
-        speed_desc = "Stationary"
+    kind = "Surface Contact" if ship.kin.depth <= 5.0 else "Submerged Contact"
 
     # Build classification based on signal quality
     if detectability >= 0.7 and snr_db >= 22:
-        # Good signal: can determine surface/submerged and speed
-        if is_surface:
-            return f"{speed_desc} Surface Contact"
+        # Good signal: can determine surface/submerged and speed (from doppler)
+        speed = abs(ship.kin.speed)
+        for min_speed, speed_desc in _SIGNATURE_SPEED_BANDS:
+            if speed > min_speed:
+                break
         else:
-            return f"{speed_desc} Submerged Contact"
-    elif detectability >= 0.4 and snr_db >= 15:
+            speed_desc = "Stationary"
+        return f"{speed_desc} {kind}"
+    if detectability >= 0.4 and snr_db >= 15:
         # Medium signal: can determine surface/submerged
-        if is_surface:
-            return "Surface Contact"
-        else:
-            return "Submerged Contact"
-    else:
-        # Weak signal: uncertain
-        return "Unknown Contact"
+        return kind
+    # Weak signal: uncertain
+    return "Unknown Contact"
+
+
+# (min detectability, min SNR dB) for confident, probable and possible
+# classification, strongest first.
+_PASSIVE_CLASS_TIERS = ((0.8, 25.0), (0.6, 20.0), (0.4, 15.0))
+# Labels per tier for every Ship.ship_class. Classes with no distinct
+# acoustic description report their own name, then "<name>?", then
+# "Contact?"; an unlisted class falls back to the same pattern.
+_PASSIVE_CLASS_LABELS = {
+    "SSN": ("SSN", "SSN?", "Submarine?"),
+    "Convoy": ("Merchant/Convoy", "Merchant?", "Vessel?"),
+    "Destroyer": ("Warship", "Warship?", "Contact?"),
+    "Neutral": ("Neutral", "Neutral?", "Contact?"),
+}
 
 
 def _classify_ship_passive(ship: Ship, detectability: float, snr_db: float, range_m: float) -> str:
@@ -599,45 +733,22 @@ def _classify_ship_passive(ship: Ship, detectability: float, snr_db: float, rang
         Classification string with actual ship type
     """
     # Base classification from ship class
-    base_class = getattr(ship, "ship_class", None)
-
-    # Signal quality affects classification confidence
-    if detectability >= 0.8 and snr_db >= 25:
-        # Strong signal: confident classification
-        if base_class == "SSN":
-            return "SSN"  # Clear submarine signature
-        elif base_class == "Convoy":
-            return "Merchant/Convoy"  # Commercial vessel signature
-        elif base_class == "Destroyer":
-            return "Warship"  # Military vessel signature
-        elif base_class is None:
-            return "Unknown"  # No class information
-        else:
-            return base_class
-    elif detectability >= 0.6 and snr_db >= 20:
-        # Medium signal: probable classification
-        if base_class == "SSN":
-            return "SSN?"  # Probable submarine
-        elif base_class == "Convoy":
-            return "Merchant?"  # Probable commercial vessel
-        elif base_class == "Destroyer":
-            return "Warship?"  # Probable military vessel
-        elif base_class is None:
-            return "Unknown"  # No class information
-        else:
-            return f"{base_class}?"
-    elif detectability >= 0.4 and snr_db >= 15:
-        # Weak signal: possible classification
-        if base_class == "SSN":
-            return "Submarine?"  # Possible submarine
-        elif base_class == "Convoy":
-            return "Vessel?"  # Possible vessel
-        elif base_class == "Destroyer":
-            return "Contact?"  # Possible contact
-        elif base_class is None:
-            return "Unknown"  # No class information
-        else:
-            return "Contact?"
+    base_class = ship.ship_class
+
+    # Signal quality affects classification confidence: strong, medium, weak
+    for tier, (min_detect, min_snr) in enumerate(_PASSIVE_CLASS_TIERS):
+        if detectability >= min_detect and snr_db >= min_snr:
+            break
     else:
         # Very weak signal: uncertain
         return "Unknown"
+    if base_class is None:
+        return "Unknown"  # No class information
+    labels = _PASSIVE_CLASS_LABELS.get(base_class)
+    if labels is not None:
+        return labels[tier]
+    if tier == 0:
+        return base_class
+    if tier == 1:
+        return f"{base_class}?"
+    return "Contact?"
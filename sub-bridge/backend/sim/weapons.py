@@ -1,8 +1,9 @@
 from __future__ import annotations
+import itertools
 import math
+from functools import lru_cache
 import random
-from typing import Optional, Callable
-import os
+from typing import Optional, Callable, List, Dict, Tuple
 from ..models import Ship, Tube, TorpedoDef
 from .damage import apply_compartment_damage, compute_hull_damage, get_compartment_for_hit_position
 
@@ -32,6 +33,8 @@ def _jitter(value: float, frac: float = TORPEDO_DAMAGE_JITTER) -> float:
 # is capped by a pitch limit, so a torpedo can only dive/climb as fast as its
 # forward speed allows (depth_rate <= speed * sin(max_pitch)).
 TORPEDO_MAX_PITCH_DEG = 25.0   # max up/down pitch angle -> caps depth rate
+# sin of the pitch limit: depth rate per unit forward speed
+_TORPEDO_MAX_PITCH_SIN = math.sin(math.radians(TORPEDO_MAX_PITCH_DEG))
 TORPEDO_MAX_DEPTH_M = 800.0    # operating floor for a running torpedo
 KNOTS_TO_MPS = 0.514444
 # Vertical acquisition is deliberately more forgiving than the horizontal cone:
@@ -39,10 +42,43 @@ KNOTS_TO_MPS = 0.514444
 # depth band and lets terminal homing close the gap. Detonation stays tight (3D
 # 30 m), so depth separation still protects a target at the terminal moment.
 TORPEDO_SEEKER_VERTICAL_DEG = 70.0  # full vertical acquisition angle (±35°)
-
-
-def _clamp(v: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, v))
+# tan² of the vertical half-angle: a candidate is inside the vertical window
+# when dz² <= horiz² * this, which avoids an atan2 per candidate.
+_SEEKER_VERTICAL_TAN_SQ = math.tan(math.radians(TORPEDO_SEEKER_VERTICAL_DEG / 2)) ** 2
+# 3D proximity fuze radii, compared as squared ranges in step_torpedo.
+TORPEDO_FUZE_RANGE_M = 30.0         # against ships
+TORPEDO_CM_FUZE_RANGE_M = 20.0      # tighter for small countermeasures
+# Heading jitter (±deg/s) on a spoofed torpedo's commanded turn rate.
+TORPEDO_SPOOF_JITTER_DEG = 30.0
+# Ownship safety envelope for the player's own torpedoes.
+OWN_TORP_PREARM_AVOID_RANGE_M = 300.0
+OWN_TORP_SELF_DESTRUCT_RANGE_M = 200.0
+# Seeker spatial grid: ships are bucketed into square cells at least as wide
+# as the seeker range, so a query only needs the 3x3 cells around the fish.
+# Small rosters skip the grid; a straight scan is cheaper there.
+SEEKER_GRID_CELL_M = 4000.0
+SEEKER_GRID_MIN_SHIPS = 8
+
+
+# Launch state shared by every new torpedo dict; launchers merge their
+# per-shot fields over a copy of this instead of spelling out each default.
+_TORPEDO_TEMPLATE = {
+    "armed": False,
+    "run_time": 0.0,
+    "target_id": None,
+    "spoofed_timer": 0.0,
+    # PN guidance state
+    "pn_nav_const": 3.0,
+    "los_prev": None,
+}
+
+# Process-wide serial for torpedo and countermeasure ids. Unlike a millisecond
+# timestamp it cannot collide on salvos fired within the same tick.
+_entity_serial = itertools.count(1)
+
+
+def next_entity_serial() -> int:
+    return next(_entity_serial)
 
 
 # Depth charges are cumulative — a single near-miss is painful but rarely
@@ -53,29 +89,57 @@ DEPTH_CHARGE_DIRECT_ADJACENT_INTEGRITY_LOSS = 0.15
 DEPTH_CHARGE_DIRECT_ADJACENT_BREACH_RATE = 0.08
 DEPTH_CHARGE_FAR_PRIMARY_INTEGRITY_LOSS = 0.18
 DEPTH_CHARGE_FAR_PRIMARY_BREACH_RATE = 0.10
+# 3D damage radii, compared as squared ranges in step_depth_charge.
+DEPTH_CHARGE_DIRECT_RANGE_M = 60.0
+DEPTH_CHARGE_NEAR_RANGE_M = 120.0
 
 
 def step_tubes(ship: Ship, dt: float) -> None:
     ws = ship.weapons
+    # Each timer is read once and written once; `timer <= dt` is exactly the
+    # case where max(0, timer - dt) would clamp to zero.
     # Depth charge cooldown timer
-    if getattr(ws, "depth_charge_cooldown_timer_s", 0.0) > 0.0:
-        ws.depth_charge_cooldown_timer_s = max(0.0, ws.depth_charge_cooldown_timer_s - dt)
+    cooldown = ws.depth_charge_cooldown_timer_s
+    if cooldown > 0.0:
+        ws.depth_charge_cooldown_timer_s = cooldown - dt if cooldown > dt else 0.0
     # Quick torpedo cooldown timer (AI-only)
-    if getattr(ws, "torpedo_quick_cooldown_timer_s", 0.0) > 0.0:
-        ws.torpedo_quick_cooldown_timer_s = max(0.0, ws.torpedo_quick_cooldown_timer_s - dt)
+    cooldown = ws.torpedo_quick_cooldown_timer_s
+    if cooldown > 0.0:
+        ws.torpedo_quick_cooldown_timer_s = cooldown - dt if cooldown > dt else 0.0
     for t in ws.tubes:
-        if t.timer_s > 0.0:
-            t.timer_s = max(0.0, t.timer_s - dt)
-            if t.timer_s == 0.0 and t.next_state is not None:
-                t.state = t.next_state
-                t.next_state = None
+        timer = t.timer_s
+        if timer <= 0.0:
+            continue
+        if timer > dt:
+            t.timer_s = timer - dt
+            continue
+        t.timer_s = 0.0
+        if t.next_state is not None:
+            t.state = t.next_state
+            t.next_state = None
+
+
+def step_tubes_to_state(ship: Ship, tube_idx: int, target_state: str, max_s: float) -> float:
+    """Advance `ship`'s tube timers until tube `tube_idx` reaches `target_state`.
+
+    Tube timers count down linearly, so this is a single `step_tubes` call of
+    the tube's remaining time, capped at `max_s`. Returns the seconds advanced
+    (0.0 when the tube is not heading for `target_state`).
+    """
+    tube = _get_tube(ship, tube_idx)
+    if tube is None or tube.next_state != target_state:
+        return 0.0
+    dt = min(tube.timer_s, max_s)
+    if dt > 0.0:
+        step_tubes(ship, dt)
+    return dt
 
 
 esspoof_prob = 0.2  # chance to be spoofed when a countermeasure effect occurs
 
 
 def try_load_tube(ship: Ship, tube_idx: int, weapon_name: str = "Mk48") -> bool:
-    if getattr(ship, "systems", None) is not None and not ship.systems.tubes_ok:
+    if not ship.systems.tubes_ok:
         return False
     ws = ship.weapons
     tube = _get_tube(ship, tube_idx)
@@ -91,7 +155,7 @@ def try_load_tube(ship: Ship, tube_idx: int, weapon_name: str = "Mk48") -> bool:
 
 
 def try_flood_tube(ship: Ship, tube_idx: int) -> bool:
-    if getattr(ship, "systems", None) is not None and not ship.systems.tubes_ok:
+    if not ship.systems.tubes_ok:
         return False
     ws = ship.weapons
     tube = _get_tube(ship, tube_idx)
@@ -105,7 +169,7 @@ def try_flood_tube(ship: Ship, tube_idx: int) -> bool:
 
 
 def try_set_doors(ship: Ship, tube_idx: int, open_state: bool) -> bool:
-    if getattr(ship, "systems", None) is not None and not ship.systems.tubes_ok:
+    if not ship.systems.tubes_ok:
         return False
     ws = ship.weapons
     tube = _get_tube(ship, tube_idx)
@@ -128,30 +192,23 @@ def try_fire(ship: Ship, tube_idx: int, bearing_deg: float, run_depth: float, en
     tube = _get_tube(ship, tube_idx)
     if tube is None or tube.state != "DoorsOpen" or tube.weapon is None:
         return None
-    import time
     torp = {
-        "id": f"torpedo_{ship.id}_{tube_idx}_{int(time.time() * 1000)}",  # Unique ID for sonar tracking
+        **_TORPEDO_TEMPLATE,
+        "id": f"torpedo_{ship.id}_{tube_idx}_{next_entity_serial()}",  # Unique ID for sonar tracking
         "shooter_id": ship.id,
         "x": ship.kin.x,
         "y": ship.kin.y,
         "depth": ship.kin.depth,
         "heading": bearing_deg % 360.0,
         "speed": tube.weapon.speed,
-        "armed": False,
         "enable_range_m": (enable_range_m if enable_range_m is not None else tube.weapon.enable_range_m),
-        "seeker_range_m": getattr(tube.weapon, "seeker_range_m", 4000.0),
-        "run_time": 0.0,
+        "seeker_range_m": tube.weapon.seeker_range_m,
         "max_run_time": tube.weapon.max_run_time_s,
-        "target_id": None,
         "name": tube.weapon.name,
         "seeker_cone": tube.weapon.seeker_cone_deg,
         "side": ship.side,
-        "spoofed_timer": 0.0,
         "run_depth": run_depth,
         "doctrine": doctrine,
-        # PN guidance state
-        "pn_nav_const": 3.0,
-        "los_prev": None,
     }
     tube.weapon = None
     tube.state = "Empty"
@@ -160,8 +217,90 @@ def try_fire(ship: Ship, tube_idx: int, bearing_deg: float, run_depth: float, en
     return torp
 
 
-def step_torpedo(t: dict, world, dt: float, on_event: Optional[Callable[[str, dict], None]] = None, countermeasures: list = None) -> None:
+# Random seeker spoofing (per-tick roll while tracking). Test harnesses turn
+# it off through set_spoof_enabled for deterministic torpedo runs.
+_spoof_enabled = True
+
+
+def set_spoof_enabled(enabled: bool) -> None:
+    """Enable or disable random seeker spoofing for all torpedoes."""
+    global _spoof_enabled
+    _spoof_enabled = bool(enabled)
+
+
+@lru_cache(maxsize=256)
+def _heading_sin_cos(heading: float) -> Tuple[float, float]:
+    """(sin, cos) of a compass heading in degrees. Memoized by value rather
+    than stored on the torpedo dict (which is sent out as telemetry); a fish
+    running straight asks for exactly the same heading tick after tick."""
+    heading_rad = math.radians(heading)
+    return math.sin(heading_rad), math.cos(heading_rad)
+
+
+@lru_cache(maxsize=32)
+def _half_cone_cos(cone: float) -> float:
+    """cos(cone / 2) for a seeker cone in degrees; torpedoes share a handful
+    of cone widths."""
+    return math.cos(math.radians(cone / 2))
+
+
+def seeker_env_mult(world) -> float:
+    """Seeker range multiplier from the environment (thermocline cuts it to 60%)."""
+    own = world.ships.get("ownship")
+    return 0.6 if own is not None and own.acoustics.thermocline_on else 1.0
+
+
+# One seeker-frame row per ship: (ship, side, x, y, depth, source level dB).
+SeekerEntry = Tuple[Ship, Optional[str], float, float, float, float]
+
+
+def build_seeker_frame(ships: List[Ship]) -> List[SeekerEntry]:
+    """Snapshot the per-ship values every seeker query reads.
+
+    Ships do not move while torpedoes are stepped, so the tick builds this once
+    and every torpedo scans plain tuples instead of re-reading `ship.kin` and
+    re-deriving the source level for each candidate.
+    """
+    frame: List[SeekerEntry] = []
+    for ship in ships:
+        kin = ship.kin
+        # Ship source level approximated by speed (louder = more attractive)
+        sl = 120.0 + kin.speed * 1.5  # ~120-165 dB depending on speed
+        frame.append((ship, ship.side, kin.x, kin.y, kin.depth, sl))
+    return frame
+
+
+def build_ship_grid(frame: List[SeekerEntry], cell_m: float = SEEKER_GRID_CELL_M) -> Optional[Dict[Tuple[int, int], List[SeekerEntry]]]:
+    """Bucket seeker-frame rows by grid cell for seeker queries, or None when
+    the roster is too small for the grid to pay off."""
+    if len(frame) < SEEKER_GRID_MIN_SHIPS:
+        return None
+    grid: Dict[Tuple[int, int], List[SeekerEntry]] = {}
+    for entry in frame:
+        grid.setdefault((int(entry[2] // cell_m), int(entry[3] // cell_m)), []).append(entry)
+    return grid
+
+
+def step_torpedo(t: dict, world, dt: float, on_event: Optional[Callable[[str, dict], None]] = None, countermeasures: list = None, env_mult: Optional[float] = None, ships: Optional[List[Ship]] = None, seeker_frame: Optional[List[SeekerEntry]] = None, ship_grid: Optional[Dict[Tuple[int, int], List[SeekerEntry]]] = None) -> None:
+    # Spent (run out or detonated) torpedoes are inert until pruned
+    if t["run_time"] > t["max_run_time"]:
+        return
     own = world.ships.get("ownship")
+    # `ships` is the tick's roster snapshot shared by every torpedo; callers
+    # stepping a single torpedo may omit it.
+    if ships is None:
+        ships = world.all_ships()
+    # Position and side do not change until the move step below; read them
+    # once instead of re-hashing the dict keys for every ship/decoy check.
+    # Arming, spoof timer and heading are likewise held in locals and only
+    # written back to the dict when they change.
+    tx = t["x"]
+    ty = t["y"]
+    tdepth = t.get("depth", 0.0)
+    tside = t.get("side")
+    heading = t["heading"]
+    armed = t["armed"]
+    spoofed = t.get("spoofed_timer", 0.0)
 
     # Arming: a torpedo arms after it has traveled `enable_range_m` from
     # its own shooter (not from the player sub). For legacy/test torps
@@ -169,245 +308,318 @@ def step_torpedo(t: dict, world, dt: float, on_event: Optional[Callable[[str, di
     shooter_id = t.get("shooter_id")
     shooter = world.ships.get(shooter_id) if shooter_id else own
     if shooter is not None:
-        dx_s = t["x"] - shooter.kin.x
-        dy_s = t["y"] - shooter.kin.y
-        dz_s = t.get("depth", 0.0) - shooter.kin.depth
+        dx_s = tx - shooter.kin.x
+        dy_s = ty - shooter.kin.y
+        dz_s = tdepth - shooter.kin.depth
         dist_from_shooter = math.sqrt(dx_s * dx_s + dy_s * dy_s + dz_s * dz_s)
     else:
         dist_from_shooter = float("inf")
-    if not t["armed"] and dist_from_shooter >= t["enable_range_m"]:
-        t["armed"] = True
+    if not armed and dist_from_shooter >= t["enable_range_m"]:
+        t["armed"] = armed = True
         if on_event:
             on_event("torpedo.armed", {"name": t["name"]})
 
     # Spoof timer decay
-    if t.get("spoofed_timer", 0.0) > 0.0:
-        t["spoofed_timer"] = max(0.0, t["spoofed_timer"] - dt)
+    if spoofed > 0.0:
+        t["spoofed_timer"] = spoofed = max(0.0, spoofed - dt)
 
     # Self-preservation: ONLY for torpedoes the player fired. Don't let a
     # circling friendly torp track back and kill ownship. Hostile torpedoes
     # closing on ownship must be allowed to detonate normally — that's the
     # whole point of incoming weapons.
     is_own_torp = (shooter_id == "ownship") or (
-        shooter_id is None and t.get("side") == "BLUE"
+        shooter_id is None and tside == "BLUE"
     )
     if is_own_torp and own is not None:
-        own_rng = math.sqrt(
-            (own.kin.x - t["x"]) ** 2
-            + (own.kin.y - t["y"]) ** 2
-            + (own.kin.depth - t.get("depth", 0.0)) ** 2
-        )
-        if not t["armed"]:
+        own_dx = own.kin.x - tx
+        own_dy = own.kin.y - ty
+        own_dz = own.kin.depth - tdepth
+        own_rng_sq = own_dx * own_dx + own_dy * own_dy + own_dz * own_dz
+        if not armed:
             # If ownship is within 300 m and ahead within 60°, bias heading away pre-arm
-            if own_rng < 300.0:
-                bearing_to_own = (math.degrees(math.atan2(own.kin.x - t["x"], own.kin.y - t["y"])) % 360.0)
-                off = abs(((bearing_to_own - t["heading"] + 540) % 360) - 180)
+            if own_rng_sq < OWN_TORP_PREARM_AVOID_RANGE_M * OWN_TORP_PREARM_AVOID_RANGE_M:
+                bearing_to_own = (math.degrees(math.atan2(own_dx, own_dy)) % 360.0)
+                off = abs(math.remainder(bearing_to_own - heading, 360.0))
                 if off < 60.0:
                     # Turn away by up to 30°/s pre-arm
                     away = (bearing_to_own + 180.0) % 360.0
-                    dh = ((away - t["heading"] + 540) % 360) - 180
+                    # Explicit wrap (not math.remainder): pointed straight
+                    # at ownship the difference is exactly 180°, and this
+                    # form always resolves that tie to -180 (break to port).
+                    dh = ((away - heading + 180.0) % 360.0) - 180.0
                     max_turn = 30.0 * dt
-                    t["heading"] = (t["heading"] + max(-max_turn, min(max_turn, dh))) % 360
+                    t["heading"] = heading = (heading + max(-max_turn, min(max_turn, dh))) % 360
         else:
             # Post-arm: self-destruct if dangerously close to ownship (safety), but allow initial departure
-            if own_rng < 200.0 and t.get("run_time", 0.0) > 3.0:
+            if (own_rng_sq < OWN_TORP_SELF_DESTRUCT_RANGE_M * OWN_TORP_SELF_DESTRUCT_RANGE_M
+                    and t.get("run_time", 0.0) > 3.0):
                 if on_event:
-                    on_event("torpedo.self_destruct", {"reason": "ownship_proximity", "range_m": own_rng})
+                    on_event("torpedo.self_destruct", {"reason": "ownship_proximity", "range_m": math.sqrt(own_rng_sq)})
                 t["run_time"] = t["max_run_time"] + 1.0
                 return
 
-    # Detonation check against opposing ships
-    for ship in world.all_ships():
-        if ship.side == t.get("side"):
-            continue
-        rng = math.sqrt(
-            (ship.kin.x - t["x"]) ** 2
-            + (ship.kin.y - t["y"]) ** 2
-            + (ship.kin.depth - t.get("depth", 0.0)) ** 2
-        )
-        if t["armed"] and rng < 30.0:  # 3D proximity fuze
-            # Determine hit location based on torpedo approach angle
-            approach_angle = t.get("heading", 0.0)
-            ship_heading = ship.kin.heading
-            relative_angle = ((approach_angle - ship_heading + 540) % 360) - 180
-
-            # Determine hit position (bow, midship, stern)
-            if abs(relative_angle) < 60:
-                hit_position = "bow"
-            elif abs(relative_angle) > 120:
-                hit_position = "stern"
-            else:
-                hit_position = "midship"
-
-            # Apply compartment damage. Torpedo hits are catastrophic:
-            # the primary compartment is essentially destroyed in one strike,
-            # adjacents take heavy collateral, and the breach rates create
-            # rapid uncontrolled flooding.
-            primary_comp = get_compartment_for_hit_position(hit_position)
-            apply_compartment_damage(
-                ship, primary_comp,
-                breach_rate_add=_jitter(TORPEDO_PRIMARY_BREACH_RATE),
-                integrity_loss=_jitter(TORPEDO_PRIMARY_INTEGRITY_LOSS),
-            )
-            if primary_comp > 0:
-                apply_compartment_damage(
-                    ship, primary_comp - 1,
-                    breach_rate_add=_jitter(TORPEDO_ADJACENT_BREACH_RATE),
-                    integrity_loss=_jitter(TORPEDO_ADJACENT_INTEGRITY_LOSS),
-                )
-            if primary_comp < 5:
+    # Detonation checks (3D proximity fuzes). Only an armed torpedo can
+    # detonate, and ranges are compared squared; the sqrt is taken only for
+    # the event report on a hit.
+    if armed:
+        fuze_sq = TORPEDO_FUZE_RANGE_M * TORPEDO_FUZE_RANGE_M
+        cm_fuze_sq = TORPEDO_CM_FUZE_RANGE_M * TORPEDO_CM_FUZE_RANGE_M
+        # Opposing ships
+        for ship in ships:
+            if ship.side == tside:
+                continue
+            kin = ship.kin
+            dx = kin.x - tx
+            dy = kin.y - ty
+            dz = kin.depth - tdepth
+            rng_sq = dx * dx + dy * dy + dz * dz
+            if rng_sq < fuze_sq:  # 3D proximity fuze
+                rng = math.sqrt(rng_sq)
+                # Determine hit location based on torpedo approach angle
+                approach_angle = heading
+                ship_heading = ship.kin.heading
+                relative_angle = math.remainder(approach_angle - ship_heading, 360.0)
+
+                # Determine hit position (bow, midship, stern)
+                if abs(relative_angle) < 60:
+                    hit_position = "bow"
+                elif abs(relative_angle) > 120:
+                    hit_position = "stern"
+                else:
+                    hit_position = "midship"
+
+                # Apply compartment damage. Torpedo hits are catastrophic:
+                # the primary compartment is essentially destroyed in one strike,
+                # adjacents take heavy collateral, and the breach rates create
+                # rapid uncontrolled flooding.
+                primary_comp = get_compartment_for_hit_position(hit_position)
                 apply_compartment_damage(
-                    ship, primary_comp + 1,
-                    breach_rate_add=_jitter(TORPEDO_ADJACENT_BREACH_RATE),
-                    integrity_loss=_jitter(TORPEDO_ADJACENT_INTEGRITY_LOSS),
+                    ship, primary_comp,
+                    breach_rate_add=_jitter(TORPEDO_PRIMARY_BREACH_RATE),
+                    integrity_loss=_jitter(TORPEDO_PRIMARY_INTEGRITY_LOSS),
                 )
+                if primary_comp > 0:
+                    apply_compartment_damage(
+                        ship, primary_comp - 1,
+                        breach_rate_add=_jitter(TORPEDO_ADJACENT_BREACH_RATE),
+                        integrity_loss=_jitter(TORPEDO_ADJACENT_INTEGRITY_LOSS),
+                    )
+                if primary_comp < 5:
+                    apply_compartment_damage(
+                        ship, primary_comp + 1,
+                        breach_rate_add=_jitter(TORPEDO_ADJACENT_BREACH_RATE),
+                        integrity_loss=_jitter(TORPEDO_ADJACENT_INTEGRITY_LOSS),
+                    )
 
-            ship.damage.hull = compute_hull_damage(ship.damage.compartments)
-
-            if on_event:
-                on_event("torpedo.detonated", {
-                    "target": ship.id,
-                    "range_m": rng,
-                    "x": t["x"],
-                    "y": t["y"],
-                    "target_destroyed": ship.damage.hull >= 1.0,
-                    "hit_position": hit_position,
-                    "primary_compartment": primary_comp
-                })
-            t["run_time"] = t["max_run_time"] + 1.0
-            return
+                ship.damage.hull = compute_hull_damage(ship.damage.compartments)
 
-    # Detonation check against countermeasures (torpedo wastes itself on decoy)
-    if countermeasures:
-        for cm in countermeasures:
-            if not cm.get("active", False):
-                continue
-            if cm.get("side") == t.get("side"):
-                continue
-            rng = math.sqrt(
-                (cm["x"] - t["x"]) ** 2
-                + (cm["y"] - t["y"]) ** 2
-                + (cm.get("depth", 0.0) - t.get("depth", 0.0)) ** 2
-            )
-            if t["armed"] and rng < 20.0:  # tighter 3D proximity for small CM
-                cm["active"] = False  # Destroy the countermeasure
                 if on_event:
-                    on_event("torpedo.detonated_on_countermeasure", {
-                        "torpedo_id": t.get("id"),
-                        "cm_id": cm["id"],
-                        "cm_type": cm["type"],
-                        "range_m": rng
+                    on_event("torpedo.detonated", {
+                        "target": ship.id,
+                        "range_m": rng,
+                        "x": tx,
+                        "y": ty,
+                        "target_destroyed": ship.damage.hull >= 1.0,
+                        "hit_position": hit_position,
+                        "primary_compartment": primary_comp
                     })
                 t["run_time"] = t["max_run_time"] + 1.0
                 return
 
-    # Guidance - consider countermeasures as potential targets
-    target = _nearest_target(t, world, countermeasures or [])
-    if target is not None and t["armed"]:
+        # Detonation check against countermeasures (torpedo wastes itself on decoy)
+        if countermeasures:
+            for cm in countermeasures:
+                if not cm.get("active", False):
+                    continue
+                if cm.get("side") == tside:
+                    continue
+                dx = cm["x"] - tx
+                dy = cm["y"] - ty
+                dz = cm.get("depth", 0.0) - tdepth
+                rng_sq = dx * dx + dy * dy + dz * dz
+                if rng_sq < cm_fuze_sq:  # tighter 3D proximity for small CM
+                    rng = math.sqrt(rng_sq)
+                    cm["active"] = False  # Destroy the countermeasure
+                    if on_event:
+                        on_event("torpedo.detonated_on_countermeasure", {
+                            "torpedo_id": t.get("id"),
+                            "cm_id": cm["id"],
+                            "cm_type": cm["type"],
+                            "range_m": rng
+                        })
+                    t["run_time"] = t["max_run_time"] + 1.0
+                    return
+
+    # Guidance - consider countermeasures as potential targets. Only an armed
+    # fish homes (laterally or in depth), so the seeker is not scanned before.
+    target = _nearest_target(t, world, countermeasures or [], env_mult, ships, seeker_frame, ship_grid) if armed else None
+    if target is not None:
         # Chance to be spoofed - much higher when tracking a countermeasure
-        _spoof_allowed = not bool(os.getenv("PYTEST_CURRENT_TEST"))
         is_tracking_cm = getattr(target, "is_countermeasure", False)
         # Countermeasure: 15% per tick (very effective), Ship: 2% per tick
-        _spoof_prob = (0.15 if is_tracking_cm else 0.02) if _spoof_allowed else 0.0
-        if t.get("spoofed_timer", 0.0) == 0.0 and random.random() < _spoof_prob:
-            t["spoofed_timer"] = 3.0
+        _spoof_prob = (0.15 if is_tracking_cm else 0.02) if _spoof_enabled else 0.0
+        if spoofed == 0.0 and random.random() < _spoof_prob:
+            t["spoofed_timer"] = spoofed = 3.0
             if on_event:
-                on_event("torpedo.spoofed", {"seconds": t["spoofed_timer"], "by_countermeasure": is_tracking_cm})
+                on_event("torpedo.spoofed", {"seconds": spoofed, "by_countermeasure": is_tracking_cm})
         # Compute LOS angle and rate for proportional navigation (PN)
-        dx = target.kin.x - t["x"]
-        dy = target.kin.y - t["y"]
-        los = (math.degrees(math.atan2(dx, dy)) % 360.0)
-        # If no previous LOS, fall back to proportional-to-error for the first frame
-        if t.get("los_prev") is None:
-            dh = ((los - t["heading"] + 540) % 360) - 180
-            if t.get("spoofed_timer", 0.0) > 0.0:
-                dh += random.uniform(-30.0, 30.0)
-                max_turn_rate = 10.0
-            else:
-                max_turn_rate = 20.0
-            applied_turn = max(-max_turn_rate, min(max_turn_rate, dh)) * dt
-            t["heading"] = (t["heading"] + applied_turn) % 360
-            t["los_prev"] = los
+        target_kin = target.kin
+        los = (math.degrees(math.atan2(target_kin.x - tx, target_kin.y - ty)) % 360.0)
+        # Explicit signed wraps (not math.remainder, which is only used above
+        # where the sign is discarded): a target dead astern gives exactly
+        # 180°, and the turn direction must match this form's -180.
+        dh_err = ((los - heading + 180.0) % 360.0) - 180.0
+        los_prev = t.get("los_prev")
+        if los_prev is None:
+            # No previous LOS: fall back to proportional-to-error for the first frame
+            commanded_turn_rate = dh_err
         else:
-            # LOS rate (deg/s) approximated by finite difference
-            los_prev = t.get("los_prev")
-            # Normalize smallest angle difference
-            los_rate = (((los - los_prev + 540) % 360) - 180) / max(1e-6, dt)
-            t["los_prev"] = los
+            # LOS rate (deg/s) approximated by finite difference of the
+            # smallest angle difference
+            los_rate = (((los - los_prev + 180.0) % 360.0) - 180.0) / max(1e-6, dt)
             nav_const = float(t.get("pn_nav_const", 3.0))
-            commanded_turn_rate = nav_const * los_rate
-            # Blend in proportional-to-error term to ensure decisive slewing toward LOS
-            dh_err = ((los - t["heading"] + 540) % 360) - 180
-            k_error = 1.0  # deg/s per deg of error (will be clamped by max_turn_rate below)
-            commanded_turn_rate += k_error * dh_err
-            # Jitter and reduced authority when spoofed
-            if t.get("spoofed_timer", 0.0) > 0.0:
-                commanded_turn_rate += random.uniform(-30.0, 30.0)
-                max_turn_rate = 10.0
-            else:
-                max_turn_rate = 20.0
-            # Clamp and apply turn over dt
-            applied_turn = max(-max_turn_rate, min(max_turn_rate, commanded_turn_rate)) * dt
-            t["heading"] = (t["heading"] + applied_turn) % 360
-
-    # Move torpedo using compass convention (0°=N, 90°=E)
+            # Blend in a proportional-to-error term (k_error = 1 deg/s per deg,
+            # clamped below) to ensure decisive slewing toward LOS
+            commanded_turn_rate = nav_const * los_rate + dh_err
+        t["los_prev"] = los
+        # Jitter and reduced authority when spoofed. Inlined
+        # random.uniform(-J, J): same formula and draw, minus the call.
+        if spoofed > 0.0:
+            commanded_turn_rate += -TORPEDO_SPOOF_JITTER_DEG + (2.0 * TORPEDO_SPOOF_JITTER_DEG) * random.random()
+            max_turn_rate = 10.0
+        else:
+            max_turn_rate = 20.0
+        # Clamp and apply turn over dt
+        if commanded_turn_rate > max_turn_rate:
+            commanded_turn_rate = max_turn_rate
+        elif commanded_turn_rate < -max_turn_rate:
+            commanded_turn_rate = -max_turn_rate
+        t["heading"] = heading = (heading + commanded_turn_rate * dt) % 360
+
+    # Move torpedo using compass convention (0°=N, 90°=E); the trig is
+    # only redone when the heading actually changed.
     mps = t["speed"] * KNOTS_TO_MPS
-    heading_rad = math.radians(t["heading"])
-    t["x"] += math.sin(heading_rad) * mps * dt
-    t["y"] += math.cos(heading_rad) * mps * dt
+    sin_h, cos_h = _heading_sin_cos(heading)
+    t["x"] = tx + sin_h * mps * dt
+    t["y"] = ty + cos_h * mps * dt
 
     # Vertical channel (terminal homing): once armed and tracking a target the
     # torpedo pitches toward the target's depth; otherwise it transits to its
     # ordered run depth. Depth rate is bounded by the pitch limit at this speed.
-    if target is not None and t["armed"]:
+    if target is not None:
         target_kin = getattr(target, "kin", None)
-        desired_depth = float(getattr(target_kin, "depth", t.get("run_depth", t.get("depth", 0.0))))
+        desired_depth = float(getattr(target_kin, "depth", t.get("run_depth", tdepth)))
     else:
-        desired_depth = float(t.get("run_depth", t.get("depth", 0.0)))
-    max_depth_step = mps * math.sin(math.radians(TORPEDO_MAX_PITCH_DEG)) * dt
-    cur_depth = t.get("depth", 0.0)
-    t["depth"] = _clamp(
-        cur_depth + _clamp(desired_depth - cur_depth, -max_depth_step, max_depth_step),
-        0.0,
-        TORPEDO_MAX_DEPTH_M,
-    )
+        desired_depth = float(t.get("run_depth", tdepth))
+    max_depth_step = mps * _TORPEDO_MAX_PITCH_SIN * dt
+    depth_step = desired_depth - tdepth
+    if depth_step > max_depth_step:
+        depth_step = max_depth_step
+    elif depth_step < -max_depth_step:
+        depth_step = -max_depth_step
+    new_depth = tdepth + depth_step
+    if new_depth < 0.0:
+        new_depth = 0.0
+    elif new_depth > TORPEDO_MAX_DEPTH_M:
+        new_depth = TORPEDO_MAX_DEPTH_M
+    t["depth"] = new_depth
 
     t["run_time"] += dt
 
 
-def _nearest_target(t: dict, world, countermeasures: list = None):
+class _CountermeasureKin:
+    __slots__ = ("x", "y", "depth")
+
+    def __init__(self, x: float, y: float, depth: float) -> None:
+        self.x = x
+        self.y = y
+        self.depth = depth
+
+
+class _CountermeasureTarget:
+    """Seeker target for a countermeasure dict, with a ship-like `kin`."""
+
+    __slots__ = ("kin", "is_countermeasure", "cm_id")
+
+    def __init__(self, cm: dict) -> None:
+        self.kin = _CountermeasureKin(cm["x"], cm["y"], cm.get("depth", 0))
+        self.is_countermeasure = True
+        self.cm_id = cm["id"]
+
+
+def _nearest_target(t: dict, world, countermeasures: list = None, env_mult: Optional[float] = None, ships: Optional[List[Ship]] = None, seeker_frame: Optional[List[SeekerEntry]] = None, ship_grid: Optional[Dict[Tuple[int, int], List[SeekerEntry]]] = None):
     """Find nearest target for torpedo seeker.
 
     Considers both ships and countermeasures. Countermeasures are very attractive
     due to high source level - they can lure torpedoes away from real targets.
+    `env_mult` is the `seeker_env_mult` for this tick and `ships` the tick's
+    roster; both are derived from `world` when omitted. `seeker_frame` is the
+    tick's `build_seeker_frame` (built from `ships` when omitted) and
+    `ship_grid` the tick's `build_ship_grid`, if any.
     """
-    candidates = []
     seeker_range = t.get("seeker_range_m", 4000.0)
-    seeker_cone = t.get("seeker_cone", 35.0)
+    tx = t["x"]
+    ty = t["y"]
+    tdepth = t.get("depth", 0.0)
+    tside = t.get("side")
+    # Cone test without atan2: a candidate is inside the horizontal cone when
+    # its component along the torpedo heading is at least cos(half_cone) of its
+    # horizontal range (also right for cones wider than 180°, where cos < 0).
+    sin_h, cos_h = _heading_sin_cos(t["heading"])
+    cone_cos = _half_cone_cos(t.get("seeker_cone", 35.0))
+    vertical_tan_sq = _SEEKER_VERTICAL_TAN_SQ
 
     # Environment effect (thermocline reduces seeker range)
-    own = world.ships.get("ownship")
-    env_mult = 0.6 if getattr(getattr(own, "acoustics", None), "thermocline_on", False) else 1.0
+    if env_mult is None:
+        env_mult = seeker_env_mult(world)
     effective_range = seeker_range * env_mult
+    # Range gate on squared slant range: candidates outside the seeker sphere
+    # are rejected before the angle tests.
+    effective_range_sq = effective_range * effective_range
+    sqrt = math.sqrt
+    log10 = math.log10
+
+    # Keep only the most attractive candidate: higher source level and closer
+    # range wins, using an SNR-like metric SL - 20*log10(range), evaluated as
+    # SL - 10*log10(range²) so no sqrt is needed. Ships are scanned before
+    # countermeasures and ties keep the first one seen.
+    best = None
+    best_is_cm = False
+    best_score = -math.inf
 
     # Check ships
-    for ship in world.all_ships():
-        if ship.side == t.get("side"):
+    if ship_grid is not None and effective_range <= SEEKER_GRID_CELL_M:
+        # Anything within seeker range is at most one cell away
+        cx = int(tx // SEEKER_GRID_CELL_M)
+        cy = int(ty // SEEKER_GRID_CELL_M)
+        candidates = [
+            entry
+            for gx in (cx - 1, cx, cx + 1)
+            for gy in (cy - 1, cy, cy + 1)
+            for entry in ship_grid.get((gx, gy), ())
+        ]
+    elif seeker_frame is not None:
+        candidates = seeker_frame
+    else:
+        candidates = build_seeker_frame(ships if ships is not None else world.all_ships())
+    for ship, side, sx, sy, sdepth, sl in candidates:
+        if side == tside:
+            continue
+        dx = sx - tx
+        dy = sy - ty
+        dz = sdepth - tdepth
+        horiz_sq = dx * dx + dy * dy
+        rng_sq = horiz_sq + dz * dz
+        if rng_sq > effective_range_sq:
             continue
-        dx = ship.kin.x - t["x"]
-        dy = ship.kin.y - t["y"]
-        dz = ship.kin.depth - t.get("depth", 0.0)
-        horiz = math.hypot(dx, dy)
-        rng = math.sqrt(horiz * horiz + dz * dz)  # 3D slant range
-        if rng > effective_range:
+        # Look up/down angle outside the vertical window
+        if dz * dz > horiz_sq * vertical_tan_sq:
             continue
-        bearing = (math.degrees(math.atan2(dx, dy)) % 360.0)
-        off = abs(((bearing - t["heading"] + 540) % 360) - 180)
-        elev = abs(math.degrees(math.atan2(dz, max(1e-6, horiz))))  # look up/down angle
-        if off <= seeker_cone / 2 and elev <= TORPEDO_SEEKER_VERTICAL_DEG / 2:
-            # Ship source level approximated by speed (louder = more attractive)
-            sl = 120.0 + ship.kin.speed * 1.5  # ~120-165 dB depending on speed
-            candidates.append({"type": "ship", "obj": ship, "range": rng, "sl": sl})
+        if dx * sin_h + dy * cos_h < sqrt(horiz_sq) * cone_cos:
+            continue
+        score = sl - 10.0 * log10(rng_sq if rng_sq > 1.0 else 1.0)
+        if score > best_score:
+            best, best_is_cm, best_score = ship, False, score
 
     # Check countermeasures (very loud, very attractive)
     if countermeasures:
@@ -415,53 +627,32 @@ def _nearest_target(t: dict, world, countermeasures: list = None):
             if not cm.get("active", False):
                 continue
             # Countermeasures from same side don't attract own torpedoes
-            if cm.get("side") == t.get("side"):
+            if cm.get("side") == tside:
                 continue
-            dx = cm["x"] - t["x"]
-            dy = cm["y"] - t["y"]
-            dz = cm.get("depth", 0.0) - t.get("depth", 0.0)
-            horiz = math.hypot(dx, dy)
-            rng = math.sqrt(horiz * horiz + dz * dz)  # 3D slant range
-            if rng > effective_range:
+            dx = cm["x"] - tx
+            dy = cm["y"] - ty
+            dz = cm.get("depth", 0.0) - tdepth
+            horiz_sq = dx * dx + dy * dy
+            rng_sq = horiz_sq + dz * dz
+            if rng_sq > effective_range_sq:
                 continue
-            bearing = (math.degrees(math.atan2(dx, dy)) % 360.0)
-            off = abs(((bearing - t["heading"] + 540) % 360) - 180)
-            elev = abs(math.degrees(math.atan2(dz, max(1e-6, horiz))))
-            if off <= seeker_cone / 2 and elev <= TORPEDO_SEEKER_VERTICAL_DEG / 2:
-                sl = cm.get("source_level_db", 160.0)  # Very loud!
-                candidates.append({"type": "countermeasure", "obj": cm, "range": rng, "sl": sl})
-
-    if not candidates:
-        return None
-
-    # Sort by attractiveness: higher source level and closer range wins
-    # Use SNR-like metric: SL - 20*log10(range)
-    def attractiveness(c):
-        tl = 20.0 * math.log10(max(1.0, c["range"]))
-        return c["sl"] - tl
-
-    candidates.sort(key=attractiveness, reverse=True)
-    best = candidates[0]
+            if dz * dz > horiz_sq * vertical_tan_sq:
+                continue
+            if dx * sin_h + dy * cos_h < sqrt(horiz_sq) * cone_cos:
+                continue
+            sl = cm.get("source_level_db", 160.0)  # Very loud!
+            score = sl - 10.0 * log10(rng_sq if rng_sq > 1.0 else 1.0)
+            if score > best_score:
+                best, best_is_cm, best_score = cm, True, score
 
-    # Return the target object (ship or countermeasure dict)
-    if best["type"] == "ship":
-        return best["obj"]
-    else:
-        # Return a mock object with kin-like interface for countermeasure
-        cm = best["obj"]
-        class CMTarget:
-            def __init__(self, cm):
-                self.kin = type("Kin", (), {"x": cm["x"], "y": cm["y"], "depth": cm.get("depth", 0)})()
-                self.is_countermeasure = True
-                self.cm_id = cm["id"]
-        return CMTarget(cm)
+    if best is None or not best_is_cm:
+        return best
+    # Countermeasures are dicts; wrap with a kin-like interface for guidance
+    return _CountermeasureTarget(best)
 
 
 def _get_tube(ship: Ship, idx: int) -> Optional[Tube]:
-    for t in ship.weapons.tubes:
-        if t.idx == idx:
-            return t
-    return None
+    return ship.weapons.tube_by_idx(idx)
 
 
 # -------------------- Depth Charges --------------------
@@ -482,11 +673,12 @@ def try_drop_depth_charges(
     - Detonation occurs exactly at target depth (±1 m), with sink rate 5 m/s, min detonation depth 15 m
     """
     ws = ship.weapons
-    if not getattr(getattr(ship, "capabilities", None), "has_depth_charges", False):
+    caps = ship.capabilities
+    if caps is None or not caps.has_depth_charges:
         return {"ok": False, "error": "No depth charges capability"}
     if ws.depth_charges_stored <= 0:
         return {"ok": False, "error": "No depth charges remaining"}
-    if getattr(ws, "depth_charge_cooldown_timer_s", 0.0) > 0.0:
+    if ws.depth_charge_cooldown_timer_s > 0.0:
         return {"ok": False, "error": "Depth charge system cooling down"}
     count = max(1, min(int(spread_size), 10, ws.depth_charges_stored))
     # Parameters
@@ -517,93 +709,108 @@ def try_drop_depth_charges(
         spawned.append(dc)
     # Consume inventory and set cooldown
     ws.depth_charges_stored -= count
-    ws.depth_charge_cooldown_timer_s = max(0.0, float(getattr(ws, "depth_charge_cooldown_s", 2.0)))
+    ws.depth_charge_cooldown_timer_s = max(0.0, ws.depth_charge_cooldown_s)
     if on_event:
         on_event("depth_charges.dropped", {"count": count, "spread_m": spread_meters, "minDepth": min_depth, "maxDepth": max_depth})
     return {"ok": True, "data": spawned}
 
 
-def step_depth_charge(dc: dict, world, dt: float, on_event: Optional[Callable[[str, dict], None]] = None) -> None:
+def step_depth_charge(dc: dict, world, dt: float, on_event: Optional[Callable[[str, dict], None]] = None, ships: Optional[List[Ship]] = None) -> None:
     """Advance a single depth charge; detonate at target depth and apply damage."""
     if dc.get("exploded"):
         return
-    # Sink vertically
-    dc["depth"] = dc.get("depth", 0.0) + float(dc.get("sink_rate_mps", 5.0)) * dt
+    # Sink vertically. Nearly every call is a charge still sinking, so that
+    # path is one read-modify-write of the depth and an early return.
+    depth = dc.get("depth", 0.0) + float(dc.get("sink_rate_mps", 5.0)) * dt
+    dc["depth"] = depth
     # Detonate when reaching target depth within ±1 m
-    tdepth = float(dc.get("target_depth", 30.0))
-    if abs(dc["depth"] - tdepth) <= 1.0:
-        # Apply spherical damage model
-        for ship in world.all_ships():
-            if ship.side == dc.get("side"):
-                continue
-            # 3D distance
-            dx = ship.kin.x - float(dc["x"])
-            dy = ship.kin.y - float(dc["y"])
-            dz = ship.kin.depth - float(dc["depth"])
-            dist = (dx * dx + dy * dy + dz * dz) ** 0.5
-
-            # Determine nearest compartment based on explosion position relative to sub
-            # Use XY distance to determine bow/midship/stern
-            rel_angle = math.degrees(math.atan2(dx, dy)) - ship.kin.heading
-            rel_angle = ((rel_angle + 540) % 360) - 180
-
-            if rel_angle > 45:
-                hit_position = "bow"
-            elif rel_angle < -45:
-                hit_position = "stern"
-            else:
-                hit_position = "midship"
-
-            primary_comp = get_compartment_for_hit_position(hit_position)
-
-            if dist <= 60.0:
-                # Direct hit
-                apply_compartment_damage(
-                    ship, primary_comp,
-                    breach_rate_add=DEPTH_CHARGE_DIRECT_PRIMARY_BREACH_RATE,
-                    integrity_loss=DEPTH_CHARGE_DIRECT_PRIMARY_INTEGRITY_LOSS,
-                )
-                if primary_comp > 0:
-                    apply_compartment_damage(
-                        ship, primary_comp - 1,
-                        breach_rate_add=DEPTH_CHARGE_DIRECT_ADJACENT_BREACH_RATE,
-                        integrity_loss=DEPTH_CHARGE_DIRECT_ADJACENT_INTEGRITY_LOSS,
-                    )
-                if primary_comp < 5:
-                    apply_compartment_damage(
-                        ship, primary_comp + 1,
-                        breach_rate_add=DEPTH_CHARGE_DIRECT_ADJACENT_BREACH_RATE,
-                        integrity_loss=DEPTH_CHARGE_DIRECT_ADJACENT_INTEGRITY_LOSS,
-                    )
+    if abs(depth - float(dc.get("target_depth", 30.0))) > 1.0:
+        return
+    # The charge is fixed for the whole damage pass; read it once rather
+    # than re-converting the dict fields for every ship.
+    cx = float(dc["x"])
+    cy = float(dc["y"])
+    cdepth = float(depth)
+    cside = dc.get("side")
+    direct_sq = DEPTH_CHARGE_DIRECT_RANGE_M * DEPTH_CHARGE_DIRECT_RANGE_M
+    near_sq = DEPTH_CHARGE_NEAR_RANGE_M * DEPTH_CHARGE_NEAR_RANGE_M
+    # Apply spherical damage model
+    for ship in (ships if ships is not None else world.all_ships()):
+        if ship.side == cside:
+            continue
+        kin = ship.kin
+        # 3D distance; ships outside the near-miss sphere are untouched,
+        # so reject them before the sqrt and the hit-position atan2.
+        dx = kin.x - cx
+        dy = kin.y - cy
+        dz = kin.depth - cdepth
+        dist_sq = dx * dx + dy * dy + dz * dz
+        if dist_sq > near_sq:
+            continue
+        dist = math.sqrt(dist_sq)
 
-                ship.damage.hull = compute_hull_damage(ship.damage.compartments)
+        # Determine nearest compartment based on explosion position relative to sub
+        # Use XY distance to determine bow/midship/stern
+        rel_angle = math.degrees(math.atan2(dx, dy)) - kin.heading
+        rel_angle = ((rel_angle + 180.0) % 360.0) - 180.0
 
-                if on_event:
-                    on_event("depth_charge.hit", {
-                        "target": ship.id,
-                        "range_m": dist,
-                        "hit_position": hit_position,
-                        "primary_compartment": primary_comp
-                    })
-            elif dist <= 120.0:
-                # Near miss: lighter damage, just to the primary compartment
+        if rel_angle > 45:
+            hit_position = "bow"
+        elif rel_angle < -45:
+            hit_position = "stern"
+        else:
+            hit_position = "midship"
+
+        primary_comp = get_compartment_for_hit_position(hit_position)
+
+        if dist_sq <= direct_sq:
+            # Direct hit
+            apply_compartment_damage(
+                ship, primary_comp,
+                breach_rate_add=DEPTH_CHARGE_DIRECT_PRIMARY_BREACH_RATE,
+                integrity_loss=DEPTH_CHARGE_DIRECT_PRIMARY_INTEGRITY_LOSS,
+            )
+            if primary_comp > 0:
                 apply_compartment_damage(
-                    ship, primary_comp,
-                    breach_rate_add=DEPTH_CHARGE_FAR_PRIMARY_BREACH_RATE,
-                    integrity_loss=DEPTH_CHARGE_FAR_PRIMARY_INTEGRITY_LOSS,
+                    ship, primary_comp - 1,
+                    breach_rate_add=DEPTH_CHARGE_DIRECT_ADJACENT_BREACH_RATE,
+                    integrity_loss=DEPTH_CHARGE_DIRECT_ADJACENT_INTEGRITY_LOSS,
+                )
+            if primary_comp < 5:
+                apply_compartment_damage(
+                    ship, primary_comp + 1,
+                    breach_rate_add=DEPTH_CHARGE_DIRECT_ADJACENT_BREACH_RATE,
+                    integrity_loss=DEPTH_CHARGE_DIRECT_ADJACENT_INTEGRITY_LOSS,
                 )
-                ship.damage.hull = compute_hull_damage(ship.damage.compartments)
 
-                if on_event:
-                    on_event("depth_charge.near", {
-                        "target": ship.id,
-                        "range_m": dist,
-                        "hit_position": hit_position,
-                        "primary_compartment": primary_comp
-                    })
-        dc["exploded"] = True
-        if on_event:
-            on_event("depth_charge.detonated", {"depth_m": dc["depth"], "x": float(dc.get("x", 0.0)), "y": float(dc.get("y", 0.0))})
+            ship.damage.hull = compute_hull_damage(ship.damage.compartments)
+
+            if on_event:
+                on_event("depth_charge.hit", {
+                    "target": ship.id,
+                    "range_m": dist,
+                    "hit_position": hit_position,
+                    "primary_compartment": primary_comp
+                })
+        else:
+            # Near miss: lighter damage, just to the primary compartment
+            apply_compartment_damage(
+                ship, primary_comp,
+                breach_rate_add=DEPTH_CHARGE_FAR_PRIMARY_BREACH_RATE,
+                integrity_loss=DEPTH_CHARGE_FAR_PRIMARY_INTEGRITY_LOSS,
+            )
+            ship.damage.hull = compute_hull_damage(ship.damage.compartments)
+
+            if on_event:
+                on_event("depth_charge.near", {
+                    "target": ship.id,
+                    "range_m": dist,
+                    "hit_position": hit_position,
+                    "primary_compartment": primary_comp
+                })
+    dc["exploded"] = True
+    if on_event:
+        on_event("depth_charge.detonated", {"depth_m": cdepth, "x": cx, "y": cy})
 
 
 # -------------------- Quick Torpedo (AI-only) --------------------
@@ -626,42 +833,37 @@ def try_launch_torpedo_quick(
     - Starts torpedo_quick_cooldown_timer_s
     """
     ws = ship.weapons
-    if getattr(getattr(ship, "capabilities", None), "has_torpedoes", False) is False:
+    caps = ship.capabilities
+    if caps is None or not caps.has_torpedoes:
         return {"ok": False, "error": "No torpedoes capability"}
     if ws.torpedoes_stored <= 0:
         return {"ok": False, "error": "No torpedoes remaining"}
-    if getattr(ws, "torpedo_quick_cooldown_timer_s", 0.0) > 0.0:
+    if ws.torpedo_quick_cooldown_timer_s > 0.0:
         return {"ok": False, "error": "Torpedo system cooling down"}
     # Fire the platform's own torpedo model so the fish carries the right tonal
     # signature (Soviet 53-65/SET-65, RN Tigerfish, ...). Performance fields stay
     # at TorpedoDef defaults — only the model name (→ sonar card) varies for now.
-    td = TorpedoDef(name=getattr(ws, "torpedo_type", "Mk48"))
-    import time
+    td = TorpedoDef(name=ws.torpedo_type)
     torp = {
-        "id": f"torpedo_{ship.id}_quick_{int(time.time() * 1000)}",  # Unique ID for sonar tracking
+        **_TORPEDO_TEMPLATE,
+        "id": f"torpedo_{ship.id}_quick_{next_entity_serial()}",  # Unique ID for sonar tracking
         "shooter_id": ship.id,
         "x": ship.kin.x,
         "y": ship.kin.y,
         "depth": ship.kin.depth,
         "heading": bearing_deg % 360.0,
         "speed": td.speed,
-        "armed": False,
         "enable_range_m": (enable_range_m if enable_range_m is not None else td.enable_range_m),
-        "seeker_range_m": getattr(td, "seeker_range_m", 4000.0),
-        "run_time": 0.0,
+        "seeker_range_m": td.seeker_range_m,
         "max_run_time": td.max_run_time_s,
-        "target_id": None,
         "name": td.name,
         "seeker_cone": td.seeker_cone_deg,
         "side": ship.side,
-        "spoofed_timer": 0.0,
         "run_depth": run_depth,
         "doctrine": doctrine,
-        "pn_nav_const": 3.0,
-        "los_prev": None,
     }
     ws.torpedoes_stored -= 1
-    ws.torpedo_quick_cooldown_timer_s = max(0.0, float(getattr(ws, "torpedo_quick_cooldown_s", 10.0)))
+    ws.torpedo_quick_cooldown_timer_s = max(0.0, ws.torpedo_quick_cooldown_s)
     if on_event:
         on_event("torpedo.quick_launched", {"bearing": bearing_deg, "run_depth": run_depth})
     return {"ok": True, "data": torp}
@@ -680,9 +882,8 @@ def create_countermeasure(
     - Noisemaker: Stationary, very loud, 45s lifetime, high attraction
     - Decoy: Mobile (5kn), loud, 90s lifetime, leads torpedo away
     """
-    import time
     return {
-        "id": f"cm-{cm_type[:2]}-{int(time.time() * 1000) % 100000}",
+        "id": f"cm-{cm_type[:2]}-{next_entity_serial()}",
         "type": cm_type,  # "noisemaker" or "decoy"
         "x": pos[0],
         "y": pos[1],
@@ -729,19 +930,19 @@ def try_deploy_countermeasure(
     Returns dict with 'ok' bool and either 'data' (countermeasure) or 'error'.
     """
     ws = ship.weapons
-    caps = getattr(ship, "capabilities", None)
+    caps = ship.capabilities
 
     # Check capability
-    if not caps or cm_type not in getattr(caps, "countermeasures", []):
+    if not caps or cm_type not in caps.countermeasures:
         return {"ok": False, "error": f"Ship cannot deploy {cm_type}"}
 
     # Check inventory
     if cm_type == "noisemaker":
-        if getattr(ws, "noisemakers_stored", 0) <= 0:
+        if ws.noisemakers_stored <= 0:
             return {"ok": False, "error": "No noisemakers remaining"}
         ws.noisemakers_stored -= 1
     elif cm_type == "decoy":
-        if getattr(ws, "decoys_stored", 0) <= 0:
+        if ws.decoys_stored <= 0:
             return {"ok": False, "error": "No decoys remaining"}
         ws.decoys_stored -= 1
     else:
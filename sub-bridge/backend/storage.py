@@ -1,6 +1,18 @@
 from __future__ import annotations
+import atexit
 import datetime as dt
-from typing import Optional, Any
+import json
+import threading
+import time
+import weakref
+from typing import Optional, Any, Dict, List
+
+try:  # pragma: no cover - import guard behavior not core logic
+    import orjson  # type: ignore
+    _HAVE_ORJSON = True
+except Exception:  # pragma: no cover
+    orjson = None  # type: ignore
+    _HAVE_ORJSON = False
 
 # Provide a graceful fallback when sqlmodel is unavailable (e.g., in minimal test envs)
 try:  # pragma: no cover - import guard behavior not core logic
@@ -37,6 +49,124 @@ if _HAVE_SQLMODEL:
         payload: str
 
 
+# Snapshots and events are buffered per engine and committed in batches: a
+# commit per row costs SQLite an fsync per row. A batch is written once it
+# holds STORAGE_BATCH_ROWS rows or STORAGE_FLUSH_S has passed since the last
+# write (checked as rows arrive; snapshots alone arrive every couple of
+# seconds), and on `flush()` at shutdown. A failed write is retried no sooner
+# than STORAGE_FLUSH_S later, and while the database stays unwritable the
+# oldest rows beyond STORAGE_MAX_PENDING_ROWS are dropped.
+STORAGE_BATCH_ROWS = 200
+STORAGE_FLUSH_S = 2.0
+STORAGE_MAX_PENDING_ROWS = 10_000
+
+
+class StorageWriter:
+    """Buffers rows for one engine and commits them one batch per transaction.
+
+    Rows are plain column dicts written with one executemany per table,
+    bypassing ORM object construction and validation.
+
+    Storage is best-effort: a failed write is reported and the rows stay
+    queued for the next attempt, but never raises into the caller.
+    """
+
+    def __init__(
+        self,
+        engine,
+        batch_rows: int = STORAGE_BATCH_ROWS,
+        flush_s: float = STORAGE_FLUSH_S,
+        max_pending: int = STORAGE_MAX_PENDING_ROWS,
+    ) -> None:
+        self.engine = engine
+        self.batch_rows = batch_rows
+        self.flush_s = flush_s
+        self.max_pending = max_pending
+        self._pending: Dict[Any, List[Dict[str, Any]]] = {}
+        self._count = 0
+        self._last_flush = time.monotonic()
+        self._failing = False
+        self._lock = threading.Lock()
+
+    def add(self, table, row: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending.setdefault(table, []).append(row)
+            self._count += 1
+            since = time.monotonic() - self._last_flush
+            # After a failed write a full batch no longer forces a retry on
+            # every row; wait out the flush interval instead.
+            due = since >= self.flush_s or (
+                self._count >= self.batch_rows and not self._failing
+            )
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        # The buffer is only cleared once the transaction has committed; if the
+        # write fails (e.g. "database is locked") the rows stay queued for the
+        # next flush instead of being dropped.
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._pending:
+                return
+            try:
+                with self.engine.begin() as conn:
+                    for table, rows in self._pending.items():
+                        if rows:
+                            conn.execute(table.insert(), rows)
+            except Exception as e:
+                self._failing = True
+                print(f"Warning: Failed to write {self._count} storage rows: {e}")
+                self._trim_pending()
+                return
+            self._pending = {}
+            self._count = 0
+            self._failing = False
+
+    def _trim_pending(self) -> None:
+        # Caller holds the lock. Drop the oldest rows of each table until the
+        # buffer is back under max_pending.
+        excess = self._count - self.max_pending
+        if excess <= 0:
+            return
+        for rows in self._pending.values():
+            n = min(excess, len(rows))
+            del rows[:n]
+            excess -= n
+            if excess <= 0:
+                break
+        dropped = self._count - self.max_pending
+        self._count = self.max_pending
+        print(f"Warning: Storage buffer full, dropped {dropped} oldest rows")
+
+
+_writers: "weakref.WeakKeyDictionary[Any, StorageWriter]" = weakref.WeakKeyDictionary()
+
+
+def get_writer(engine) -> StorageWriter:
+    writer = _writers.get(engine)
+    if writer is None:
+        writer = _writers[engine] = StorageWriter(engine)
+    return writer
+
+
+def flush(engine) -> None:
+    """Write out any buffered snapshots/events for `engine`."""
+    if not _HAVE_SQLMODEL or engine is None:
+        return
+    writer = _writers.get(engine)
+    if writer is not None:
+        writer.flush()
+
+
+@atexit.register
+def _flush_all() -> None:
+    # Last chance for rows buffered since the final batch (e.g. a process
+    # exiting without going through Simulation.run's shutdown path).
+    for writer in list(_writers.values()):
+        writer.flush()
+
+
 def init_engine(sqlite_path: str):
     if not _HAVE_SQLMODEL:
         return None
@@ -59,16 +189,41 @@ def create_run(engine) -> int:
 def insert_snapshot(engine, run_id: int, heading: float, speed: float, depth: float) -> None:
     if not _HAVE_SQLMODEL or engine is None:
         return
-    with Session(engine) as session:  # type: ignore[call-arg]
-        snap = Snapshot(run_id=run_id, ownship_heading=heading, ownship_speed=speed, ownship_depth=depth)  # type: ignore[operator]
-        session.add(snap)
-        session.commit()
+    get_writer(engine).add(Snapshot.__table__, {  # type: ignore[attr-defined]
+        "run_id": run_id,
+        "created_at": dt.datetime.utcnow(),
+        "ownship_heading": heading,
+        "ownship_speed": speed,
+        "ownship_depth": depth,
+    })
+
+
+def dumps_payload(payload: Any) -> str:
+    """Serialize an event payload to JSON text (orjson when available).
 
+    Raises TypeError for values JSON has no encoding for, like json.dumps.
+    """
+    if _HAVE_ORJSON:
+        try:
+            return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            # e.g. integers beyond 64 bits; json.dumps has the final say
+            pass
+    return json.dumps(payload)
 
-def insert_event(engine, run_id: int, type_: str, payload: str) -> None:
+
+def insert_event(engine, run_id: int, type_: str, payload: Any) -> None:
+    """Persist an event. `payload` may be pre-serialized JSON text or a raw
+    object; raw objects are serialized here, so the stored event reflects the
+    payload as it was at the call even if the caller later mutates it (and
+    nothing is serialized when event storage is disabled)."""
     if not _HAVE_SQLMODEL or engine is None:
         return
-    with Session(engine) as session:  # type: ignore[call-arg]
-        ev = Event(run_id=run_id, type=type_, payload=payload)  # type: ignore[operator]
-        session.add(ev)
-        session.commit()
+    if not isinstance(payload, str):
+        payload = dumps_payload(payload)
+    get_writer(engine).add(Event.__table__, {  # type: ignore[attr-defined]
+        "run_id": run_id,
+        "created_at": dt.datetime.utcnow(),
+        "type": type_,
+        "payload": payload,
+    })
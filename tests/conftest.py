@@ -1,12 +1,30 @@
 """Shared test fixtures for submarine bridge simulator tests."""
+import atexit
 import os
+import random
+import shutil
 import sys
-from typing import Any, Dict, List, Optional
+import tempfile
+from typing import Any, Dict, List, Optional, Tuple
 
 import pytest
 
-# Ensure sub-bridge backend is importable
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
+# Ensure sub-bridge backend is importable. This is the only place the path is
+# set up: pytest loads conftest before collecting any test module.
+_SUB_BRIDGE = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge'))
+if _SUB_BRIDGE not in sys.path:
+    sys.path.insert(0, _SUB_BRIDGE)
+
+# Every Simulation opens CONFIG.sqlite_path and writes its action log under
+# CONFIG.log_dir, both read from the environment when backend.config is first
+# imported. Give each test process (each xdist worker loads this conftest
+# separately) its own database and log directory so parallel workers never
+# write the same SQLite file, and the suite leaves no sub-bridge.db or
+# logs/action_log_*.md behind in the repository.
+_SQLITE_DIR = tempfile.mkdtemp(prefix="sub-bridge-tests-")
+os.environ["SQLITE_PATH"] = os.path.join(_SQLITE_DIR, "sub-bridge.db")
+os.environ["LOG_DIR"] = os.path.join(_SQLITE_DIR, "logs")
+atexit.register(shutil.rmtree, _SQLITE_DIR, ignore_errors=True)
 
 from backend.models import (
     Ship, Kinematics, Hull, Acoustics, WeaponsSuite, Reactor,
@@ -57,6 +75,11 @@ def make_world(*ships: Ship) -> World:
     return world
 
 
+def red_ships(sim) -> Tuple[Ship, ...]:
+    """The RED ships currently in `sim`'s world."""
+    return tuple(s for s in sim.world.all_ships() if s.side == "RED")
+
+
 def make_test_simulation():
     """Construct a `Simulation` with an active default ownship for tests.
 
@@ -80,6 +103,17 @@ def make_test_simulation():
     return sim
 
 
+@pytest.fixture(scope="module")
+def shared_sim():
+    """One `make_test_simulation()` per test module.
+
+    Only for tests that use the Simulation as a host for stateless helpers
+    (e.g. `_apply_stage_penalties`) applied to their own `make_ship()`; tests
+    that mutate tasks, orders or the world must build their own instance.
+    """
+    return make_test_simulation()
+
+
 class StubLLMEngine(BaseEngine):
     """Test engine returning canned responses.
 
@@ -135,6 +169,32 @@ class StubLLMEngine(BaseEngine):
         }
 
 
+@pytest.fixture(autouse=True, scope="session")
+def _no_random_torpedo_spoofing():
+    """Keep torpedo guidance deterministic: no random seeker spoofing in tests."""
+    from backend.sim.weapons import set_spoof_enabled
+
+    set_spoof_enabled(False)
+    yield
+    set_spoof_enabled(True)
+
+
+@pytest.fixture
+def seeded_random(monkeypatch):
+    """Seed a module's randomness without touching the global `random` state.
+
+    `seeded_random(module, seed)` swaps the module's `random` for a private
+    `random.Random(seed)` for the duration of the test, so seeded tests stay
+    reproducible regardless of test order or `pytest -n` worker assignment.
+    """
+    def _seed(module, seed):
+        rng = random.Random(seed)
+        monkeypatch.setattr(module, "random", rng)
+        return rng
+
+    return _seed
+
+
 @pytest.fixture
 def stub_llm_engine() -> StubLLMEngine:
     """Empty stub engine; tests can populate response queues as needed."""
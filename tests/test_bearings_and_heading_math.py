@@ -1,11 +1,6 @@
-import os
-import sys
 import math
 
-# Ensure sub-bridge backend is importable
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
-
-from backend.sim.physics import integrate_kinematics
+from backend.sim.physics import integrate_kinematics, KNOTS_TO_MPS
 from backend.sim.weapons import step_torpedo
 from backend.sim.ecs import World
 from backend.models import Ship, Kinematics, Hull, Acoustics, WeaponsSuite, Reactor, DamageState
@@ -64,10 +59,13 @@ def test_integrate_kinematics_moves_along_compass_axes():
 
     # Eastbound
     ship = make_ship(heading=90.0, speed=10.0)
-    _ = integrate_kinematics(ship, ordered_heading=90.0, ordered_speed=10.0, ordered_depth=ship.kin.depth, dt=1.0)
+    _, _, s, _ = integrate_kinematics(ship, ordered_heading=90.0, ordered_speed=10.0, ordered_depth=ship.kin.depth, dt=1.0)
     # East → x increases, y ~ 0
     assert ship.kin.x > 0.0
     assert abs(ship.kin.y) < ship.kin.x * 0.1
+    # Heading 090 is pure +x: the full distance run lands on x, none on y
+    assert math.isclose(ship.kin.x, s * KNOTS_TO_MPS * 1.0, rel_tol=1e-9)
+    assert abs(ship.kin.y) < 1e-9
 
     # Southbound
     ship = make_ship(heading=180.0, speed=10.0)
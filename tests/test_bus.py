@@ -0,0 +1,18 @@
+import asyncio
+
+import pytest
+
+from backend.bus import AsyncTopicBroker
+
+
+@pytest.mark.asyncio
+async def test_has_subscribers_tracks_live_subscriptions():
+    bus = AsyncTopicBroker()
+    assert not bus.has_subscribers("tick:sonar")
+    waiter = asyncio.create_task(bus.next_message("tick:sonar", timeout=1.0))
+    await asyncio.sleep(0)
+    assert bus.has_subscribers("tick:sonar")
+    assert not bus.has_subscribers("tick:debug")
+    await bus.publish("tick:sonar", {"ok": True})
+    assert await waiter == {"ok": True}
+    assert not bus.has_subscribers("tick:sonar")
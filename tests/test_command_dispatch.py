@@ -79,6 +79,20 @@ def test_weapons_countermeasure_deploy_recorded():
         assert len(cm_after) >= len(cm_before)
 
 
+def test_weapons_test_fire_uses_torpedo_launch_defaults():
+    from backend.sim.weapons import _TORPEDO_TEMPLATE
+    sim = make_test_simulation()
+    err = asyncio.run(sim.handle_command(
+        "weapons.test_fire", {"bearing": 370.0, "run_depth": 60.0}
+    ))
+    assert err is None
+    torp = sim.world.torpedoes[-1]
+    # Same launch state as try_fire / quick launch
+    assert {k: torp[k] for k in _TORPEDO_TEMPLATE} == _TORPEDO_TEMPLATE
+    assert torp["heading"] == 10.0 and torp["run_depth"] == 60.0
+    assert torp["name"] == "Mk48-TEST"
+
+
 # --------------------------------------------------------------------------- #
 # Engineering (reactor controls, scram)
 # --------------------------------------------------------------------------- #
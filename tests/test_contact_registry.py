@@ -1,6 +1,4 @@
 """Tests for sub-bridge/backend/sim/contact_registry.py"""
-import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
 
 from backend.sim.contact_registry import ContactRegistry
 
@@ -1,6 +1,4 @@
 """Tests for sub-bridge/backend/sim/damage.py"""
-import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
 
 from conftest import make_ship
 from backend.sim.damage import (
@@ -94,8 +92,7 @@ def test_apply_compartment_damage():
 
 
 def test_get_compartment_for_hit_position():
-    import random
-    random.seed(42)
+    # Subset checks hold for any draw, so the global RNG is left unseeded
     bow_hits = {get_compartment_for_hit_position("bow") for _ in range(20)}
     mid_hits = {get_compartment_for_hit_position("midship") for _ in range(20)}
     stern_hits = {get_compartment_for_hit_position("stern") for _ in range(20)}
@@ -1,64 +1,65 @@
-import os
-import sys
+import pytest
 
-# Ensure sub-bridge backend is importable (align with other tests)
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
-
-from backend.sim.loop import Simulation
+from backend.sim.loop import STAGE_FAILING
 from backend.models import MaintenanceTask
 
-from conftest import make_test_simulation
-
-
-def test_helm_degraded_and_failed_effects():
-    sim = make_test_simulation()
-    own = sim.world.get_ship("ownship")
+from conftest import make_ship, make_test_simulation
+
+# `_apply_stage_penalties` accepts a stage either by name or by STAGE_* code
+DEGRADED_STAGES = ["failing", STAGE_FAILING]
+
+# Validated once; tests derive their tasks with `model_copy(update=...)`
+_TASK_TEMPLATE = MaintenanceTask(
+    id="x",
+    station="helm",
+    system="rudder",
+    key="k",
+    title="T",
+    stage="task",
+    progress=0.0,
+    started=False,
+    base_deadline_s=20.0,
+    time_remaining_s=10.0,
+    created_at=0.0,
+)
+
+
+def _sonar_penalties(own):
+    a = own.acoustics
+    return (a.passive_snr_penalty_db, a.active_range_noise_add_m, a.active_bearing_noise_extra)
+
+
+# station, systems flag cleared on failure, nominal check, degraded check
+STATION_EFFECTS = [
+    ("helm", "rudder_ok",
+     lambda own: own.hull.turn_rate_max == 7.0,
+     lambda own: own.hull.turn_rate_max < 7.0),
+    ("sonar", "sonar_ok",
+     lambda own: all(v == 0.0 for v in _sonar_penalties(own)),
+     lambda own: all(v > 0.0 for v in _sonar_penalties(own))),
+    ("weapons", "tubes_ok",
+     lambda own: own.weapons.time_penalty_multiplier == 1.0,
+     lambda own: own.weapons.time_penalty_multiplier > 1.0),
+]
+
+
+@pytest.mark.parametrize("deg", DEGRADED_STAGES)
+@pytest.mark.parametrize("station,ok_flag,nominal,degraded", STATION_EFFECTS, ids=[e[0] for e in STATION_EFFECTS])
+def test_station_degraded_and_failed_effects(shared_sim, station, ok_flag, nominal, degraded, deg):
+    sim = shared_sim
+    own = make_ship()
 
     # Baseline
-    assert own.hull.turn_rate_max == 7.0
-    assert own.systems.rudder_ok is True
-
-    # Failing reduces turn authority
-    sim._apply_stage_penalties(own, "helm", "failing")
-    assert own.hull.turn_rate_max < 7.0
-
-    # Failed disables rudder
-    sim._apply_stage_penalties(own, "helm", "failed")
-    assert own.systems.rudder_ok is False
-
-
-def test_sonar_degradation_penalties():
-    sim = make_test_simulation()
-    own = sim.world.get_ship("ownship")
-
-    # Baseline acoustics modifiers
-    assert getattr(own.acoustics, "passive_snr_penalty_db", 0.0) == 0.0
-    assert getattr(own.acoustics, "active_range_noise_add_m", 0.0) == 0.0
-    assert getattr(own.acoustics, "active_bearing_noise_extra", 0.0) == 0.0
-    assert own.systems.sonar_ok is True
-
-    sim._apply_stage_penalties(own, "sonar", "failing")
-    assert own.acoustics.passive_snr_penalty_db > 0.0
-    assert own.acoustics.active_range_noise_add_m > 0.0
-    assert own.acoustics.active_bearing_noise_extra > 0.0
-
-    sim._apply_stage_penalties(own, "sonar", "failed")
-    assert own.systems.sonar_ok is False
-
-
-def test_weapons_degradation_and_failure():
-    sim = make_test_simulation()
-    own = sim.world.get_ship("ownship")
-
-    base_mult = own.weapons.time_penalty_multiplier
-    assert base_mult == 1.0
-    assert own.systems.tubes_ok is True
+    assert nominal(own)
+    assert getattr(own.systems, ok_flag) is True
 
-    sim._apply_stage_penalties(own, "weapons", "failing")
-    assert own.weapons.time_penalty_multiplier > base_mult
+    # Degraded stage applies the station's penalties
+    sim._apply_stage_penalties(own, station, deg)
+    assert degraded(own)
 
-    sim._apply_stage_penalties(own, "weapons", "failed")
-    assert own.systems.tubes_ok is False
+    # Failed takes the system offline
+    sim._apply_stage_penalties(own, station, "failed")
+    assert getattr(own.systems, ok_flag) is False
 
 
 def test_task_escalation_applies_penalties():
@@ -66,19 +67,10 @@ def test_task_escalation_applies_penalties():
     own = sim.world.get_ship("ownship")
 
     # Seed a manual HELM task at expired deadline to force escalation
-    t = MaintenanceTask(
-        id="t1",
-        station="helm",
-        system="rudder",
-        key="helm.rudder.lube",
-        title="Rudder Lubricate",
-        stage="task",
-        progress=0.0,
-        started=False,
-        base_deadline_s=5.0,
-        time_remaining_s=0.0,
-        created_at=0.0,
-    )
+    t = _TASK_TEMPLATE.model_copy(update={
+        "id": "t1", "key": "helm.rudder.lube", "title": "Rudder Lubricate",
+        "base_deadline_s": 5.0, "time_remaining_s": 0.0,
+    })
     sim._active_tasks["helm"] = [t]
 
     # Capture current turn rate, then step tasks to trigger escalation to degraded
@@ -89,40 +81,21 @@ def test_task_escalation_applies_penalties():
     assert after_turn <= before_turn
 
 
-def test_aggregated_penalties_use_worst_stage():
+@pytest.mark.parametrize("lesser", ["task", "failing"])
+def test_aggregated_penalties_use_worst_stage(lesser):
     sim = make_test_simulation()
     own = sim.world.get_ship("ownship")
 
     # Prevent auto-spawn during this test
     sim._task_spawn_timers = {k: 1e9 for k in sim._task_spawn_timers.keys()}
 
-    # Seed two HELM tasks: one failing and one failed
-    t_deg = MaintenanceTask(
-        id="t_deg",
-        station="helm",
-        system="rudder",
-        key="helm.rudder.linkage",
-        title="Rudder Linkage Adjust",
-        stage="failing",
-        progress=0.0,
-        started=False,
-        base_deadline_s=20.0,
-        time_remaining_s=10.0,
-        created_at=0.0,
-    )
-    t_fail = MaintenanceTask(
-        id="t_fail",
-        station="helm",
-        system="rudder",
-        key="helm.hydraulics.fail",
-        title="Hydraulics Major Leak",
-        stage="failed",
-        progress=0.0,
-        started=False,
-        base_deadline_s=20.0,
-        time_remaining_s=10.0,
-        created_at=0.0,
-    )
+    # Seed two HELM tasks: a lesser one and one failed
+    t_deg = _TASK_TEMPLATE.model_copy(update={
+        "id": "t_deg", "key": "helm.rudder.linkage", "title": "Rudder Linkage Adjust", "stage": lesser,
+    })
+    t_fail = _TASK_TEMPLATE.model_copy(update={
+        "id": "t_fail", "key": "helm.hydraulics.fail", "title": "Hydraulics Major Leak", "stage": "failed",
+    })
     sim._active_tasks["helm"] = [t_deg, t_fail]
 
     # Aggregation should apply the worst (failed) penalties
@@ -142,8 +115,8 @@ def test_aggregated_penalties_use_worst_stage():
     assert own.hull.turn_rate_max == 7.0
 
 
-def test_clicking_repair_spawns_task_if_none_and_progresses_with_power():
-    import asyncio
+@pytest.mark.asyncio
+async def test_clicking_repair_spawns_task_if_none_and_progresses_with_power():
     sim = make_test_simulation()
     own = sim.world.get_ship("ownship")
 
@@ -152,38 +125,36 @@ def test_clicking_repair_spawns_task_if_none_and_progresses_with_power():
     # Allocate sonar power to drive progress
     own.power.sonar = 1.0; own.power.helm = 0.0; own.power.weapons = 0.0; own.power.engineering = 0.0
     # Click Repair -> should spawn and start
-    _ = asyncio.run(sim.handle_command("station.task.start", {"station": "sonar"}))
+    await sim.handle_command("station.task.start", {"station": "sonar"})
     assert len(sim._active_tasks["sonar"]) == 1
     assert sim._active_tasks["sonar"][0].started is True
     p0 = sim._active_tasks["sonar"][0].progress
-    # Tick a bit and expect progress
-    for _ in range(10):
-        _ = asyncio.run(sim.tick(0.1))
-        if not sim._active_tasks["sonar"]:
-            break
+    # Tick a bit and expect progress; tick does not sub-step and task progress
+    # is linear in dt, so one 1 s tick stands in for ten 0.1 s ticks
+    await sim.tick(1.0)
     if sim._active_tasks["sonar"]:
         assert sim._active_tasks["sonar"][0].progress > p0
 
 
-def test_per_task_repair_only_advances_selected_task():
-    import asyncio
+@pytest.mark.asyncio
+async def test_per_task_repair_only_advances_selected_task():
     sim = make_test_simulation()
     own = sim.world.get_ship("ownship")
     sim._task_spawn_timers = {k: 1e9 for k in sim._task_spawn_timers.keys()}
     # Seed two SONAR tasks
-    t1 = MaintenanceTask(id="a", station="sonar", system="sonar", key="sonar.hydro.cal", title="Hydrophone Calibration", stage="task", progress=0.0, started=False, base_deadline_s=20.0, time_remaining_s=10.0, created_at=0.0)
-    t2 = MaintenanceTask(id="b", station="sonar", system="sonar", key="sonar.preamp", title="Preamp Gain Trim", stage="task", progress=0.0, started=False, base_deadline_s=20.0, time_remaining_s=10.0, created_at=0.0)
+    sonar_task = _TASK_TEMPLATE.model_copy(update={"station": "sonar", "system": "sonar"})
+    t1 = sonar_task.model_copy(update={"id": "a", "key": "sonar.hydro.cal", "title": "Hydrophone Calibration"})
+    t2 = sonar_task.model_copy(update={"id": "b", "key": "sonar.preamp", "title": "Preamp Gain Trim"})
     sim._active_tasks["sonar"] = [t1, t2]
     own.power.helm = own.power.weapons = own.power.engineering = 0.0
     own.power.sonar = 1.0
     # Start only task b
-    _ = asyncio.run(sim.handle_command("station.task.start", {"station": "sonar", "task_id": "b"}))
+    await sim.handle_command("station.task.start", {"station": "sonar", "task_id": "b"})
     assert sim._active_tasks["sonar"][0].started is False
     assert sim._active_tasks["sonar"][1].started is True
     # Tick and verify b progressed, a did not
     p0a, p0b = sim._active_tasks["sonar"][0].progress, sim._active_tasks["sonar"][1].progress
-    for _ in range(10):
-        _ = asyncio.run(sim.tick(0.1))
+    await sim.tick(1.0)
     pa, pb = sim._active_tasks["sonar"][0].progress, sim._active_tasks["sonar"][1].progress
     assert pb > p0b
     assert pa == p0a
@@ -1,43 +1,35 @@
-import os
-import sys
-import asyncio
 import pytest
 
-# Add project sub-bridge to import path (same pattern as existing tests)
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
-
-from backend.sim.loop import Simulation
 from backend.sim.damage import step_engineering
 from backend.sim.physics import integrate_kinematics
+from backend.sim import sonar
 from backend.sim.sonar import passive_contacts, active_ping
 from backend.models import Ship, Kinematics, Hull, Acoustics, WeaponsSuite, Reactor, DamageState
 
-from conftest import make_test_simulation
+from conftest import make_ship, make_test_simulation, red_ships
 
 
-def test_power_allocation_rejects_and_accepts():
+@pytest.mark.asyncio
+async def test_power_allocation_rejects_and_accepts():
     sim = make_test_simulation()
     # Reject over-budget
-    err = asyncio.run(sim.handle_command(
+    err = await sim.handle_command(
         "engineering.power.allocate", {"helm": 0.5, "weapons": 0.5, "sonar": 0.3, "engineering": 0.0}
-    ))
+    )
     assert isinstance(err, str) and "exceeds" in err.lower()
 
     # Accept exact budget and set fractions
-    err2 = asyncio.run(sim.handle_command(
+    err2 = await sim.handle_command(
         "engineering.power.allocate", {"helm": 0.1, "weapons": 0.2, "sonar": 0.3, "engineering": 0.4}
-    ))
+    )
     assert err2 is None
     own = sim.world.get_ship("ownship")
-    assert own.power.helm == pytest.approx(0.1)
-    assert own.power.weapons == pytest.approx(0.2)
-    assert own.power.sonar == pytest.approx(0.3)
-    assert own.power.engineering == pytest.approx(0.4)
+    fractions = [own.power.helm, own.power.weapons, own.power.sonar, own.power.engineering]
+    assert fractions == pytest.approx([0.1, 0.2, 0.3, 0.4])
 
 
 def test_maintenance_failure_flags_and_recovery():
-    sim = make_test_simulation()
-    own = sim.world.get_ship("ownship")
+    own = make_ship()
 
     # Force low maintenance -> failures
     for k in own.maintenance.levels.keys():
@@ -53,8 +45,9 @@ def test_maintenance_failure_flags_and_recovery():
     own.power.weapons = 0.0
     own.power.sonar = 0.0
     own.power.engineering = 1.0
-    for _ in range(100):  # 100 * 0.05s = 5s
-        step_engineering(own, dt=0.05)
+    # Recovery is linear in dt (clamped at 1.0), so one 5 s step matches
+    # 100 steps of 0.05 s
+    step_engineering(own, dt=5.0)
     # Levels should climb above the 0.2 failure threshold
     assert own.maintenance.levels["rudder"] > 0.2
     step_engineering(own, dt=0.05)
@@ -62,8 +55,7 @@ def test_maintenance_failure_flags_and_recovery():
 
 
 def test_physics_respects_rudder_and_ballast_failures():
-    sim = make_test_simulation()
-    own = sim.world.get_ship("ownship")
+    own = make_ship()
 
     # Rudder failure -> no heading change
     own.maintenance.levels["rudder"] = 0.0
@@ -82,9 +74,8 @@ def test_physics_respects_rudder_and_ballast_failures():
 
 
 def test_sonar_gating_on_failure():
-    sim = make_test_simulation()
-    own = sim.world.get_ship("ownship")
-    red = [s for s in sim.world.all_ships() if s.id != own.id]
+    own = make_ship()
+    red = [make_ship("red-01", x=3000.0)]
 
     # Healthy sonar should produce contacts
     contacts = passive_contacts(own, red)
@@ -97,89 +88,136 @@ def test_sonar_gating_on_failure():
     assert active_ping(own, red) == []
 
 
-def test_active_ping_cooldown_and_event():
+@pytest.mark.asyncio
+async def test_active_ping_cooldown_and_event():
     sim = make_test_simulation()
     # Initial ping should start cooldown and emit event
-    err = asyncio.run(sim.handle_command("sonar.ping", {"array": "bow"}))
+    err = await sim.handle_command("sonar.ping", {"array": "bow"})
     assert err is None
     assert sim.active_ping_state.timer > 0.0
     # Event queued for this tick
     assert any(e.get("type") == "counterDetected" for e in sim._transient_events)
 
     # Immediate second ping should be rejected by cooldown
-    err2 = asyncio.run(sim.handle_command("sonar.ping", {"array": "bow"}))
+    err2 = await sim.handle_command("sonar.ping", {"array": "bow"})
     assert isinstance(err2, str) and "cooldown" in err2.lower()
 
 
-def test_compass_bearings_convention_in_active_ping():
-    # 0=N, 90=E, 180=S, 270=W
-    import random
-    random.seed(0)
-    own = Ship(
+@pytest.fixture(scope="module")
+def own_north():
+    # Stationary ownship at the origin, heading north
+    return Ship(
         id="ownship",
         side="BLUE",
         kin=Kinematics(x=0.0, y=0.0, depth=100.0, heading=0.0, speed=0.0),
         hull=Hull(), acoustics=Acoustics(), weapons=WeaponsSuite(), reactor=Reactor(), damage=DamageState()
     )
-    def bearing_of(other_xy):
-        other = Ship(
-            id="contact",
-            side="RED",
-            kin=Kinematics(x=other_xy[0], y=other_xy[1], depth=100.0, heading=180.0, speed=0.0),
+
+
+# 0=N, 90=E, 180=S, 270=W
+@pytest.mark.parametrize("xy,expected", [
+    ((1000.0, 0.0), 90.0),
+    ((0.0, -1000.0), 180.0),
+    ((-1000.0, 0.0), 270.0),
+    ((0.0, 1000.0), 0.0),
+], ids=["east", "south", "west", "north"])
+def test_compass_bearings_convention_in_active_ping(own_north, seeded_random, xy, expected):
+    seeded_random(sonar, 0)
+    other = Ship(
+        id="contact",
+        side="RED",
+        kin=Kinematics(x=xy[0], y=xy[1], depth=100.0, heading=180.0, speed=0.0),
+        hull=Hull(), acoustics=Acoustics(), weapons=WeaponsSuite(), reactor=Reactor(), damage=DamageState()
+    )
+    res = active_ping(own_north, [other])
+    assert len(res) == 1
+    _, _, brg, _ = res[0]
+    # Wrapped difference, so North accepts both ~0 and ~360
+    assert abs((brg - expected + 180.0) % 360.0 - 180.0) <= 10.0
+
+
+def test_active_ping_strength_falls_off_with_range(seeded_random):
+    seeded_random(sonar, 1)
+    own = Ship(
+        id="ownship", side="BLUE",
+        kin=Kinematics(x=0.0, y=0.0, depth=100.0),
+        hull=Hull(), acoustics=Acoustics(), weapons=WeaponsSuite(), reactor=Reactor(), damage=DamageState()
+    )
+    others = [
+        Ship(
+            id=f"c{r}", side="RED",
+            kin=Kinematics(x=0.0, y=float(r), depth=100.0),
             hull=Hull(), acoustics=Acoustics(), weapons=WeaponsSuite(), reactor=Reactor(), damage=DamageState()
         )
-        res = active_ping(own, [other])
-        assert len(res) == 1
-        _, _, brg, _ = res[0]
-        return brg
-    # East -> ~90
-    b_e = bearing_of((1000.0, 0.0))
-    assert 80.0 <= b_e <= 100.0
-    # South -> ~180
-    b_s = bearing_of((0.0, -1000.0))
-    assert 170.0 <= b_s <= 190.0
-    # West -> ~270
-    b_w = bearing_of((-1000.0, 0.0))
-    # account for wraparound: allow [260, 280]
-    assert 260.0 <= b_w <= 280.0
-    # North -> ~0 (or 360); normalize to [0,360)
-    b_n = bearing_of((0.0, 1000.0)) % 360.0
-    assert b_n <= 10.0 or b_n >= 350.0
+        for r in (0.0, 500.0, 4000.0, 40000.0)
+    ]
+    strengths = [st for (_id, _rng, _brg, st) in active_ping(own, others)]
+    assert all(0.0 < st <= 1.0 for st in strengths)
+    assert strengths == sorted(strengths, reverse=True)
 
 
 @pytest.mark.xfail(reason="Stale: depends on pre-existing default-world spawn (ownship + red-01 at fixed coords) that the pytest guard at loop.py:283 disables. Investigate during Phase 4 (SubmarineControls).", strict=False)
-def test_debug_restart_resets_world_to_defaults():
-    import asyncio
+@pytest.mark.asyncio
+async def test_debug_restart_resets_world_to_defaults():
     sim = make_test_simulation()
     # Change orders to non-default
-    _ = asyncio.run(sim.handle_command("helm.order", {"heading": 45.0, "speed": 15.0, "depth": 50.0}))
+    await sim.handle_command("helm.order", {"heading": 45.0, "speed": 15.0, "depth": 50.0})
     # Restart
-    _ = asyncio.run(sim.handle_command("debug.restart", {}))
+    await sim.handle_command("debug.restart", {})
     own = sim.world.get_ship("ownship")
     assert own.kin.heading == 270.0
     assert own.kin.speed == 8.0
     assert own.kin.depth == 100.0
-    red = [s for s in sim.world.all_ships() if s.id != own.id]
+    red = red_ships(sim)
     assert len(red) == 1 and red[0].id == "red-01"
     assert red[0].kin.x == 3000.0 and red[0].kin.y == 0.0
     assert red[0].kin.heading == 90.0 and red[0].kin.speed == 8.0 and red[0].kin.depth == 120.0
 
 
-def test_station_tasks_spawn_and_progress_with_power():
-    import time as _time
+@pytest.mark.asyncio
+async def test_station_tasks_spawn_and_progress_with_power():
+    sim = make_test_simulation()
+    own = sim.world.get_ship("ownship")
+    # Force spawn timers to immediate
+    sim._task_spawn_timers = {k: 0.0 for k in sim._task_spawn_timers.keys()}
+    # Tick enough to spawn
+    for _ in range(5):
+        await sim.tick(0.05)
+    # Expect some tasks present (randomized, but at least one station should have a task)
+    active = [k for k, v in sim._active_tasks.items() if v]
+    assert len(active) >= 1
+    # Allocate high power to first station and tick to progress
+    st = active[0]
+    own.power.helm = 0.0; own.power.weapons = 0.0; own.power.sonar = 0.0; own.power.engineering = 0.0
+    if st == "helm": own.power.helm = 1.0
+    elif st == "weapons": own.power.weapons = 1.0
+    elif st == "sonar": own.power.sonar = 1.0
+    else: own.power.engineering = 1.0
+    # Start/repair the task explicitly; also covers case where none existed
+    await sim.handle_command("station.task.start", {"station": st})
+    p0 = sim._active_tasks[st][0].progress
+    # Task progress is linear in dt; cover the same 3 s in 1 s ticks
+    for _ in range(3):
+        await sim.tick(1.0)
+        if not sim._active_tasks.get(st):
+            break
+    # Either completed (cleared) or progressed
+    if not sim._active_tasks.get(st):
+        assert True
+    else:
+        assert sim._active_tasks[st][0].progress > p0
 
 
 @pytest.mark.xfail(reason="Stale: depends on pre-existing default-world spawn that the pytest guard at loop.py:283 disables.", strict=False)
-def test_surface_vessel_mission_sets_single_surface_contact():
-    import asyncio
+@pytest.mark.asyncio
+async def test_surface_vessel_mission_sets_single_surface_contact():
     sim = make_test_simulation()
     # Ensure world starts as default
-    red_start = [s for s in sim.world.all_ships() if s.id != 'ownship']
+    red_start = red_ships(sim)
     assert len(red_start) == 1
     # Invoke new mission
-    _ = asyncio.run(sim.handle_command("debug.mission.surface_vessel", {}))
-    own = sim.world.get_ship("ownship")
-    reds = [s for s in sim.world.all_ships() if s.id != own.id and s.side == "RED"]
+    await sim.handle_command("debug.mission.surface_vessel", {})
+    reds = red_ships(sim)
     assert len(reds) == 1
     target = reds[0]
     # Check it's surface and slow, placed ~6km east
@@ -190,51 +228,21 @@ def test_surface_vessel_mission_sets_single_surface_contact():
     # Mission brief updated
     assert "Surface Vessel Intercept" in sim.mission_brief["title"]
     # Telemetry includes class/capabilities
-    _ = asyncio.run(sim.tick(0.05))
+    await sim.tick(0.05)
     # Grab debug payload indirectly by reading sim._last_captain_tel or general broadcast
     assert any(s.get("class") in ("Convoy", "SSN") for s in sim._last_captain_tel.get("periscopeContacts", []) or [
     ]) or True  # permissive: just ensure no crash
 
 
 @pytest.mark.xfail(reason="Stale: chains debug.mission.surface_vessel which depends on pre-existing default-world spawn.", strict=False)
-def test_ai_tool_set_nav_respects_capabilities():
-    import asyncio
+@pytest.mark.asyncio
+async def test_ai_tool_set_nav_respects_capabilities():
     sim = make_test_simulation()
     # Assign convoy to red via mission helper
-    _ = asyncio.run(sim.handle_command("debug.mission.surface_vessel", {}))
-    err = asyncio.run(sim.handle_command("ai.tool", {"ship_id": "red-01", "tool": "set_nav", "arguments": {"heading": 120, "speed": 6, "depth": 0}}))
+    await sim.handle_command("debug.mission.surface_vessel", {})
+    err = await sim.handle_command("ai.tool", {"ship_id": "red-01", "tool": "set_nav", "arguments": {"heading": 120, "speed": 6, "depth": 0}})
     assert err is None
     red = [s for s in sim.world.all_ships() if s.id == "red-01"][0]
     assert 119.0 <= red.kin.heading <= 121.0
     assert red.kin.speed == pytest.approx(6)
     assert red.kin.depth == pytest.approx(0)
-    sim = make_test_simulation()
-    own = sim.world.get_ship("ownship")
-    # Force spawn timers to immediate
-    sim._task_spawn_timers = {k: 0.0 for k in sim._task_spawn_timers.keys()}
-    # Tick enough to spawn
-    for _ in range(5):
-        _ = asyncio.run(sim.tick(0.05))
-    # Expect some tasks present (randomized, but at least one station should have a task)
-    active = [k for k, v in sim._active_tasks.items() if v]
-    assert len(active) >= 1
-    # Allocate high power to first station and tick to progress
-    st = active[0]
-    own.power.helm = 0.0; own.power.weapons = 0.0; own.power.sonar = 0.0; own.power.engineering = 0.0
-    if st == "helm": own.power.helm = 1.0
-    elif st == "weapons": own.power.weapons = 1.0
-    elif st == "sonar": own.power.sonar = 1.0
-    else: own.power.engineering = 1.0
-    # Start/repair the task explicitly; also covers case where none existed
-    _ = asyncio.run(sim.handle_command("station.task.start", {"station": st}))
-    p0 = sim._active_tasks[st][0].progress
-    for _ in range(30):
-        _ = asyncio.run(sim.tick(0.1))
-        if not sim._active_tasks.get(st):
-            break
-    # Either completed (cleared) or progressed
-    if not sim._active_tasks.get(st):
-        assert True
-    else:
-        assert sim._active_tasks[st][0].progress > p0
-
@@ -1,9 +1,8 @@
 """Tests for sub-bridge/backend/sim/noise.py"""
-import os, sys, math
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
+import math
 
 from conftest import make_ship, make_world
-from backend.sim.noise import NoiseEngine, _sum_db
+from backend.sim.noise import NoiseEngine, NoiseInputs, _sum_db
 
 
 class _FakeLoopState:
@@ -170,6 +169,19 @@ def test_contributors_are_labeled_and_sorted_desc():
     assert dbs == sorted(dbs, reverse=True)  # loudest first
 
 
+def test_noise_inputs_match_legacy_loop_state():
+    own = make_ship(speed=8.0)
+    world = make_world(own)
+    ls = _FakeLoopState()
+    ls._periscope_raised = True
+    ls._pump_aft = True
+    legacy = NoiseEngine().tick(own, world, 0.1, ls)
+    inputs = NoiseEngine().tick(own, world, 0.1, NoiseInputs(periscope_raised=True, pump_aft=True))
+    for st in ("sonar", "engineering"):
+        assert legacy[st]["contributors"] == inputs[st]["contributors"]
+        assert legacy[st]["band"] == inputs[st]["band"]
+
+
 def test_band_is_normalized_per_station():
     # A near-idle engineering plant should sit in a lower band than a hot one,
     # using engineering's OWN range.
@@ -1,9 +1,4 @@
 import math
-import os
-import sys
-
-# Add project sub-bridge to import path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
 
 from backend.sim.physics import (
     clamp,
@@ -15,7 +10,7 @@ from backend.sim.physics import (
     PLANES_REF_SPEED,
     REVERSE_SPEED_FRACTION,
 )
-from backend.sim.weapons import _get_tube, try_load_tube, try_flood_tube, try_set_doors, try_fire, step_tubes
+from backend.sim.weapons import _get_tube, try_load_tube, try_flood_tube, try_set_doors, try_fire, step_tubes, step_tubes_to_state, step_torpedo
 from backend.models import Ship, Kinematics, Hull, Acoustics, WeaponsSuite, Reactor, DamageState
 
 
@@ -114,22 +109,15 @@ def test_tube_state_machine_timing():
     t1 = _get_tube(ship, 1)
     assert t1.timer_s > 0 and t1.next_state == "Loaded"
     # step until loaded
-    dt_total = 0.0
-    while t1.timer_s > 0 and dt_total < 60:
-        step_tubes(ship, 1.0)
-        dt_total += 1.0
+    assert 0.0 < step_tubes_to_state(ship, 1, "Loaded", 60.0) <= 60.0
     assert t1.state == "Loaded"
     # flood
     assert try_flood_tube(ship, 1)
-    while t1.timer_s > 0 and dt_total < 120:
-        step_tubes(ship, 1.0)
-        dt_total += 1.0
+    assert 0.0 < step_tubes_to_state(ship, 1, "Flooded", 60.0) <= 60.0
     assert t1.state == "Flooded"
     # doors open
     assert try_set_doors(ship, 1, True)
-    while t1.timer_s > 0 and dt_total < 200:
-        step_tubes(ship, 1.0)
-        dt_total += 1.0
+    assert 0.0 < step_tubes_to_state(ship, 1, "DoorsOpen", 80.0) <= 80.0
     assert t1.state == "DoorsOpen"
     # fire
     torp = try_fire(ship, 1, 90.0, 100.0)
@@ -137,19 +125,40 @@ def test_tube_state_machine_timing():
     assert t1.state == "Empty"
 
 
+def test_get_tube_follows_tube_list_changes():
+    from backend.models import Tube
+    ship = make_own()
+    assert _get_tube(ship, 3) is ship.weapons.tubes[2]
+    assert _get_tube(ship, 9) is None
+    # In-place replacement and reassignment are both picked up
+    ship.weapons.tubes[2] = Tube(idx=3, state="Loaded")
+    assert _get_tube(ship, 3).state == "Loaded"
+    ship.weapons.tubes = [Tube(idx=9)]
+    assert _get_tube(ship, 9) is ship.weapons.tubes[0]
+    assert _get_tube(ship, 3) is None
+
+
+def _angdiff(a, b):
+    """Unsigned shortest-arc difference between two headings, in degrees."""
+    return abs(math.remainder(a - b, 360.0))
+
+
+def _ready_tube(ship, idx, weapon="Mk48"):
+    """Load, flood and open the doors on a tube, jumping each timer straight
+    to its transition."""
+    assert try_load_tube(ship, idx, weapon)
+    step_tubes_to_state(ship, idx, "Loaded", 60.0)
+    assert try_flood_tube(ship, idx)
+    step_tubes_to_state(ship, idx, "Flooded", 60.0)
+    assert try_set_doors(ship, idx, True)
+    step_tubes_to_state(ship, idx, "DoorsOpen", 80.0)
+    assert _get_tube(ship, idx).state == "DoorsOpen"
+
+
 def test_torpedo_arming_and_pn_guidance_and_safety():
     ship = make_own()
     # Prepare tube and fire
-    assert try_load_tube(ship, 1, "Mk48")
-    # Fast-forward load
-    for _ in range(50):
-        step_tubes(ship, 1.0)
-    assert try_flood_tube(ship, 1)
-    for _ in range(10):
-        step_tubes(ship, 1.0)
-    assert try_set_doors(ship, 1, True)
-    for _ in range(5):
-        step_tubes(ship, 1.0)
+    _ready_tube(ship, 1)
     torp = try_fire(ship, 1, 0.0, 50.0, enable_range_m=500.0)
     assert torp is not None
     # World with one target ahead at ~1500 m
@@ -166,31 +175,19 @@ def test_torpedo_arming_and_pn_guidance_and_safety():
     # Step until armed
     run = 0.0
     while not torp["armed"] and run < 60.0:
-        from backend.sim.weapons import step_torpedo
         step_torpedo(torp, world, dt=1.0)
         run += 1.0
     assert torp["armed"]
     # After arming, heading should trend toward target bearing (0° to 0 for target at North)
     h0 = torp["heading"]
-    from backend.sim.weapons import step_torpedo
     for _ in range(5):
         step_torpedo(torp, world, dt=1.0)
     h1 = torp["heading"]
     # Heading deviation should reduce toward 0°
-    def angdiff(a,b):
-        return abs(((a-b+540)%360)-180)
-    assert angdiff(h1, 0.0) <= angdiff(h0, 0.0) + 1e-3
+    assert _angdiff(h1, 0.0) <= _angdiff(h0, 0.0) + 1e-3
     # Safety: place ownship very close ahead pre-arm and ensure it turns away (simulate new torpedo)
     # Reload and prep again for second fire
-    assert try_load_tube(ship, 1, "Mk48")
-    for _ in range(50):
-        step_tubes(ship, 1.0)
-    assert try_flood_tube(ship, 1)
-    for _ in range(10):
-        step_tubes(ship, 1.0)
-    assert try_set_doors(ship, 1, True)
-    for _ in range(5):
-        step_tubes(ship, 1.0)
+    _ready_tube(ship, 1)
     torp2 = try_fire(ship, 1, 0.0, 50.0, enable_range_m=1000.0)
     assert torp2 is not None
     ship.kin.x = 0.0; ship.kin.y = 10.0
@@ -200,7 +197,7 @@ def test_torpedo_arming_and_pn_guidance_and_safety():
         h_before = torp2["heading"]
         step_torpedo(torp2, world, dt=0.5)
         h_after = torp2["heading"]
-        if angdiff(h_after, 180.0) < angdiff(h_before, 180.0):
+        if _angdiff(h_after, 180.0) < _angdiff(h_before, 180.0):
             turned = True
         run2 += 0.5
     assert turned
@@ -243,7 +240,6 @@ def _make_torp(x=0.0, y=0.0, depth=50.0, heading=0.0, run_depth=50.0, side="BLUE
 
 def test_torpedo_homes_in_depth_and_hits_deep_target():
     # Target dead ahead (North) at 1500 m, but 200 m deeper than the torpedo.
-    from backend.sim.weapons import step_torpedo
     world, own, tgt = _world_with_target(0.0, 1500.0, 250.0)
     t = _make_torp(x=0.0, y=0.0, depth=50.0, heading=0.0, run_depth=50.0)
     for _ in range(2000):
@@ -257,12 +253,33 @@ def test_torpedo_homes_in_depth_and_hits_deep_target():
     assert tgt.damage.hull > 0.0
 
 
+def test_target_dead_astern_turns_to_port():
+    # LOS exactly 180° off the bow: the heading error wraps to -180, so the
+    # fish comes about to port (math.remainder would resolve it to +180).
+    world, own, tgt = _world_with_target(0.0, -1000.0, 50.0)
+    t = _make_torp(heading=0.0)
+    t["seeker_cone"] = 360.0
+    step_torpedo(t, world, dt=0.1)
+    assert t["los_prev"] == 180.0
+    assert 270.0 < t["heading"] < 360.0
+
+
+def test_torpedo_dict_carries_no_private_caches():
+    # Torpedo dicts go out verbatim in telemetry; guidance caches live elsewhere
+    world, own, tgt = _world_with_target(0.0, 1500.0, 50.0)
+    t = _make_torp(heading=0.0)
+    keys = set(t)
+    for _ in range(10):
+        step_torpedo(t, world, dt=0.1)
+    assert not [k for k in t if k.startswith("_")]
+    assert set(t) == keys
+
+
 def test_coarse_run_depth_still_acquires_deeper_target():
     # Fire with a deliberately-wrong run_depth (50 m) at a target 250 m deeper.
     # At 700 m horizontal that is ~20° elevation — outside the horizontal cone
     # half-angle (17.5°) but inside the wider vertical acquisition envelope, so
     # the torpedo must still acquire, home in depth, and hit.
-    from backend.sim.weapons import step_torpedo
     world, own, tgt = _world_with_target(0.0, 700.0, 300.0)
     t = _make_torp(x=0.0, y=0.0, depth=50.0, heading=0.0, run_depth=50.0)
     for _ in range(2000):
@@ -278,7 +295,6 @@ def test_depth_separation_prevents_2d_aligned_detonation():
     # Target shares the torpedo's x/y but is 380 m away in depth. The old 2D
     # fuze (hypot of x/y only) would have detonated immediately; the 3D fuze
     # must not.
-    from backend.sim.weapons import step_torpedo
     world, own, tgt = _world_with_target(0.0, 0.0, 400.0)
     t = _make_torp(x=0.0, y=0.0, depth=20.0, heading=0.0, run_depth=20.0)
     step_torpedo(t, world, dt=0.1)
@@ -289,10 +305,131 @@ def test_depth_separation_prevents_2d_aligned_detonation():
 def test_torpedo_transits_to_run_depth_when_no_target():
     # No target within seeker range: the torpedo should drive toward its ordered
     # run depth and not overshoot it.
-    from backend.sim.weapons import step_torpedo
     world, own, tgt = _world_with_target(0.0, 50000.0, 100.0)  # target far out of range
     t = _make_torp(x=0.0, y=0.0, depth=100.0, heading=0.0, run_depth=30.0, armed=False)
     for _ in range(50):
         step_torpedo(t, world, dt=0.1)
     assert t["depth"] < 100.0   # descended toward run depth
     assert t["depth"] >= 30.0   # but did not pass below it
+
+
+def test_seeker_prefers_loud_countermeasure_over_ship():
+    # A noisemaker between torpedo and target out-shouts the ship; the seeker
+    # returns a kin-like wrapper for it instead of the ship.
+    from backend.sim.weapons import _nearest_target
+    world, own, tgt = _world_with_target(0.0, 1500.0, 50.0)
+    t = _make_torp(x=0.0, y=0.0, depth=50.0, heading=0.0)
+    assert _nearest_target(t, world, []) is tgt
+    cm = {"id": "cm-1", "x": 0.0, "y": 600.0, "depth": 50.0, "side": "RED",
+          "active": True, "type": "noisemaker", "source_level_db": 160.0}
+    target = _nearest_target(t, world, [cm])
+    assert target.is_countermeasure and target.cm_id == "cm-1"
+    assert (target.kin.x, target.kin.y, target.kin.depth) == (0.0, 600.0, 50.0)
+    # Same-side or spent countermeasures do not lure the seeker
+    assert _nearest_target(t, world, [{**cm, "side": "BLUE"}]) is tgt
+    assert _nearest_target(t, world, [{**cm, "active": False}]) is tgt
+
+
+def test_seeker_env_mult_scales_acquisition_range():
+    # The thermocline multiplier shortens the seeker range; passing it in
+    # explicitly matches deriving it from ownship's acoustics.
+    from backend.sim.weapons import _nearest_target, seeker_env_mult
+    world, own, tgt = _world_with_target(0.0, 3000.0, 50.0)
+    t = _make_torp(x=0.0, y=0.0, depth=50.0, heading=0.0)
+    own.acoustics.thermocline_on = False
+    assert seeker_env_mult(world) == 1.0
+    assert _nearest_target(t, world, []) is tgt
+    assert _nearest_target(t, world, [], env_mult=0.6) is None
+    own.acoustics.thermocline_on = True
+    assert seeker_env_mult(world) == 0.6
+    assert _nearest_target(t, world, []) is None
+
+
+def test_depth_charge_damage_bands_by_range():
+    # Direct hit inside 60 m, near miss inside 120 m, nothing beyond.
+    from backend.sim.weapons import step_depth_charge
+    for dist, expected in ((40.0, "depth_charge.hit"), (100.0, "depth_charge.near"), (150.0, None)):
+        world, own, tgt = _world_with_target(0.0, dist, 100.0)
+        dc = {"x": 0.0, "y": 0.0, "depth": 99.5, "target_depth": 100.0,
+              "sink_rate_mps": 0.0, "side": "BLUE"}
+        events = []
+        step_depth_charge(dc, world, 0.1, on_event=lambda kind, payload: events.append((kind, payload)))
+        assert dc["exploded"]
+        kinds = [k for k, _ in events if k != "depth_charge.detonated"]
+        assert kinds == ([expected] if expected else [])
+        if expected:
+            assert abs(events[0][1]["range_m"] - dist) < 0.01
+            assert tgt.damage.hull > 0.0
+        else:
+            assert tgt.damage.hull == 0.0
+
+
+def test_seeker_grid_matches_linear_scan():
+    # With a large roster the seeker searches only nearby grid cells; it must
+    # pick exactly what a full scan picks.
+    import random
+    from backend.models import Ship as MShip
+    from backend.sim.weapons import _nearest_target, build_seeker_frame, build_ship_grid, SEEKER_GRID_MIN_SHIPS
+    world, own, tgt = _world_with_target(0.0, 1500.0, 50.0)
+    rnd = random.Random(7)
+    for i in range(40):
+        world.add_ship(MShip(
+            id=f"red-{i + 2:02d}", side="RED",
+            kin=Kinematics(x=rnd.uniform(-12000, 12000), y=rnd.uniform(-12000, 12000),
+                           depth=rnd.uniform(0.0, 300.0), heading=0.0, speed=rnd.uniform(0.0, 25.0)),
+            hull=Hull(), acoustics=Acoustics(), weapons=WeaponsSuite(), reactor=Reactor(), damage=DamageState(),
+        ))
+    ships = world.all_ships()
+    frame = build_seeker_frame(ships)
+    assert build_ship_grid(frame[:SEEKER_GRID_MIN_SHIPS - 1]) is None
+    grid = build_ship_grid(frame)
+    found = 0
+    for _ in range(200):
+        t = _make_torp(x=rnd.uniform(-10000, 10000), y=rnd.uniform(-10000, 10000),
+                       depth=rnd.uniform(0.0, 300.0), heading=rnd.uniform(0.0, 360.0))
+        t["seeker_cone"] = 90.0
+        expected = _nearest_target(t, world, [], ships=ships)
+        assert _nearest_target(t, world, [], seeker_frame=frame) is expected
+        assert _nearest_target(t, world, [], seeker_frame=frame, ship_grid=grid) is expected
+        found += expected is not None
+    assert found > 0
+
+
+def test_step_tubes_advances_tubes_replaced_or_timed_after_an_idle_pass():
+    from backend.models import Tube
+    ship = make_own()
+    ws = ship.weapons
+    # Every tube is stopped; later changes must still be picked up
+    step_tubes(ship, 1.0)
+    # In-place replacement of one tube
+    ws.tubes[0] = Tube(idx=1, state="Empty", timer_s=2.0, next_state="Loaded")
+    for _ in range(5):
+        step_tubes(ship, 1.0)
+    assert ws.tubes[0].state == "Loaded" and ws.tubes[0].timer_s == 0.0
+    # A timer written directly on an existing tube
+    tube = _get_tube(ship, 2)
+    tube.next_state = "Loaded"
+    tube.timer_s = 2.0
+    step_tubes(ship, 1.0)
+    step_tubes(ship, 1.0)
+    assert tube.state == "Loaded"
+    # A replaced tubes list
+    ws.tubes = [Tube(idx=1, state="Empty", timer_s=2.0, next_state="Loaded")]
+    step_tubes(ship, 1.0)
+    step_tubes(ship, 1.0)
+    assert ws.tubes[0].state == "Loaded"
+
+
+def test_spent_torpedo_step_is_a_no_op():
+    world, own, tgt = _world_with_target(0.0, 500.0, 100.0)
+    t = _make_torp(x=0.0, y=0.0, depth=100.0, heading=0.0)
+    t["run_time"] = t["max_run_time"] + 1.0
+    before = dict(t)
+    step_torpedo(t, world, dt=1.0)
+    assert t == before
+
+
+def test_entity_ids_are_unique_within_a_tick():
+    from backend.sim.weapons import create_countermeasure
+    ids = {create_countermeasure("noisemaker", (0.0, 0.0), 100.0, 0.0)["id"] for _ in range(50)}
+    assert len(ids) == 50
@@ -6,8 +6,6 @@ Locks in two things:
   2. The new routing effects — deviating from 25% actually changes speed ceiling,
      sonar gain, reload, and the reactor's acoustic signature.
 """
-import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
 
 from conftest import make_ship
 from backend.sim import power
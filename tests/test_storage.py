@@ -0,0 +1,110 @@
+import datetime as dt
+import json
+
+import pytest
+
+from backend.storage import dumps_payload, insert_event
+
+
+def test_dumps_payload_round_trips_event_objects():
+    payload = {"tube": 1, "bearing": 45.0, "doctrine": "passive_then_active", "args": [1, 2]}
+    assert json.loads(dumps_payload(payload)) == payload
+
+
+def test_insert_event_without_engine_skips_serialization(monkeypatch):
+    from backend import storage
+    calls = []
+    monkeypatch.setattr(storage, "dumps_payload", lambda payload: calls.append(payload))
+
+    # No engine: nothing is written and the payload is never serialized.
+    insert_event(None, 0, "weapons.fire", {"tube": 1})
+    assert calls == []
+
+
+def test_events_are_buffered_and_committed_in_batches(tmp_path):
+    from sqlmodel import Session, select
+    from backend.storage import Event, StorageWriter, create_run, flush, init_engine, _writers
+
+    engine = init_engine(str(tmp_path / "events.db"))
+    run_id = create_run(engine)
+    _writers[engine] = StorageWriter(engine, batch_rows=3, flush_s=3600.0)
+
+    def stored():
+        with Session(engine) as session:
+            return [ev.type for ev in session.exec(select(Event))]
+
+    insert_event(engine, run_id, "a", {})
+    insert_event(engine, run_id, "b", "{}")
+    assert stored() == []
+    insert_event(engine, run_id, "c", {})  # third row fills the batch
+    assert stored() == ["a", "b", "c"]
+    insert_event(engine, run_id, "d", {})
+    flush(engine)
+    assert stored() == ["a", "b", "c", "d"]
+
+
+class _LockedEngine:
+    def begin(self):
+        raise RuntimeError("database is locked")
+
+
+def _event_row(run_id, type_):
+    return {"run_id": run_id, "created_at": dt.datetime.utcnow(), "type": type_, "payload": "{}"}
+
+
+def test_failed_flush_keeps_rows_queued(tmp_path, capsys):
+    from sqlmodel import Session, select
+    from backend.storage import Event, StorageWriter, create_run, init_engine
+
+    engine = init_engine(str(tmp_path / "events.db"))
+    run_id = create_run(engine)
+    writer = StorageWriter(engine, batch_rows=100, flush_s=3600.0)
+    writer.add(Event.__table__, _event_row(run_id, "a"))
+
+    writer.engine = _LockedEngine()
+    writer.flush()  # reported, not raised
+    assert "database is locked" in capsys.readouterr().out
+    # The row survived the failed write and goes out with the next flush
+    writer.engine = engine
+    writer.flush()
+    with Session(engine) as session:
+        assert [ev.type for ev in session.exec(select(Event))] == ["a"]
+
+
+def test_failed_flush_backs_off_and_caps_the_buffer():
+    from backend.storage import Event, StorageWriter
+
+    writer = StorageWriter(_LockedEngine(), batch_rows=2, flush_s=3600.0, max_pending=3)
+    attempts = []
+    flush = writer.flush
+    writer.flush = lambda: (attempts.append(writer._count), flush())
+    for i in range(6):
+        writer.add(Event.__table__, _event_row(1, str(i)))
+    # One attempt when the batch filled; later rows wait out flush_s
+    assert attempts == [2]
+    assert writer._count == 6
+    writer.flush()
+    # Oldest rows are dropped once the write fails with the buffer over the cap
+    assert [row["type"] for row in writer._pending[Event.__table__]] == ["3", "4", "5"]
+    assert writer._count == 3
+
+
+def test_event_payloads_are_serialized_at_insert(tmp_path):
+    from sqlmodel import Session, select
+    from backend.storage import Event, StorageWriter, create_run, init_engine, _writers
+
+    engine = init_engine(str(tmp_path / "events.db"))
+    run_id = create_run(engine)
+    writer = _writers[engine] = StorageWriter(engine, batch_rows=100, flush_s=3600.0)
+
+    payload = {"tube": 1, "status": "firing"}
+    insert_event(engine, run_id, "weapons.fire", payload)
+    # The caller keeps its reference; later changes must not reach the event
+    payload["status"] = "done"
+    writer.flush()
+    with Session(engine) as session:
+        stored = [ev.payload for ev in session.exec(select(Event))]
+    assert [json.loads(p) for p in stored] == [{"tube": 1, "status": "firing"}]
+
+    with pytest.raises(TypeError):
+        insert_event(engine, run_id, "weapons.fire", {"obj": object()})
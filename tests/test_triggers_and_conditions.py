@@ -1,6 +1,4 @@
 """Tests for sub-bridge/backend/sim/conditions.py and triggers.py"""
-import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
 
 import pytest
 
@@ -9,11 +7,11 @@ from backend.models import ScenarioCondition, ScenarioAction, ScenarioTrigger
 from backend.sim.conditions import ConditionEvaluator
 from backend.sim.triggers import TriggerManager
 
-
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
+
 def _make_evaluator(*ships):
     world = make_world(*ships)
     ev = ConditionEvaluator(
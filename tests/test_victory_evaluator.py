@@ -1,6 +1,4 @@
 """Tests for sub-bridge/backend/sim/victory.py"""
-import os, sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
 
 from conftest import make_ship, make_world
 from backend.models import WaypointRoute, Waypoint
@@ -1,13 +1,7 @@
-import os
-import sys
 import pytest
 import math
-from unittest.mock import Mock, patch
 
-# Ensure sub-bridge backend is importable
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
-
-from backend.sim.sonar import passive_contacts, _classify_ship_passive
+from backend.sim.sonar import passive_contacts, _classify_ship_passive, _classify_sonar_signature, source_level_for_speed, clear_contact_memory
 from backend.sim.ai_orchestrator import AgentsOrchestrator
 from backend.models import Ship, Kinematics, Acoustics, Hull, WeaponsSuite, Reactor, DamageState, PowerAllocations, SystemsStatus, MaintenanceState
 
@@ -39,79 +33,53 @@ def make_ship(id_: str, side: str, ship_class: str, x: float = 0.0, y: float = 0
     )
 
 
+class _StubWorld:
+    """Minimal stand-in for World: just the reads _build_ship_summary makes."""
+
+    __slots__ = ("_ships", "torpedoes")
+
+    def __init__(self, ships=()):
+        self.torpedoes = []
+        self.set_ships(ships)
+
+    def set_ships(self, ships):
+        self._ships = {s.id: s for s in ships}
+
+    def all_ships(self):
+        return list(self._ships.values())
+
+    def get_ship(self, ship_id):
+        return self._ships.get(ship_id)
+
+
 class TestPassiveSonarClassification:
     """Test the enhanced passive sonar classification system."""
     
-    def test_strong_signal_confident_classification(self):
-        """Strong signals should provide confident classifications."""
-        ship = make_ship("test-ssn", "BLUE", "SSN")
-        
-        # Strong signal: high detectability and SNR
-        result = _classify_ship_passive(ship, detectability=0.9, snr_db=30.0, range_m=1000.0)
-        assert result == "SSN"
-        
-        # Test other ship types
-        convoy = make_ship("test-convoy", "BLUE", "Convoy")
-        result = _classify_ship_passive(convoy, detectability=0.85, snr_db=28.0, range_m=1500.0)
-        assert result == "Merchant/Convoy"
-        
-        destroyer = make_ship("test-destroyer", "BLUE", "Destroyer")
-        result = _classify_ship_passive(destroyer, detectability=0.88, snr_db=32.0, range_m=800.0)
-        assert result == "Warship"
-    
-    def test_medium_signal_probable_classification(self):
-        """Medium signals should provide probable classifications."""
-        ship = make_ship("test-ssn", "BLUE", "SSN")
-        
-        # Medium signal: moderate detectability and SNR
-        result = _classify_ship_passive(ship, detectability=0.7, snr_db=22.0, range_m=2000.0)
-        assert result == "SSN?"
-        
-        convoy = make_ship("test-convoy", "BLUE", "Convoy")
-        result = _classify_ship_passive(convoy, detectability=0.65, snr_db=21.0, range_m=2500.0)
-        assert result == "Merchant?"
-    
-    def test_weak_signal_possible_classification(self):
-        """Weak signals should provide possible classifications."""
-        ship = make_ship("test-ssn", "BLUE", "SSN")
-        
-        # Weak signal: low detectability and SNR
-        result = _classify_ship_passive(ship, detectability=0.45, snr_db=16.0, range_m=4000.0)
-        assert result == "Submarine?"
-        
-        convoy = make_ship("test-convoy", "BLUE", "Convoy")
-        result = _classify_ship_passive(convoy, detectability=0.42, snr_db=15.5, range_m=4500.0)
-        assert result == "Vessel?"
-    
-    def test_very_weak_signal_unknown_classification(self):
-        """Very weak signals should return unknown."""
-        ship = make_ship("test-ssn", "BLUE", "SSN")
-        
-        # Very weak signal: very low detectability and SNR
-        result = _classify_ship_passive(ship, detectability=0.3, snr_db=12.0, range_m=6000.0)
-        assert result == "Unknown"
-        
-        result = _classify_ship_passive(ship, detectability=0.35, snr_db=14.0, range_m=5000.0)
-        assert result == "Unknown"
-    
-    def test_edge_cases(self):
-        """Test edge cases and boundary conditions."""
-        ship = make_ship("test-ssn", "BLUE", "SSN")
-        
-        # Boundary between strong and medium
-        result = _classify_ship_passive(ship, detectability=0.8, snr_db=25.0, range_m=1000.0)
-        assert result == "SSN"  # Should be confident
-        
-        result = _classify_ship_passive(ship, detectability=0.79, snr_db=24.9, range_m=1000.0)
-        assert result == "SSN?"  # Should be probable
-        
-        # Boundary between medium and weak
-        result = _classify_ship_passive(ship, detectability=0.6, snr_db=20.0, range_m=2000.0)
-        assert result == "SSN?"  # Should be probable
-        
-        result = _classify_ship_passive(ship, detectability=0.59, snr_db=19.9, range_m=2000.0)
-        assert result == "Submarine?"  # Should be possible
-    
+    @pytest.mark.parametrize("ship_class,detectability,snr_db,range_m,expected", [
+        # Strong signal: confident classification
+        ("SSN", 0.9, 30.0, 1000.0, "SSN"),
+        ("Convoy", 0.85, 28.0, 1500.0, "Merchant/Convoy"),
+        ("Destroyer", 0.88, 32.0, 800.0, "Warship"),
+        # Medium signal: probable classification
+        ("SSN", 0.7, 22.0, 2000.0, "SSN?"),
+        ("Convoy", 0.65, 21.0, 2500.0, "Merchant?"),
+        # Weak signal: possible classification
+        ("SSN", 0.45, 16.0, 4000.0, "Submarine?"),
+        ("Convoy", 0.42, 15.5, 4500.0, "Vessel?"),
+        # Very weak signal: unknown
+        ("SSN", 0.3, 12.0, 6000.0, "Unknown"),
+        ("SSN", 0.35, 14.0, 5000.0, "Unknown"),
+        # Boundaries between strong/medium and medium/weak
+        ("SSN", 0.8, 25.0, 1000.0, "SSN"),
+        ("SSN", 0.79, 24.9, 1000.0, "SSN?"),
+        ("SSN", 0.6, 20.0, 2000.0, "SSN?"),
+        ("SSN", 0.59, 19.9, 2000.0, "Submarine?"),
+    ])
+    def test_classification_by_signal_strength(self, ship_class, detectability, snr_db, range_m, expected):
+        """Confidence tiers follow detectability/SNR, including the tier boundaries."""
+        ship = make_ship("test-ship", "BLUE", ship_class)
+        assert _classify_ship_passive(ship, detectability=detectability, snr_db=snr_db, range_m=range_m) == expected
+
     def test_unknown_ship_class(self):
         """Test handling of ships with unknown class."""
         ship = make_ship("test-unknown", "BLUE", None)
@@ -120,28 +88,40 @@ class TestPassiveSonarClassification:
         result = _classify_ship_passive(ship, detectability=0.9, snr_db=30.0, range_m=1000.0)
         assert result == "Unknown"
 
+    def test_sonar_signature_hides_ship_type(self):
+        """Unidentified contacts get depth/speed descriptors, never the class."""
+        surface = make_ship("c1", "RED", "Destroyer", depth=0.0, speed=18.0)
+        sub = make_ship("c2", "RED", "SSN", depth=120.0, speed=1.0)
+        assert _classify_sonar_signature(surface, 0.8, 25.0) == "Fast Surface Contact"
+        assert _classify_sonar_signature(sub, 0.8, 25.0) == "Stationary Submerged Contact"
+        assert _classify_sonar_signature(surface, 0.5, 16.0) == "Surface Contact"
+        assert _classify_sonar_signature(sub, 0.3, 12.0) == "Unknown Contact"
+
 
 class TestVisualDetectionSystem:
     """Test the visual detection system with ship identification."""
+
+    @pytest.fixture(scope="class")
+    def orchestrator_and_world(self):
+        # One orchestrator per class; each test loads its own roster into the stub
+        world = _StubWorld()
+        orchestrator = AgentsOrchestrator(
+            world_getter=lambda: world,
+            storage_engine=None,
+            run_id="test-run"
+        )
+        return orchestrator, world
     
-    @pytest.mark.xfail(reason="Test-harness issue, NOT a product bug (2026-06-27 review): drives _build_ship_summary with a bare Mock() world and never populates orchestrator._visual_detection_map. Visual detection actually runs in loop.py (~1300-1342); the orchestrator only reads its map, so only passive sonar runs here. Fix = drive a real Simulation / populate the visual map, or test loop.py's visual routine directly.", strict=False)
-    def test_visual_detection_includes_side_information(self):
+    @pytest.mark.xfail(reason="Test-harness issue, NOT a product bug (2026-06-27 review): drives _build_ship_summary with a bare stub world and never populates orchestrator._visual_detection_map. Visual detection actually runs in loop.py (~1300-1342); the orchestrator only reads its map, so only passive sonar runs here. Fix = drive a real Simulation / populate the visual map, or test loop.py's visual routine directly.", strict=False)
+    def test_visual_detection_includes_side_information(self, orchestrator_and_world):
         """Visual detection should include ship side for friendly identification."""
         # Create test world with ships
         ownship = make_ship("ownship", "BLUE", "SSN", x=0.0, y=0.0, depth=0.0)
         red_01 = make_ship("red-01", "RED", "Convoy", x=6000.0, y=0.0, depth=0.0)
         red_02 = make_ship("red-02", "RED", "Convoy", x=5800.0, y=10.0, depth=0.0)
         
-        # Mock world getter
-        world_mock = Mock()
-        world_mock.all_ships.return_value = [ownship, red_01, red_02]
-        
-        # Create AI orchestrator with mocked dependencies
-        orchestrator = AgentsOrchestrator(
-            world_getter=lambda: world_mock,
-            storage_engine=Mock(),
-            run_id="test-run"
-        )
+        orchestrator, world = orchestrator_and_world
+        world.set_ships([ownship, red_01, red_02])
         
         # Build ship summary for red-01
         summary = orchestrator._build_ship_summary(red_01)
@@ -159,7 +139,7 @@ class TestVisualDetectionSystem:
         assert "range_est" in ownship_contact
     
     @pytest.mark.xfail(reason="Test-harness issue, NOT a product bug (2026-06-27 review): asserts VISUAL range/depth gating but exercises only the orchestrator's passive sonar (visual detection lives in loop.py and is never activated here). Passive sonar legitimately detects the 'deep' target, so the assertion is wrong for this layer. Fix = test the real visual layer in loop.py.", strict=False)
-    def test_visual_detection_range_limits(self):
+    def test_visual_detection_range_limits(self, orchestrator_and_world):
         """Visual detection should respect range and depth limits."""
         # Create test world with ships at various ranges and depths
         ownship = make_ship("ownship", "BLUE", "SSN", x=0.0, y=0.0, depth=0.0)
@@ -173,14 +153,8 @@ class TestVisualDetectionSystem:
         # Ship too deep for visual detection
         red_deep = make_ship("red-deep", "RED", "Convoy", x=1000.0, y=0.0, depth=10.0)
         
-        world_mock = Mock()
-        world_mock.all_ships.return_value = [ownship, red_close, red_far, red_deep]
-        
-        orchestrator = AgentsOrchestrator(
-            world_getter=lambda: world_mock,
-            storage_engine=Mock(),
-            run_id="test-run"
-        )
+        orchestrator, world = orchestrator_and_world
+        world.set_ships([ownship, red_close, red_far, red_deep])
         
         summary = orchestrator._build_ship_summary(ownship)
         contacts = summary["contacts"]
@@ -198,7 +172,7 @@ class TestVisualDetectionSystem:
         assert deep_contact is None
     
     @pytest.mark.xfail(reason="Test-harness issue, NOT a product bug (2026-06-27 review): expects an exact bearing, but exercises passive sonar which carries ~8 deg Gaussian noise at low speed. Exact bearings exist only on the visual path (loop.py), which this test never activates. Fix = test the real visual layer in loop.py.", strict=False)
-    def test_visual_detection_bearing_calculation(self):
+    def test_visual_detection_bearing_calculation(self, orchestrator_and_world):
         """Visual detection should calculate correct bearings."""
         ownship = make_ship("ownship", "BLUE", "SSN", x=0.0, y=0.0, depth=0.0)
         
@@ -211,14 +185,8 @@ class TestVisualDetectionSystem:
         # Ship to the northeast (bearing 45°)
         red_northeast = make_ship("red-northeast", "RED", "Convoy", x=1000.0, y=1000.0, depth=0.0)
         
-        world_mock = Mock()
-        world_mock.all_ships.return_value = [ownship, red_east, red_north, red_northeast]
-        
-        orchestrator = AgentsOrchestrator(
-            world_getter=lambda: world_mock,
-            storage_engine=Mock(),
-            run_id="test-run"
-        )
+        orchestrator, world = orchestrator_and_world
+        world.set_ships([ownship, red_east, red_north, red_northeast])
         
         summary = orchestrator._build_ship_summary(ownship)
         contacts = summary["contacts"]
@@ -238,6 +206,31 @@ class TestVisualDetectionSystem:
         assert northeast_contact is not None
         assert abs(northeast_contact["bearing"] - 45.0) < 1.0  # Allow small tolerance
 
+    def test_visual_map_entries_get_exact_range_and_bearing(self, orchestrator_and_world):
+        """Targets locked in the Simulation's visual map carry true range and bearing."""
+        ownship = make_ship("ownship", "BLUE", "SSN", x=0.0, y=0.0, depth=0.0)
+        red_seen = make_ship("red-seen", "RED", "Convoy", x=3000.0, y=4000.0, depth=0.0)
+        red_unseen = make_ship("red-unseen", "RED", "Convoy", x=-3000.0, y=0.0, depth=0.0)
+        orchestrator, world = orchestrator_and_world
+        world.set_ships([ownship, red_seen, red_unseen])
+        orchestrator._visual_detection_map = {
+            "ownship": {
+                "red-seen": {"detected": True, "mode": "surface"},
+                "red-unseen": {"detected": False, "mode": "surface"},
+                "red-gone": {"detected": True, "mode": "surface"},
+            }
+        }
+        try:
+            contacts = {c["id"]: c for c in orchestrator._build_ship_summary(ownship)["contacts"]}
+        finally:
+            orchestrator._visual_detection_map = {}
+        seen = contacts["red-seen"]
+        assert seen["range_est"] == pytest.approx(5000.0)
+        assert seen["bearing"] == pytest.approx(math.degrees(math.atan2(3000.0, 4000.0)), abs=0.1)
+        assert seen["confidence"] >= 0.7
+        assert "range_est" not in contacts.get("red-unseen", {})
+        assert "red-gone" not in contacts
+
 
 class TestPassiveSonarContacts:
     """Test the passive sonar contact generation system."""
@@ -305,6 +298,76 @@ class TestPassiveSonarContacts:
         # Should return no contacts when sonar is down
         assert len(contacts) == 0
 
+    def test_source_level_uses_nearest_speed_key(self):
+        """Nearest-key lookup matches a brute-force min over the table."""
+        ac = Acoustics(source_level_by_speed={5: 110.0, 15: 125.0, 25: 135.0})
+        for spd in [0.0, 5.0, 9.9, 10.0, 10.1, 20.0, 24.0, 40.0, -12.0]:
+            key = min(sorted(ac.source_level_by_speed), key=lambda k: abs(k - abs(spd)))
+            assert source_level_for_speed(ac, spd) == ac.source_level_by_speed[key]
+        # The sorted keys are built once and reused across lookups
+        keys = ac.sorted_speed_keys()
+        target = make_ship("target", "RED", "Convoy", x=2000.0, speed=12.0)
+        target.acoustics = ac
+        passive_contacts(make_ship("ownship", "BLUE", "SSN"), [target], current_time_override=0.0)
+        assert ac.sorted_speed_keys() is keys
+        # Adding an entry in place rebuilds them
+        ac.source_level_by_speed[35] = 140.0
+        assert source_level_for_speed(ac, 40.0) == 140.0
+        clear_contact_memory()
+        # Replacing the table invalidates the cached keys
+        ac.source_level_by_speed = {30: 150.0}
+        assert source_level_for_speed(ac, 5.0) == 150.0
+
+    def test_passive_contacts_baffle_cull(self):
+        """Targets inside the stern baffles are not heard; just outside are."""
+        for heading in (0.0, 90.0, 215.0):
+            ownship = make_ship("ownship", "BLUE", "SSN", depth=50.0, heading=heading)
+            for rel, heard in ((140.0, True), (-140.0, True), (160.0, False), (180.0, False)):
+                brg = math.radians(heading + rel)
+                target = make_ship("target", "RED", "Convoy", x=2000.0 * math.sin(brg),
+                                   y=2000.0 * math.cos(brg), depth=10.0, speed=15.0)
+                contacts = passive_contacts(ownship, [target], current_time_override=0.0)
+                assert (len(contacts) == 1) is heard, (heading, rel)
+        clear_contact_memory()
+
+    def test_projectile_and_countermeasure_baffle_cull(self):
+        """Torpedoes and noisemakers in the stern baffles are not heard."""
+        from backend.sim.sonar import passive_projectiles, countermeasure_contacts
+        for heading in (0.0, 215.0):
+            ownship = make_ship("ownship", "BLUE", "SSN", depth=50.0, heading=heading)
+            for rel, heard in ((140.0, True), (180.0, False)):
+                brg = math.radians(heading + rel)
+                x, y = 2000.0 * math.sin(brg), 2000.0 * math.cos(brg)
+                torp = {"id": "t1", "x": x, "y": y, "depth": 50.0, "speed": 40.0, "side": "RED"}
+                cm = {"id": "cm1", "x": x, "y": y, "depth": 50.0, "active": True,
+                      "type": "noisemaker", "side": "RED"}
+                assert (len(passive_projectiles(ownship, [torp], None)) == 1) is heard
+                assert (len(countermeasure_contacts(ownship, [cm])) == 1) is heard
+
+    def test_passive_contacts_empty_scene_still_expires_memory(self):
+        """With no targets, remembered contacts still age out of memory."""
+        from backend.sim.sonar import _contact_memory, CONTACT_PERSISTENCE_SECONDS
+        ownship = make_ship("ownship", "BLUE", "SSN", depth=50.0)
+        target = make_ship("target", "RED", "Convoy", x=0.0, y=1000.0, depth=10.0, speed=15.0)
+        assert passive_contacts(ownship, [target], current_time_override=0.0)
+        assert passive_contacts(ownship, [], current_time_override=1.0) == []
+        assert "target" in _contact_memory["ownship"]
+        passive_contacts(ownship, [], current_time_override=CONTACT_PERSISTENCE_SECONDS * 2 + 1.0)
+        assert _contact_memory["ownship"] == {}
+        clear_contact_memory()
+
+    def test_passive_contacts_round_trip_validation(self):
+        """Dumped passive contacts validate back into the telemetry model."""
+        from backend.models import TelemetryContact
+        ownship = make_ship("ownship", "BLUE", "SSN", depth=50.0)
+        target = make_ship("target", "RED", "Convoy", x=0.0, y=1000.0, depth=10.0, speed=15.0)
+        contacts = passive_contacts(ownship, [target], current_time_override=0.0)
+        assert contacts
+        for contact in contacts:
+            dumped = contact.model_dump()
+            assert TelemetryContact.model_validate(dumped).model_dump() == dumped
+        clear_contact_memory()
+
 
 if __name__ == "__main__":
     pytest.main([__file__])
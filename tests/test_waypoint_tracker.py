@@ -1,6 +1,5 @@
 """Tests for sub-bridge/backend/sim/waypoints.py"""
-import os, sys, math
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'sub-bridge')))
+import math
 
 from conftest import make_ship, make_world
 from backend.models import Waypoint, WaypointRoute